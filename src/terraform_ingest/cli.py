@@ -1,25 +1,28 @@
 """Command-line interface for terraform-ingest."""
 
 import os
+import re
+import sys
 import click
+import copy
 import json
+import operator
 import shutil
 import yaml
 
+from dataclasses import dataclass, fields
+from functools import cache, lru_cache, reduce
 from pathlib import Path
 from terraform_ingest.models import RepositoryConfig
-from terraform_ingest.ingest import TerraformIngest
 from terraform_ingest.models import IngestConfig
 from terraform_ingest import __version__, CONFIG_PATH
-from terraform_ingest.mcp_service import start as mcp_main
-from terraform_ingest.mcp_service import _get_module_resource_impl, ModuleQueryService
 from terraform_ingest.indexer import ModuleIndexer
-from terraform_ingest.importers import (
-    GitHubImporter,
-    GitLabImporter,
-    update_config_file,
-)
-from terraform_ingest.dependency_installer import DependencyInstaller
+from terraform_ingest.json_utils import dumps as dump_json, loads as load_json
+from terraform_ingest.yaml_utils import SafeDumper, SafeLoader, write_yaml_file
+
+# Heavier modules (ingestion pipeline, MCP server, importers, dependency
+# installer) are imported inside the commands that use them so that
+# lightweight commands such as 'config get' start quickly.
 
 # from terraform_ingest.logging import get_logger
 
@@ -29,6 +32,159 @@ from terraform_ingest.tty_logger import setup_tty_logger
 logger = setup_tty_logger()
 
 
+def _load_yaml_file(path: Path) -> dict:
+    """Read and parse a YAML configuration file in a single pass.
+
+    The file is read as bytes in one call and handed to the (libyaml when
+    available) safe loader, which decodes it directly.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed configuration, or an empty dict for an empty file
+    """
+    return yaml.load(Path(path).read_bytes(), Loader=SafeLoader) or {}
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    """Parse a YAML file, cached per path, modification time and size.
+
+    The mtime and size are only part of the cache key so that a changed file
+    is parsed again; callers must not mutate the returned dictionary.
+
+    Args:
+        path_str: Path to the YAML file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+
+    Returns:
+        Parsed configuration, or an empty dict for an empty file
+    """
+    return _load_yaml_file(Path(path_str))
+
+
+def _yaml_cache_key(path: Path) -> tuple:
+    """Build the (resolved path, mtime_ns, size) key used by the parse caches."""
+    path = Path(path)
+    stat = path.stat()
+    return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+def _load_yaml_config(path: Path, mutable: bool = True) -> dict:
+    """Load a YAML configuration file, reusing the parse if it is unchanged.
+
+    Args:
+        path: Path to the YAML file
+        mutable: Return a private (deep) copy that callers may modify; pass
+            False for read-only access to the cached parse
+
+    Returns:
+        Parsed configuration
+    """
+    parsed = _load_yaml_cached(*_yaml_cache_key(path))
+    return copy.deepcopy(parsed) if mutable else parsed
+
+
+# Top-level 'repositories:' key introducing a block (usually the bulk of a config)
+_REPOSITORIES_BLOCK_RE = re.compile(r"^repositories:[ \t]*(?:#.*)?$", re.MULTILINE)
+# Any column-0 line that starts a new top-level key (not indentation, a
+# zero-indented list item, or a comment)
+_TOP_LEVEL_LINE_RE = re.compile(r"^[^\s#-]", re.MULTILINE)
+
+
+def _load_yaml_key(path: Path, key: str) -> dict:
+    """Parse a YAML configuration file far enough to read one top-level key.
+
+    When the requested key is not 'repositories', the top-level repositories
+    block is cut out of the document before parsing, since it is typically
+    most of the file and is not needed. Falls back to a full parse if the
+    trimmed document fails to parse or does not contain the key. Results are
+    cached until the file changes; callers must not mutate them.
+
+    Args:
+        path: Path to the YAML file
+        key: Top-level key that will be read from the result
+
+    Returns:
+        Parsed configuration containing at least the requested key if present
+    """
+    cache_key = _yaml_cache_key(path)
+    if key == "repositories":
+        return _load_yaml_cached(*cache_key)
+    return _load_yaml_key_cached(*cache_key, key)
+
+
+@lru_cache(maxsize=32)
+def _load_yaml_key_cached(path_str: str, mtime_ns: int, size: int, key: str) -> dict:
+    """Partially parse a YAML file for one top-level key (see _load_yaml_key)."""
+    text = Path(path_str).read_text(encoding="utf-8")
+
+    start = _REPOSITORIES_BLOCK_RE.search(text)
+    if start:
+        end = _TOP_LEVEL_LINE_RE.search(text, start.end())
+        trimmed = text[: start.start()] + (text[end.start() :] if end else "")
+        try:
+            data = yaml.load(trimmed, Loader=SafeLoader) or {}
+        except yaml.YAMLError:
+            data = None
+        if isinstance(data, dict) and key in data:
+            return data
+
+    return _load_yaml_cached(path_str, mtime_ns, size)
+
+
+def _write_yaml_file(path: Path, data: dict) -> None:
+    """Atomically write a configuration dictionary as YAML.
+
+    Writes through write_yaml_file and invalidates the cached parses.
+
+    Args:
+        path: Path to the YAML file
+        data: Configuration to write
+    """
+    write_yaml_file(path, data)
+
+    # Do not rely on the new mtime alone to invalidate cached parses, as
+    # coarse filesystem timestamps can repeat
+    _load_yaml_cached.cache_clear()
+    _load_yaml_key_cached.cache_clear()
+
+
+def _split_csv(value: str) -> list:
+    """Split a comma-separated option value, dropping empty entries.
+
+    Args:
+        value: Comma-separated string (may be empty or None)
+
+    Returns:
+        List of stripped, non-empty values
+    """
+    if not value:
+        return []
+    return [part for part in (seg.strip() for seg in value.split(",")) if part]
+
+
+def _json_out(obj, pretty=None) -> str:
+    """Serialize an object for JSON output on stdout.
+
+    Output is indented for interactive terminals and compact when stdout is
+    piped or redirected, where indentation only adds bytes for the consumer.
+
+    Args:
+        obj: Object to serialize
+        pretty: Force indented (True) or compact (False) output; by default
+            indent only when stdout is a TTY
+
+    Returns:
+        JSON string
+    """
+    if pretty is None:
+        pretty = sys.stdout.isatty()
+    return dump_json(obj, pretty=pretty)
+
+
 @click.group()
 @click.version_option(version=__version__)
 def cli():
@@ -121,6 +277,8 @@ def ingest(
 
         terraform-ingest ingest config.yaml --chromadb-path /custom/chromadb/path
     """
+    from terraform_ingest.ingest import TerraformIngest
+
     click.echo(f"Loading configuration from {config_file}")
 
     try:
@@ -264,6 +422,8 @@ def analyze(
 
         terraform-ingest analyze https://github.com/user/terraform-module -b develop --include-tags
     """
+    from terraform_ingest.ingest import TerraformIngest
+
     click.echo(f"Analyzing repository: {repository_url}")
 
     try:
@@ -292,7 +452,7 @@ def analyze(
             click.echo(f"\nAnalysis saved to {output_path}")
         else:
             for summary in summaries:
-                click.echo(json.dumps(summary.model_dump(), indent=2, default=str))
+                click.echo(_json_out(summary.model_dump()))
 
         click.echo(f"\nAnalyzed {len(summaries)} module version(s)")
 
@@ -390,8 +550,7 @@ def init(config_file):
         },
     }
 
-    with open(config_path, "w") as f:
-        yaml.dump(sample_config, f, default_flow_style=False, sort_keys=False)
+    _write_yaml_file(config_path, sample_config)
 
     click.echo(f"Created sample configuration at {config_file}")
     click.echo("\nConfiguration includes:")
@@ -444,6 +603,7 @@ def install_deps(config_file, strategy, no_auto_install):
         # Report only (no install)
         terraform-ingest install-deps config.yaml --no-auto-install
     """
+    from terraform_ingest.dependency_installer import DependencyInstaller
 
     try:
         packages_to_install = []
@@ -453,8 +613,7 @@ def install_deps(config_file, strategy, no_auto_install):
         if config_file:
             # Load from config file
             click.echo(f"Loading configuration from {config_file}")
-            with open(config_file, "r") as f:
-                config_data = yaml.safe_load(f)
+            config_data = _load_yaml_file(config_file)
 
             embedding_config = config_data.get("embedding", {})
 
@@ -606,6 +765,8 @@ def search(query, config, provider, repository, limit, output_json):
 
         terraform-ingest search "vpc" --json
     """
+    from terraform_ingest.ingest import TerraformIngest
+
     try:
         # Load config to get vector DB settings
         ingester = TerraformIngest.from_yaml(config)
@@ -648,7 +809,7 @@ def search(query, config, provider, repository, limit, output_json):
                 "count": len(results),
                 "results": results,
             }
-            click.echo(json.dumps(json_output, indent=2))
+            click.echo(_json_out(json_output))
         else:
             # Output as formatted text
             click.echo(f"\nFound {len(results)} result(s):\n")
@@ -710,6 +871,8 @@ def module(repository, ref, path, output_json, output_dir):
 
         terraform-ingest module terraform-aws-vpc v5.0.0 -o /path/to/output
     """
+    from terraform_ingest.mcp_service import ModuleQueryService
+
     try:
         # Determine output directory
         if output_dir is None:
@@ -740,7 +903,7 @@ def module(repository, ref, path, output_json, output_dir):
 
         if output_json:
             # Output as JSON
-            click.echo(json.dumps(module_data, indent=2, default=str))
+            click.echo(_json_out(module_data))
         else:
             # Output as formatted text
             # Display module information
@@ -904,6 +1067,8 @@ def mcp(config, transport, host, port, ingest_on_startup):
 
         terraform-ingest mcp --transport sse --host localhost --port 8000 --ingest-on-startup
     """
+    from terraform_ingest.mcp_service import start as mcp_main
+
     # Set the config file environment variable if provided
     if config is not None:
         os.environ["TERRAFORM_INGEST_CONFIG"] = config
@@ -939,6 +1104,54 @@ def function():
     pass
 
 
+# Cache of collected MCP function metadata keyed by tool registry identity
+_MCP_FUNCTIONS_CACHE = {}
+
+
+def _collect_mcp_functions(tools_dict) -> tuple:
+    """Collect name, description and parameter names for each MCP tool.
+
+    Args:
+        tools_dict: Mapping of tool names to FastMCP tool objects
+
+    Returns:
+        Tuple of (name, description, parameters) tuples sorted by name
+    """
+    functions = []
+    for tool_name, tool in tools_dict.items():
+        parameters = ()
+        params_schema = getattr(tool, "parameters", None)
+        if isinstance(params_schema, dict) and "properties" in params_schema:
+            parameters = tuple(params_schema["properties"].keys())
+        functions.append(
+            (tool_name, tool.description or "No description available", parameters)
+        )
+
+    # Sort functions by name for consistent output
+    functions.sort(key=lambda x: x[0])
+    return tuple(functions)
+
+
+def _get_mcp_functions(tools_dict) -> tuple:
+    """Get the collected MCP function metadata, reusing a previous collection.
+
+    The cache is keyed by the identity and size of the tool registry so that
+    tools registered after the first lookup are still picked up.
+
+    Args:
+        tools_dict: Mapping of tool names to FastMCP tool objects
+
+    Returns:
+        Tuple of (name, description, parameters) tuples sorted by name
+    """
+    key = (id(tools_dict), len(tools_dict))
+    functions = _MCP_FUNCTIONS_CACHE.get(key)
+    if functions is None:
+        functions = _collect_mcp_functions(tools_dict)
+        _MCP_FUNCTIONS_CACHE[key] = functions
+    return functions
+
+
 @function.command()
 @click.option(
     "--output-dir",
@@ -970,50 +1183,34 @@ def show(output_dir, format):
         from terraform_ingest.mcp_service import mcp
 
         # Dynamically detect exposed MCP functions from the tool manager
-        functions = []
+        functions = ()
         if hasattr(mcp, "_tool_manager") and hasattr(mcp._tool_manager, "_tools"):
-            tools_dict = mcp._tool_manager._tools
-            for tool_name, tool in tools_dict.items():
-                # Extract function information from the tool
-                func_info = {
-                    "name": tool_name,
-                    "description": tool.description or "No description available",
-                    "parameters": [],
-                }
-
-                # Extract parameters from tool's parameter schema
-                if hasattr(tool, "parameters") and tool.parameters:
-                    params_schema = tool.parameters
-                    if (
-                        isinstance(params_schema, dict)
-                        and "properties" in params_schema
-                    ):
-                        func_info["parameters"] = list(
-                            params_schema["properties"].keys()
-                        )
-
-                functions.append(func_info)
-
-        # Sort functions by name for consistent output
-        functions.sort(key=lambda x: x["name"])
+            functions = _get_mcp_functions(mcp._tool_manager._tools)
 
         if format == "json":
-            click.echo(json.dumps(functions, indent=2))
+            click.echo(
+                _json_out(
+                    [
+                        {"name": name, "description": desc, "parameters": list(params)}
+                        for name, desc, params in functions
+                    ]
+                )
+            )
         elif format == "list":
             if functions:
-                for func in functions:
-                    click.echo(f"• {func['name']}")
+                for name, _, _ in functions:
+                    click.echo(f"• {name}")
             else:
                 click.echo("No MCP functions found")
         else:  # table format
             if functions:
                 click.echo("Available MCP Functions:")
                 click.echo("-" * 80)
-                for func in functions:
-                    click.echo(f"\nFunction: {func['name']}")
-                    click.echo(f"Description: {func['description']}")
-                    if func["parameters"]:
-                        click.echo(f"Parameters: {', '.join(func['parameters'])}")
+                for name, desc, params in functions:
+                    click.echo(f"\nFunction: {name}")
+                    click.echo(f"Description: {desc}")
+                    if params:
+                        click.echo(f"Parameters: {', '.join(params)}")
                     else:
                         click.echo("Parameters: (none)")
             else:
@@ -1048,6 +1245,8 @@ def resource(resource_path, output_dir):
 
         terraform-ingest resource module://terraform-aws-vpc/v5.0.0/modules-networking
     """
+    from terraform_ingest.mcp_service import _get_module_resource_impl
+
     try:
         # Parse the resource path
         # Expected format: module://repository/ref/path
@@ -1088,6 +1287,182 @@ def resource(resource_path, output_dir):
         raise click.Abort()
 
 
+# String values accepted as True when coercing function arguments
+_TRUTHY = frozenset({"true", "1", "yes", "on", "y", "t"})
+
+
+def _to_bool(value, default: bool = False) -> bool:
+    """Coerce a function argument to a boolean.
+
+    Args:
+        value: Argument value (bool, string or None)
+        default: Value returned when the argument is missing
+
+    Returns:
+        Boolean value of the argument
+    """
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in _TRUTHY
+
+
+def _to_int(value, default: int) -> int:
+    """Coerce a function argument to an integer.
+
+    Args:
+        value: Argument value (int, string or None)
+        default: Value returned when the argument is missing or not numeric
+
+    Returns:
+        Integer value of the argument
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+@cache
+def _arg_field_names(cls) -> tuple:
+    """Return the field names of an argument schema, computed once per class."""
+    return tuple(f.name for f in fields(cls))
+
+
+@dataclass(slots=True)
+class _ModuleRefArgs:
+    """Arguments identifying a single module version (repository, ref, path)."""
+
+    repository: str = ""
+    ref: str = ""
+    path: str = "."
+
+    @classmethod
+    def from_args(cls, args: dict) -> "_ModuleRefArgs":
+        """Build the schema from exec arguments, applying declared defaults.
+
+        Args:
+            args: Function arguments passed to exec
+
+        Returns:
+            Populated argument schema
+        """
+        return cls(
+            **{name: args[name] for name in _arg_field_names(cls) if name in args}
+        )
+
+
+def _exec_search_modules_vector(ctx, args: dict):
+    """Run search_modules_vector against the MCP context's vector database."""
+    return ctx.ingester.search_vector_db(
+        args.get("query", ""),
+        filters={k: v for k, v in args.items() if k in ["provider", "repository"]},
+        n_results=_to_int(args.get("limit"), 10),
+    )
+
+
+def _exec_list_repositories(service, args: dict):
+    """Run list_repositories against a ModuleQueryService."""
+    return service.list_repositories(
+        filter_keyword=args.get("filter"),
+        limit=_to_int(args.get("limit"), 50),
+    )
+
+
+def _exec_search_modules(service, args: dict):
+    """Run search_modules against a ModuleQueryService."""
+    repo_urls = None
+    if "repo_urls" in args:
+        # Handle comma-separated or list-style repo URLs
+        repo_urls = (
+            args["repo_urls"].split(",")
+            if isinstance(args["repo_urls"], str)
+            else args["repo_urls"]
+        )
+    return service.search_modules(
+        query=args.get("query", ""),
+        repo_urls=repo_urls,
+        provider=args.get("provider"),
+    )
+
+
+def _exec_get_module_details(service, args: dict):
+    """Run get_module_details against a ModuleQueryService."""
+    module = _ModuleRefArgs.from_args(args)
+    return service.get_module(
+        repository=module.repository,
+        ref=module.ref,
+        path=module.path,
+        # Parse 'all' argument as boolean (default: False)
+        include_readme=_to_bool(args.get("all")),
+    )
+
+
+def _exec_list_modules(service, args: dict):
+    """Run list_modules against a ModuleQueryService."""
+    return service.list_modules(limit=_to_int(args.get("limit"), 100))
+
+
+def _exec_list_module_resources(service, args: dict):
+    """Run list_module_resources against a ModuleQueryService."""
+    module = _ModuleRefArgs.from_args(args)
+    return service.list_module_resources(
+        repository=module.repository, ref=module.ref, path=module.path
+    )
+
+
+def _stream_json_array(records, pretty=None) -> None:
+    """Write a JSON array to stdout one record at a time.
+
+    The output matches _json_out(list(records), pretty) but never builds the
+    full document in memory, so large list results start printing immediately.
+
+    Args:
+        records: Iterable of JSON-serializable records
+        pretty: Force indented (True) or compact (False) output; by default
+            indent only when stdout is a TTY
+    """
+    if pretty is None:
+        pretty = sys.stdout.isatty()
+
+    first = True
+    for record in records:
+        if pretty:
+            prefix = "[\n  " if first else ",\n  "
+            chunk = dump_json(record).replace("\n", "\n  ")
+        else:
+            prefix = "[" if first else ","
+            chunk = dump_json(record, pretty=False)
+        click.echo(prefix + chunk, nl=False)
+        first = False
+
+    if first:
+        click.echo("[]")
+    else:
+        click.echo("\n]" if pretty else "]")
+
+
+# exec functions whose results are lists and can be streamed as JSON arrays
+_LIST_RESULT_FUNCTIONS = frozenset(
+    {"list_modules", "list_repositories", "search_modules", "list_module_resources"}
+)
+
+
+# Map function names to their handlers. search_modules_vector receives the
+# MCPContext; every other handler receives a ModuleQueryService.
+_EXEC_DISPATCH = {
+    "search_modules_vector": _exec_search_modules_vector,
+    "list_repositories": _exec_list_repositories,
+    "search_modules": _exec_search_modules,
+    "get_module_details": _exec_get_module_details,
+    "list_modules": _exec_list_modules,
+    "list_module_resources": _exec_list_module_resources,
+}
+
+
 @function.command()
 @click.argument("function_name")
 @click.option(
@@ -1108,7 +1483,7 @@ def resource(resource_path, output_dir):
     "-f",
     type=click.Choice(["json", "text"]),
     default="json",
-    help="Output format for function results",
+    help="Output format for function results (text emits one compact JSON record per line)",
 )
 def exec(function_name, arg, output_dir, format):
     """Execute an MCP function.
@@ -1128,97 +1503,111 @@ def exec(function_name, arg, output_dir, format):
     """
     try:
         # Convert arguments to dictionary
-        args_dict = {}
-        for key, value in arg:
-            args_dict[key] = value
+        args_dict = dict(arg)
 
         # Add output_dir to arguments if not already present
-        if "output_dir" not in args_dict and function_name != "search_modules_vector":
-            args_dict["output_dir"] = output_dir
+        if function_name != "search_modules_vector":
+            args_dict.setdefault("output_dir", output_dir)
 
         # click.echo(f"Executing function: {function_name}")
         # click.echo(f"Arguments: {args_dict}")
 
+        # Resolve the handler before importing the MCP service so unknown
+        # names fail fast without loading fastmcp
+        handler = _EXEC_DISPATCH.get(function_name)
+        if handler is None:
+            click.echo(f"Error: Unknown function '{function_name}'", err=True)
+            raise click.Abort()
+
         # Import the ModuleQueryService
         from terraform_ingest.mcp_service import ModuleQueryService, MCPContext
 
-        # Map function names to methods
         if function_name == "search_modules_vector":
             # This function needs the MCPContext for vector DB access
             ctx = MCPContext.get_instance()
             if not ctx.ingester or not ctx.ingester.vector_db:
                 click.echo("Error: Vector database is not enabled", err=True)
                 raise click.Abort()
-            result = ctx.ingester.search_vector_db(
-                args_dict.get("query", ""),
-                filters={
-                    k: v
-                    for k, v in args_dict.items()
-                    if k in ["provider", "repository"]
-                },
-                n_results=int(args_dict.get("limit", 10)),
-            )
+            result = handler(ctx, args_dict)
         else:
             # Use ModuleQueryService for other functions
             service = ModuleQueryService(
                 output_dir=args_dict.get("output_dir", "./output")
             )
-
-            if function_name == "list_repositories":
-                result = service.list_repositories(
-                    filter_keyword=args_dict.get("filter"),
-                    limit=int(args_dict.get("limit", 50)),
-                )
-            elif function_name == "search_modules":
-                repo_urls = None
-                if "repo_urls" in args_dict:
-                    # Handle comma-separated or list-style repo URLs
-                    repo_urls = (
-                        args_dict["repo_urls"].split(",")
-                        if isinstance(args_dict["repo_urls"], str)
-                        else args_dict["repo_urls"]
-                    )
-                result = service.search_modules(
-                    query=args_dict.get("query", ""),
-                    repo_urls=repo_urls,
-                    provider=args_dict.get("provider"),
-                )
-            elif function_name == "get_module_details":
-                # Parse 'all' argument as boolean (default: False)
-                include_readme = args_dict.get("all", "false").lower() in (
-                    "true",
-                    "1",
-                    "yes",
-                )
-                result = service.get_module(
-                    repository=args_dict.get("repository", ""),
-                    ref=args_dict.get("ref", ""),
-                    path=args_dict.get("path", "."),
-                    include_readme=include_readme,
-                )
-            elif function_name == "list_modules":
-                result = service.list_modules(limit=int(args_dict.get("limit", 100)))
-            elif function_name == "list_module_resources":
-                result = service.list_module_resources(
-                    repository=args_dict.get("repository", ""),
-                    ref=args_dict.get("ref", ""),
-                    path=args_dict.get("path", "."),
-                )
-            else:
-                click.echo(f"Error: Unknown function '{function_name}'", err=True)
-                raise click.Abort()
+            result = handler(service, args_dict)
 
         # Output the result
         if format == "json":
-            click.echo(json.dumps(result, indent=2, default=str))
-        else:  # text format
-            click.echo(json.dumps(result, indent=2, default=str))
+            if function_name in _LIST_RESULT_FUNCTIONS and isinstance(result, list):
+                _stream_json_array(result)
+            else:
+                click.echo(_json_out(result))
+        else:  # text format: one compact JSON document per record
+            records = result if isinstance(result, list) else [result]
+            for record in records:
+                click.echo(dump_json(record, pretty=False))
 
     except Exception as e:
         click.echo(f"Error executing function '{function_name}': {e}", err=True)
         raise click.Abort()
 
 
+def _echo_module_entries(header: str, modules: list) -> None:
+    """Write a header and a list of index entries with a single echo.
+
+    Args:
+        header: Heading line printed before the entries
+        modules: Module index entries to list
+    """
+    out = [header]
+    for module in modules:
+        out.append(
+            f"  • {module['repository']} ({module['ref']})\n"
+            f"    Path: {module['path']}\n"
+            f"    ID: {module['id']}\n"
+        )
+    click.echo("\n".join(out))
+
+
+@lru_cache(maxsize=4)
+def _load_indexer(
+    output_dir: str, resolved_dir: str, index_mtime_ns: int
+) -> ModuleIndexer:
+    """Load a ModuleIndexer, cached per output directory and index mtime.
+
+    Args:
+        output_dir: Output directory as given on the command line
+        resolved_dir: Absolute path of the output directory (part of the cache key)
+        index_mtime_ns: Modification time of the index file (part of the cache key)
+
+    Returns:
+        ModuleIndexer instance with the index loaded
+    """
+    return ModuleIndexer(output_dir)
+
+
+def _get_indexer(output_dir: str) -> ModuleIndexer:
+    """Get a ModuleIndexer for read-only index commands.
+
+    Repeated lookups within the same process reuse the parsed index until the
+    index file changes on disk.
+
+    Args:
+        output_dir: Output directory with module JSON files
+
+    Returns:
+        ModuleIndexer instance
+    """
+    resolved_dir = Path(output_dir).resolve()
+    try:
+        index_mtime_ns = (
+            (resolved_dir / ModuleIndexer.DEFAULT_INDEX_FILENAME).stat().st_mtime_ns
+        )
+    except OSError:
+        index_mtime_ns = 0
+    return _load_indexer(output_dir, str(resolved_dir), index_mtime_ns)
+
+
 @cli.group()
 def index():
     """Manage the module index for fast lookups."""
@@ -1253,7 +1642,7 @@ def rebuild(output_dir):
 def stats(output_dir):
     """Show module index statistics."""
     try:
-        indexer = ModuleIndexer(output_dir)
+        indexer = _get_indexer(output_dir)
         stats_data = indexer.get_stats()
         click.echo("\n📊 Module Index Statistics:")
         click.echo(f"  Total Modules: {stats_data['total_modules']}")
@@ -1284,7 +1673,7 @@ def stats(output_dir):
 def lookup(doc_id, output_dir, output_json):
     """Look up a module by its document ID."""
     try:
-        indexer = ModuleIndexer(output_dir)
+        indexer = _get_indexer(output_dir)
         module = indexer.get_module(doc_id)
 
         if not module:
@@ -1292,7 +1681,7 @@ def lookup(doc_id, output_dir, output_json):
             raise click.Abort()
 
         if output_json:
-            click.echo(json.dumps(module, indent=2))
+            click.echo(_json_out(module))
         else:
             click.echo(f"\n📦 Module: {doc_id}")
             click.echo(f"  Repository: {module['repository']}")
@@ -1325,7 +1714,7 @@ def lookup(doc_id, output_dir, output_json):
 def by_provider(provider, output_dir, output_json):
     """Search modules by provider."""
     try:
-        indexer = ModuleIndexer(output_dir)
+        indexer = _get_indexer(output_dir)
         results = indexer.search_by_provider(provider)
 
         if not results:
@@ -1333,15 +1722,12 @@ def by_provider(provider, output_dir, output_json):
             return
 
         if output_json:
-            click.echo(json.dumps(results, indent=2))
+            click.echo(_json_out(results))
         else:
-            click.echo(
-                f"\n🔍 Found {len(results)} module(s) for provider '{provider}':\n"
+            _echo_module_entries(
+                f"\n🔍 Found {len(results)} module(s) for provider '{provider}':\n",
+                results,
             )
-            for module in results:
-                click.echo(f"  • {module['repository']} ({module['ref']})")
-                click.echo(f"    Path: {module['path']}")
-                click.echo(f"    ID: {module['id']}\n")
     except Exception as e:
         click.echo(f"Error searching by provider: {e}", err=True)
         raise click.Abort()
@@ -1364,7 +1750,7 @@ def by_provider(provider, output_dir, output_json):
 def by_tag(tag, output_dir, output_json):
     """Search modules by tag."""
     try:
-        indexer = ModuleIndexer(output_dir)
+        indexer = _get_indexer(output_dir)
         results = indexer.search_by_tag(tag)
 
         if not results:
@@ -1372,13 +1758,11 @@ def by_tag(tag, output_dir, output_json):
             return
 
         if output_json:
-            click.echo(json.dumps(results, indent=2))
+            click.echo(_json_out(results))
         else:
-            click.echo(f"\n🏷️  Found {len(results)} module(s) with tag '{tag}':\n")
-            for module in results:
-                click.echo(f"  • {module['repository']} ({module['ref']})")
-                click.echo(f"    Path: {module['path']}")
-                click.echo(f"    ID: {module['id']}\n")
+            _echo_module_entries(
+                f"\n🏷️  Found {len(results)} module(s) with tag '{tag}':\n", results
+            )
     except Exception as e:
         click.echo(f"Error searching by tag: {e}", err=True)
         raise click.Abort()
@@ -1401,7 +1785,7 @@ def by_tag(tag, output_dir, output_json):
 def get(doc_id, output_dir, output_json):
     """Get full module summary by index ID."""
     try:
-        indexer = ModuleIndexer(output_dir)
+        indexer = _get_indexer(output_dir)
         module_entry = indexer.get_module(doc_id)
 
         if not module_entry:
@@ -1419,59 +1803,63 @@ def get(doc_id, output_dir, output_json):
             raise click.Abort()
 
         # Load the full module summary
-        with open(summary_path, "r", encoding="utf-8") as f:
-            summary = json.load(f)
+        summary = load_json(summary_path.read_bytes())
 
         if output_json:
-            click.echo(json.dumps(summary, indent=2))
+            click.echo(_json_out(summary))
         else:
-            click.echo(f"\n📄 Module Summary for ID: {doc_id}\n")
-            click.echo(f"Repository: {summary.get('repository', 'N/A')}")
-            click.echo(f"Ref: {summary.get('ref', 'N/A')}")
-            click.echo(f"Path: {summary.get('path', 'N/A')}")
-            click.echo(f"Description: {summary.get('description', 'N/A')}\n")
+            # Collect the report and write it with a single echo
+            out = []
+            out.append(f"\n📄 Module Summary for ID: {doc_id}\n")
+            out.append(f"Repository: {summary.get('repository', 'N/A')}")
+            out.append(f"Ref: {summary.get('ref', 'N/A')}")
+            out.append(f"Path: {summary.get('path', 'N/A')}")
+            out.append(f"Description: {summary.get('description', 'N/A')}\n")
 
             # Show providers
             if summary.get("providers"):
-                click.echo("Providers:")
+                out.append("Providers:")
                 for provider in summary["providers"]:
-                    click.echo(
+                    out.append(
                         f"  • {provider.get('name', 'unknown')} "
                         f"({provider.get('source', 'unknown')})"
                     )
-                click.echo()
+                out.append("")
 
             # Show variables
             if summary.get("variables"):
-                click.echo(f"Variables ({len(summary['variables'])}):")
+                out.append(f"Variables ({len(summary['variables'])}):")
                 for var in summary["variables"]:
                     required = " (required)" if var.get("required") else ""
-                    click.echo(f"  • {var.get('name', 'unknown')}{required}")
+                    out.append(f"  • {var.get('name', 'unknown')}{required}")
                     if var.get("description"):
-                        click.echo(f"    Description: {var['description']}")
+                        out.append(f"    Description: {var['description']}")
                     if var.get("type"):
-                        click.echo(f"    Type: {var['type']}")
-                click.echo()
+                        out.append(f"    Type: {var['type']}")
+                out.append("")
 
             # Show outputs
             if summary.get("outputs"):
-                click.echo(f"Outputs ({len(summary['outputs'])}):")
+                out.append(f"Outputs ({len(summary['outputs'])}):")
                 for output in summary["outputs"]:
-                    click.echo(f"  • {output.get('name', 'unknown')}")
+                    out.append(f"  • {output.get('name', 'unknown')}")
                     if output.get("description"):
-                        click.echo(f"    Description: {output['description']}")
-                click.echo()
+                        out.append(f"    Description: {output['description']}")
+                out.append("")
 
             # Show README preview
             if summary.get("readme_content"):
-                readme = summary["readme_content"]
-                lines = readme.split("\n")[:10]
-                click.echo("README Preview:")
-                for line in lines:
-                    click.echo(f"  {line}")
-                if len(summary["readme_content"].split("\n")) > 10:
-                    click.echo("  ...")
-                click.echo()
+                # Split at most 10 times: the first 10 entries are the preview
+                # and an 11th entry only exists if there is more to show
+                readme_lines = summary["readme_content"].split("\n", 10)
+                out.append("README Preview:")
+                for line in readme_lines[:10]:
+                    out.append(f"  {line}")
+                if len(readme_lines) > 10:
+                    out.append("  ...")
+                out.append("")
+
+            click.echo("\n".join(out))
 
     except json.JSONDecodeError:
         click.echo("Error: Invalid JSON in module summary file", err=True)
@@ -1574,11 +1962,13 @@ def github(
 
         terraform-ingest import github --org myorg --max-tags 5 --branches main,develop
     """
+    from terraform_ingest.importers import GitHubImporter, update_config_file
+
     try:
         config_path = Path(config)
 
         # Parse branches from comma-separated string
-        branches_list = [b.strip() for b in branches.split(",") if b.strip()]
+        branches_list = _split_csv(branches)
 
         # Create importer
         importer = GitHubImporter(
@@ -1587,20 +1977,20 @@ def github(
             include_private=include_private,
             terraform_only=terraform_only,
             base_path=base_path,
+            max_tags=max_tags,
+            branches=branches_list,
         )
 
         # Fetch repositories
-        repos = importer.fetch_repositories()
+        try:
+            repos = importer.fetch_repositories()
+        finally:
+            importer.close()
 
         if not repos:
             click.echo("No repositories found matching criteria", err=True)
             return
 
-        # Apply max_tags and branches to all repositories
-        for repo in repos:
-            repo.max_tags = max_tags
-            repo.branches = branches_list
-
         # Update configuration file
         update_config_file(config_path, repos, replace=replace)
 
@@ -1699,11 +2089,13 @@ def gitlab(
 
         terraform-ingest import gitlab --group mygroup --recursive --gitlab-url https://gitlab.example.com
     """
+    from terraform_ingest.importers import GitLabImporter, update_config_file
+
     try:
         config_path = Path(config)
 
         # Parse branches from comma-separated string
-        branches_list = [b.strip() for b in branches.split(",") if b.strip()]
+        branches_list = _split_csv(branches)
 
         # Create importer
         importer = GitLabImporter(
@@ -1714,20 +2106,20 @@ def gitlab(
             base_path=base_path,
             recursive=recursive,
             gitlab_url=gitlab_url,
+            max_tags=max_tags,
+            branches=branches_list,
         )
 
         # Fetch repositories
-        repos = importer.fetch_repositories()
+        try:
+            repos = importer.fetch_repositories()
+        finally:
+            importer.close()
 
         if not repos:
             click.echo("No repositories found matching criteria", err=True)
             return
 
-        # Apply max_tags and branches to all repositories
-        for repo in repos:
-            repo.max_tags = max_tags
-            repo.branches = branches_list
-
         # Update configuration file
         update_config_file(config_path, repos, replace=replace)
 
@@ -1807,8 +2199,7 @@ def config_set(config, target, value):
             click.echo(f"Error: Configuration file not found: {config}", err=True)
             raise click.Abort()
 
-        with open(config_path, "r") as f:
-            config_data = yaml.safe_load(f) or {}
+        config_data = _load_yaml_file(config_path)
 
         # Parse the target path
         path_parts = target.split(".")
@@ -1833,8 +2224,7 @@ def config_set(config, target, value):
         current[path_parts[-1]] = converted_value
 
         # Write back to file
-        with open(config_path, "w") as f:
-            yaml.dump(config_data, f, default_flow_style=False, sort_keys=False)
+        _write_yaml_file(config_path, config_data)
 
         click.echo(f"✓ Set {target} = {converted_value}")
 
@@ -1888,34 +2278,39 @@ def config_get(config, target, output_json):
     try:
         config_path = Path(config)
 
-        with open(config_path, "r") as f:
-            config_data = yaml.safe_load(f) or {}
-
         # If no target is specified, show the entire configuration
         if target is None:
+            config_data = _load_yaml_config(config_path, mutable=False)
             if output_json:
-                click.echo(json.dumps(config_data, indent=2, default=str))
+                click.echo(_json_out(config_data))
             else:
-                click.echo(yaml.dump(config_data, default_flow_style=False))
+                click.echo(
+                    yaml.dump(config_data, Dumper=SafeDumper, default_flow_style=False)
+                )
             return
 
         # Parse the target path
         path_parts = target.split(".")
 
-        # Navigate to the target location
-        current = config_data
-        for part in path_parts:
-            if not isinstance(current, dict) or part not in current:
-                click.echo(f"Error: Configuration key not found: {target}", err=True)
-                raise click.Abort()
-            current = current[part]
+        # Only the first path component's section needs to be parsed
+        config_data = _load_yaml_key(config_path, path_parts[0])
+
+        # Navigate to the target location; a non-mapping along the way
+        # raises TypeError, a missing key KeyError
+        try:
+            current = reduce(operator.getitem, path_parts, config_data)
+        except (KeyError, TypeError):
+            click.echo(f"Error: Configuration key not found: {target}", err=True)
+            raise click.Abort()
 
         # Output the value
         if output_json:
-            click.echo(json.dumps(current, indent=2, default=str))
+            click.echo(_json_out(current))
         else:
             if isinstance(current, (dict, list)):
-                click.echo(yaml.dump(current, default_flow_style=False))
+                click.echo(
+                    yaml.dump(current, Dumper=SafeDumper, default_flow_style=False)
+                )
             else:
                 click.echo(current)
 
@@ -1992,47 +2387,47 @@ def config_add_repo(
             click.echo(f"Error: Configuration file not found: {config}", err=True)
             raise click.Abort()
 
-        with open(config_path, "r") as f:
-            config_data = yaml.safe_load(f) or {}
+        config_data = _load_yaml_config(config_path)
 
         # Parse branches
-        branches_list = [b.strip() for b in branches.split(",") if b.strip()]
-
-        # Create new repository config
-        new_repo = RepositoryConfig(
-            url=url,
-            name=name,
-            branches=branches_list,
-            include_tags=include_tags,
-            max_tags=max_tags,
-            path=path,
-            recursive=recursive,
-        )
+        branches_list = _split_csv(branches)
+
+        # Build the repository entry directly in RepositoryConfig field order;
+        # click has already typed every option, so a model round-trip
+        # (validate + model_dump) would only reproduce this dict
+        new_repo = {
+            "url": url,
+            "name": name,
+            "branches": branches_list,
+            "include_tags": include_tags,
+            "max_tags": max_tags,
+            "path": path,
+            "recursive": recursive,
+            "exclude_paths": [],
+        }
 
         # Ensure repositories array exists
         if "repositories" not in config_data:
             config_data["repositories"] = []
 
         # Check if repository with same URL already exists
-        existing_repos = config_data["repositories"]
-        for repo in existing_repos:
-            if repo.get("url") == url:
-                click.echo(
-                    f"Warning: Repository with URL '{url}' already exists in configuration",
-                    err=True,
-                )
-                click.echo(
-                    "Use 'config set' to update specific values or remove the repository first.",
-                    err=True,
-                )
-                raise click.Abort()
+        existing_urls = {repo.get("url") for repo in config_data["repositories"]}
+        if url in existing_urls:
+            click.echo(
+                f"Warning: Repository with URL '{url}' already exists in configuration",
+                err=True,
+            )
+            click.echo(
+                "Use 'config set' to update specific values or remove the repository first.",
+                err=True,
+            )
+            raise click.Abort()
 
         # Add new repository
-        config_data["repositories"].append(new_repo.model_dump())
+        config_data["repositories"].append(new_repo)
 
         # Write back to file
-        with open(config_path, "w") as f:
-            yaml.dump(config_data, f, default_flow_style=False, sort_keys=False)
+        _write_yaml_file(config_path, config_data)
 
         click.echo(f"✓ Added repository: {url}")
         if name:
@@ -2082,8 +2477,7 @@ def config_remove_repo(config, url, name):
 
         config_path = Path(config)
 
-        with open(config_path, "r") as f:
-            config_data = yaml.safe_load(f) or {}
+        config_data = _load_yaml_config(config_path)
 
         # Get repositories array
         if "repositories" not in config_data or not config_data["repositories"]:
@@ -2107,8 +2501,7 @@ def config_remove_repo(config, url, name):
             raise click.Abort()
 
         # Write back to file
-        with open(config_path, "w") as f:
-            yaml.dump(config_data, f, default_flow_style=False, sort_keys=False)
+        _write_yaml_file(config_path, config_data)
 
         click.echo(
             f"✓ Removed repository: {removed_repo.get('url', removed_repo.get('name'))}"
@@ -2119,6 +2512,14 @@ def config_remove_repo(config, url, name):
         raise click.Abort()
 
 
+# Boolean spellings recognised by 'config set'
+_TRUE_VALUES = frozenset({"true", "yes", "on", "1"})
+_FALSE_VALUES = frozenset({"false", "no", "off", "0"})
+# Numeric literals recognised by 'config set'
+_INT_RE = re.compile(r"[-+]?\d+")
+_FLOAT_RE = re.compile(r"[-+]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?")
+
+
 def _convert_value(value: str):
     """Convert a string value to the appropriate type.
 
@@ -2145,24 +2546,25 @@ def _convert_value(value: str):
         Boolean conversions:
         - True: "true", "yes", "on", "1"
         - False: "false", "no", "off", "0"
+
+        Numeric conversions only apply to plain decimal literals (optional
+        sign, digits, optional fraction and exponent), so values such as
+        "nan", "inf" or "1_000" are kept as strings. Surrounding whitespace
+        is ignored, as with int() and float().
     """
     # Try boolean
-    if value.lower() in ("true", "yes", "on", "1"):
+    lowered = value.lower()
+    if lowered in _TRUE_VALUES:
         return True
-    if value.lower() in ("false", "no", "off", "0"):
+    if lowered in _FALSE_VALUES:
         return False
 
-    # Try integer
-    try:
-        return int(value)
-    except ValueError:
-        pass
-
-    # Try float
-    try:
-        return float(value)
-    except ValueError:
-        pass
+    # Try integer, then float; the patterns avoid raising on plain strings
+    number = value.strip()
+    if _INT_RE.fullmatch(number):
+        return int(number)
+    if _FLOAT_RE.fullmatch(number):
+        return float(number)
 
     # Return as string
     return value
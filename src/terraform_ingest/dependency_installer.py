@@ -1,9 +1,14 @@
 """Automatic dependency installer for optional features."""
 
+import importlib
+import importlib.metadata as _md
+import re
+import shutil
 import subprocess
 import sys
-import site
-from typing import List
+import sysconfig
+from functools import lru_cache
+from typing import FrozenSet, List, Set
 
 from terraform_ingest.tty_logger import setup_tty_logger
 
@@ -44,6 +49,32 @@ logger = setup_tty_logger()
 #     return _cached_logger
 
 
+def _normalize_name(name: str) -> str:
+    """Normalize a distribution or import name for comparison (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@lru_cache(maxsize=None)
+def _installed_distributions() -> FrozenSet[str]:
+    """Get the normalized names of all installed distributions.
+
+    Scans the installed distribution metadata once and caches the result;
+    top-level import names are included so that either form can be checked.
+    The cache is cleared by DependencyInstaller._refresh_sys_path after
+    packages are installed.
+
+    Returns:
+        Frozen set of normalized distribution and import names
+    """
+    names = {
+        _normalize_name(dist.metadata["Name"])
+        for dist in _md.distributions()
+        if dist.metadata["Name"]
+    }
+    names.update(_normalize_name(name) for name in _md.packages_distributions())
+    return frozenset(names)
+
+
 class DependencyInstaller:
     """Handles automatic installation of optional dependencies."""
 
@@ -58,12 +89,16 @@ class DependencyInstaller:
     # Packages needed for vector DB support
     EMBEDDING_PACKAGES = ["chromadb", "sentence-transformers", "openai", "voyageai"]
 
+    # Strategies whose packages were confirmed installed in this process
+    _verified_strategies: Set[str] = set()
+
     @staticmethod
     def check_package_installed(package_name: str) -> bool:
         """Check if a package is installed.
 
         Uses importlib.metadata for more reliable detection, which works better
-        with system-wide installations and UV tool environments.
+        with system-wide installations and UV tool environments. The installed
+        distributions are scanned once and cached rather than per package.
 
         Args:
             package_name: Name of the package to check
@@ -71,17 +106,8 @@ class DependencyInstaller:
         Returns:
             True if package is installed, False otherwise
         """
-        try:
-            # First try importlib.metadata (more reliable for system installs)
-            import importlib.metadata
-
-            try:
-                importlib.metadata.version(package_name)
-                return True
-            except importlib.metadata.PackageNotFoundError:
-                pass
-        except (ImportError, Exception):
-            pass
+        if _normalize_name(package_name) in _installed_distributions():
+            return True
 
         # Fallback to __import__ for compatibility
         try:
@@ -97,19 +123,23 @@ class DependencyInstaller:
         This is necessary after subprocess package installations to ensure
         that newly installed packages are discoverable by the current Python process.
         """
-        try:
-            # Re-scan site-packages directories
-            site.main()
-
-            # Also try to add site packages manually
-            import sysconfig
+        # Newly installed distributions must be picked up by the next check,
+        # and strategies verified before the install are checked again
+        _installed_distributions.cache_clear()
+        DependencyInstaller._verified_strategies.clear()
 
+        try:
+            # Make sure the install locations are on sys.path; a full site.main()
+            # would also re-read every .pth file and rerun sitecustomize
             stdlib_packages = sysconfig.get_paths()
             for key in ["purelib", "platlib"]:
                 if key in stdlib_packages:
                     path = stdlib_packages[key]
                     if path not in sys.path:
                         sys.path.insert(0, path)
+
+            # Drop cached directory listings so the finders see the new packages
+            importlib.invalidate_caches()
         except Exception as e:
             logger.debug(f"Could not refresh sys.path: {e}")
 
@@ -123,11 +153,15 @@ class DependencyInstaller:
         Returns:
             List of package names that are missing
         """
-        missing = []
-        for package in packages:
-            if not DependencyInstaller.check_package_installed(package):
-                missing.append(package)
-        return missing
+        # One cached scan answers most names; only names it does not know go
+        # through the full check with its import fallback
+        installed = _installed_distributions()
+        return [
+            package
+            for package in packages
+            if _normalize_name(package) not in installed
+            and not DependencyInstaller.check_package_installed(package)
+        ]
 
     @staticmethod
     def install_packages(
@@ -156,8 +190,9 @@ class DependencyInstaller:
 
         logger.info(f"Installing missing packages: {', '.join(still_missing)}")
 
-        # Try uv first if it's available
-        if use_uv:
+        # Try uv first if it's available (checked up front rather than by
+        # spawning a process that fails with FileNotFoundError)
+        if use_uv and shutil.which("uv"):
             uv_approaches = [
                 # Approach 1: uv pip install without --system (for venv)
                 ["uv", "pip", "install"] + still_missing,
@@ -188,14 +223,12 @@ class DependencyInstaller:
             logger.debug("All uv approaches failed, falling back to pip")
 
         # Fall back to pip (try different approaches)
-        pip_approaches = [
-            # Approach 1: pip as a module via python
-            [sys.executable, "-m", "pip", "install"] + still_missing,
-            # Approach 2: pip command directly
-            ["pip", "install"] + still_missing,
-            # Approach 3: pip3 command directly
-            ["pip3", "install"] + still_missing,
-        ]
+        # Approach 1: pip as a module via python (always available to try)
+        pip_approaches = [[sys.executable, "-m", "pip", "install", *still_missing]]
+        # Approaches 2 and 3: pip/pip3 commands directly, if on PATH
+        for pip_exe in ("pip", "pip3"):
+            if shutil.which(pip_exe):
+                pip_approaches.append([pip_exe, "install"] + still_missing)
 
         for pip_cmd in pip_approaches:
             try:
@@ -238,41 +271,61 @@ class DependencyInstaller:
         return False
 
     @staticmethod
-    def ensure_embedding_packages(
+    def ensure_all(
+        strategies: List[str],
         logger=logger,
-        strategy: str = "chromadb-default",
         auto_install: bool = True,
     ) -> bool:
-        """Ensure all packages needed for embeddings are installed.
+        """Ensure the packages for several embedding strategies are installed.
+
+        The packages for all strategies are combined so that missing ones are
+        detected with one check and installed with a single pip/uv call.
+        Strategies already verified in this process are not checked again.
 
         Args:
+            strategies: Embedding strategies being used
             logger: Optional logger instance
-            strategy: Embedding strategy being used
             auto_install: Whether to automatically install missing packages
 
         Returns:
             True if all packages are installed or successfully installed, False otherwise
         """
-        # Get packages needed for the strategy
-        if strategy not in DependencyInstaller.STRATEGY_PACKAGES:
-            logger.warning(f"Unknown embedding strategy: {strategy}")
+        unknown = [
+            s for s in strategies if s not in DependencyInstaller.STRATEGY_PACKAGES
+        ]
+        if unknown:
+            for strategy in unknown:
+                logger.warning(f"Unknown embedding strategy: {strategy}")
             return False
 
-        required_packages = DependencyInstaller.STRATEGY_PACKAGES[strategy]
-
-        # Check if we also need chromadb for the strategy
-        if strategy != "chromadb-default":
-            required_packages = list(set(required_packages + ["chromadb"]))
+        verified = DependencyInstaller._verified_strategies
+        strategies = [s for s in strategies if s not in verified]
+        if not strategies:
+            return True
 
+        # Union of the packages for every strategy, in first-seen order;
+        # every strategy other than chromadb-default also needs chromadb.
+        # The lists are a handful of names, so membership tests on the list
+        # itself are cheaper than building sets.
+        required_packages: List[str] = []
+        for strategy in strategies:
+            for package in DependencyInstaller.STRATEGY_PACKAGES[strategy]:
+                if package not in required_packages:
+                    required_packages.append(package)
+            if strategy != "chromadb-default" and "chromadb" not in required_packages:
+                required_packages.append("chromadb")
+
+        label = ", ".join(f"'{s}'" for s in strategies)
         missing = DependencyInstaller.get_missing_packages(required_packages)
 
         if not missing:
-            logger.debug(f"All packages for '{strategy}' strategy are installed")
+            logger.debug(f"All packages for {label} strategy are installed")
+            verified.update(strategies)
             return True
 
         if not auto_install:
             logger.error(
-                f"Missing packages for '{strategy}' embedding strategy: {', '.join(missing)}\n"
+                f"Missing packages for {label} embedding strategy: {', '.join(missing)}\n"
                 f"Install with:\n"
                 f"  pip install terraform-ingest[embeddings]\n"
                 f"Or specific packages:\n"
@@ -281,9 +334,32 @@ class DependencyInstaller:
             return False
 
         logger.info(
-            f"Missing packages for '{strategy}' embedding strategy: {', '.join(missing)}"
+            f"Missing packages for {label} embedding strategy: {', '.join(missing)}"
+        )
+        if not DependencyInstaller.install_packages(missing, logger):
+            return False
+        DependencyInstaller._verified_strategies.update(strategies)
+        return True
+
+    @staticmethod
+    def ensure_embedding_packages(
+        logger=logger,
+        strategy: str = "chromadb-default",
+        auto_install: bool = True,
+    ) -> bool:
+        """Ensure all packages needed for embeddings are installed.
+
+        Args:
+            logger: Optional logger instance
+            strategy: Embedding strategy being used
+            auto_install: Whether to automatically install missing packages
+
+        Returns:
+            True if all packages are installed or successfully installed, False otherwise
+        """
+        return DependencyInstaller.ensure_all(
+            [strategy], logger=logger, auto_install=auto_install
         )
-        return DependencyInstaller.install_packages(required_packages, logger)
 
 
 def ensure_embeddings_available(
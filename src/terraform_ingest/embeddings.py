@@ -1,14 +1,74 @@
 """Vector database embeddings for Terraform modules."""
 
+import asyncio
+import copy
 import hashlib
 import os
+import sqlite3
+from array import array
+from collections import OrderedDict
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from terraform_ingest.indexer import module_document_id
 from terraform_ingest.models import EmbeddingConfig, TerraformModuleSummary
 
+# Texts per request when embedding concurrently through a remote API
+API_BATCH_SIZE = 128
+
+# Texts per forward pass when encoding locally with sentence-transformers
+ENCODE_BATCH_SIZE = 64
+
+# Upper bounds (in words) of the length buckets encoded as separate batches
+LENGTH_BUCKETS = [16, 32, 64, 128, 256, 512]
+
+# Strategies whose embeddings are computed here and passed to ChromaDB;
+# the others leave embedding to the collection's default function
+CLIENT_EMBEDDING_STRATEGIES = frozenset({"openai", "sentence-transformers"})
+
+# Collection settings. Vectors are compared by cosine distance, which
+# HNSW reduces to a dot product for the unit-length vectors we store
+COLLECTION_METADATA = {
+    "description": "Terraform module embeddings",
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": 200,
+    "hnsw:M": 32,
+}
+
+# Metadata keys accepted as search filters
+FILTER_KEYS = frozenset({"repository", "ref", "path", "provider"})
+
+# Result fields requested from collection.query; stored vectors are never
+# needed and are the most expensive part of a response to transfer
+QUERY_INCLUDE = ["metadatas", "documents", "distances"]
+
+# Modules written per collection.upsert call
+UPSERT_BATCH_SIZE = 250
+
+# File in the ChromaDB directory caching computed embeddings by content hash
+EMBEDDING_CACHE_FILE = "emb_cache.sqlite"
+
+# Retries, and the initial backoff in seconds, for rate limited requests
+RATE_LIMIT_RETRIES = 2
+RATE_LIMIT_BACKOFF = 1.0
+
 
 class EmbeddingStrategy(ABC):
     """Abstract base class for embedding strategies."""
@@ -25,69 +85,325 @@ class EmbeddingStrategy(ABC):
         """
         pass
 
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts.
+
+        Strategies backed by an API or model that accepts batch input should
+        override this to embed all texts in one call.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            One embedding vector per text, in input order
+        """
+        return [self.embed_text(text) for text in texts]
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts without blocking the event loop.
+
+        Remote strategies override this to submit concurrent requests; the
+        default runs embed_texts in a worker thread.
+
+        Args:
+            texts: The texts to embed
+
+        Returns:
+            One embedding vector per text, in input order
+        """
+        return await asyncio.to_thread(self.embed_texts, texts)
+
+
+def _import_openai():
+    """Import the openai package, with an install hint if it is missing."""
+    try:
+        import openai
+    except ImportError:
+        raise ImportError(
+            "openai package is required for OpenAI embeddings. Install with: pip install openai"
+        )
+    return openai
+
+
+def _import_voyageai():
+    """Import the voyageai package, with an install hint if it is missing."""
+    try:
+        import voyageai
+    except ImportError:
+        raise ImportError(
+            "voyageai package is required for Claude/Voyage embeddings. Install with: pip install voyageai"
+        )
+    return voyageai
+
+
+@lru_cache(maxsize=None)
+def _openai_client(api_key: str) -> Any:
+    """Get the process-wide OpenAI client for an API key.
+
+    Clients hold a pooled HTTP connection, so strategies created by separate
+    VectorDBManager instances share one instead of each opening their own.
+    """
+    return _import_openai().OpenAI(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def _voyage_client(api_key: str) -> Any:
+    """Get the process-wide Voyage AI client for an API key."""
+    return _import_voyageai().Client(api_key=api_key)
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an API error is a rate limit (HTTP 429) response."""
+    return (
+        type(error).__name__ == "RateLimitError"
+        or getattr(error, "status_code", None) == 429
+    )
+
+
+def _api_batches(texts: List[str]) -> List[List[str]]:
+    """Split texts into API requests of up to API_BATCH_SIZE texts.
+
+    Args:
+        texts: The texts to embed
+
+    Returns:
+        Consecutive batches of the texts
+    """
+    return [
+        texts[start : start + API_BATCH_SIZE]
+        for start in range(0, len(texts), API_BATCH_SIZE)
+    ]
+
+
+async def _gather_batches(
+    texts: List[str],
+    embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+    max_concurrent_batches: int,
+) -> List[List[float]]:
+    """Embed texts as concurrent API requests of up to API_BATCH_SIZE texts.
+
+    At most max_concurrent_batches requests are in flight at once, and a
+    request that is rate limited is retried with exponential backoff.
+
+    Args:
+        texts: The texts to embed
+        embed_batch: Coroutine function embedding one batch of texts
+        max_concurrent_batches: Maximum number of requests in flight
+
+    Returns:
+        One embedding vector per text, in input order
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_batches)
+
+    async def run(batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                try:
+                    return await embed_batch(batch)
+                except Exception as e:
+                    if attempt == RATE_LIMIT_RETRIES or not _is_rate_limit_error(e):
+                        raise
+                    await asyncio.sleep(RATE_LIMIT_BACKOFF * 2**attempt)
+
+    # gather returns results in batch order, whatever order they complete in
+    results = await asyncio.gather(*(run(batch) for batch in _api_batches(texts)))
+    return [embedding for batch_result in results for embedding in batch_result]
+
+
+@lru_cache(maxsize=8)
+def _tiktoken_encoding(model: str) -> Any:
+    """Get the tiktoken encoding for an OpenAI model, or None without tiktoken."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
 
 class OpenAIEmbeddingStrategy(EmbeddingStrategy):
     """OpenAI embeddings via API."""
 
-    def __init__(self, api_key: str, model: str = "text-embedding-3-small"):
+    # Input limit of the OpenAI embedding models, in tokens
+    MAX_INPUT_TOKENS = 8191
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "text-embedding-3-small",
+        max_concurrent_batches: int = 5,
+    ):
         """Initialize OpenAI embedding strategy.
 
         Args:
             api_key: OpenAI API key
             model: Model to use for embeddings
+            max_concurrent_batches: Maximum concurrent requests in aembed_texts
+
+        Raises:
+            ImportError: If the openai package is not installed
         """
         self.api_key = api_key
         self.model = model
+        self.max_concurrent_batches = max_concurrent_batches
+        self._client = _openai_client(api_key)
+        # Async clients bind to the event loop they are first used in, so
+        # they are created per strategy rather than shared
+        self._async_client = None
+
+    def _get_async_client(self):
+        """Lazy create the asyncio API client, reused for all requests."""
+        if self._async_client is None:
+            self._async_client = _import_openai().AsyncOpenAI(api_key=self.api_key)
+        return self._async_client
+
+    def truncate(self, text: str) -> str:
+        """Truncate text to the model's input token limit.
+
+        Tokens are counted with tiktoken when it is installed, so the cut
+        falls exactly at the limit. Without it, text is capped at two
+        characters per token, which stays under the limit for typical
+        module documentation.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            The text, shortened if it would exceed MAX_INPUT_TOKENS
+        """
+        encoding = _tiktoken_encoding(self.model)
+        if encoding is None:
+            return text[: self.MAX_INPUT_TOKENS * 2]
+
+        tokens = encoding.encode(text)
+        if len(tokens) <= self.MAX_INPUT_TOKENS:
+            return text
+        return encoding.decode(tokens[: self.MAX_INPUT_TOKENS])
 
     def embed_text(self, text: str) -> List[float]:
         """Generate embeddings using OpenAI API."""
-        try:
-            import openai
+        return self.embed_texts([text])[0]
 
-            client = openai.OpenAI(api_key=self.api_key)
-            response = client.embeddings.create(model=self.model, input=text)
-            return response.data[0].embedding
-        except ImportError:
-            raise ImportError(
-                "openai package is required for OpenAI embeddings. Install with: pip install openai"
-            )
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings with OpenAI API requests of API_BATCH_SIZE texts."""
+        embeddings = []
+        for batch in _api_batches([self.truncate(text) for text in texts]):
+            response = self._client.embeddings.create(model=self.model, input=batch)
+            embeddings.extend(item.embedding for item in response.data)
+        return embeddings
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings with concurrent batched OpenAI API requests."""
+        client = self._get_async_client()
+        texts = [self.truncate(text) for text in texts]
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            response = await client.embeddings.create(model=self.model, input=batch)
+            return [item.embedding for item in response.data]
+
+        return await _gather_batches(texts, embed_batch, self.max_concurrent_batches)
 
 
 class ClaudeEmbeddingStrategy(EmbeddingStrategy):
     """Claude embeddings via Anthropic API (uses voyage AI embeddings)."""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_concurrent_batches: int = 5):
         """Initialize Claude/Voyage embedding strategy.
 
         Args:
             api_key: Voyage AI API key (Anthropic partners with Voyage for embeddings)
+            max_concurrent_batches: Maximum concurrent requests in aembed_texts
+
+        Raises:
+            ImportError: If the voyageai package is not installed
         """
         self.api_key = api_key
+        self.max_concurrent_batches = max_concurrent_batches
+        self._client = _voyage_client(api_key)
+        self._async_client = None
+
+    def _get_async_client(self):
+        """Lazy create the asyncio Voyage AI client, reused for all requests."""
+        if self._async_client is None:
+            self._async_client = _import_voyageai().AsyncClient(api_key=self.api_key)
+        return self._async_client
 
     def embed_text(self, text: str) -> List[float]:
         """Generate embeddings using Voyage AI."""
-        try:
-            import voyageai
+        return self.embed_texts([text])[0]
 
-            vo = voyageai.Client(api_key=self.api_key)
-            result = vo.embed([text], model="voyage-2")
-            return result.embeddings[0]
-        except ImportError:
-            raise ImportError(
-                "voyageai package is required for Claude/Voyage embeddings. Install with: pip install voyageai"
-            )
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings with Voyage AI requests of API_BATCH_SIZE texts."""
+        embeddings = []
+        for batch in _api_batches(texts):
+            embeddings.extend(self._client.embed(batch, model="voyage-2").embeddings)
+        return embeddings
+
+    async def aembed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings with concurrent batched Voyage AI requests."""
+        client = self._get_async_client()
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            result = await client.embed(batch, model="voyage-2")
+            return result.embeddings
+
+        return await _gather_batches(texts, embed_batch, self.max_concurrent_batches)
+
+
+def _resolve_device(device: str) -> str:
+    """Resolve an 'auto' torch device to cuda, mps or cpu.
+
+    Args:
+        device: Device name, or 'auto' to pick the best available one
+
+    Returns:
+        Torch device name
+    """
+    if device != "auto":
+        return device
+
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
 
 
 class SentenceTransformersStrategy(EmbeddingStrategy):
     """Local embeddings using sentence-transformers."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        device: str = "auto",
+        fp16: bool = True,
+        backend: str = "torch",
+        onnx_file: Optional[str] = None,
+    ):
         """Initialize sentence-transformers strategy.
 
         Args:
             model_name: Name of the sentence-transformers model
+            device: Torch device for the model, or 'auto' to use a GPU if available
+            fp16: Run the model in half precision when it is not on the CPU
+            backend: Inference backend, 'torch' or 'onnx' (ONNX Runtime)
+            onnx_file: ONNX weights file to load with the onnx backend, such as
+                a pre-quantized INT8 export (default: the model's own export)
         """
         self.model_name = model_name
+        self.device = device
+        self.fp16 = fp16
+        self.backend = backend
+        self.onnx_file = onnx_file
         self._model = None
 
     def _load_model(self):
@@ -95,20 +411,71 @@ class SentenceTransformersStrategy(EmbeddingStrategy):
         if self._model is None:
             try:
                 from sentence_transformers import SentenceTransformer
-
-                self._model = SentenceTransformer(self.model_name)
             except ImportError:
                 raise ImportError(
                     "sentence-transformers package is required for local embeddings. "
                     "Install with: pip install sentence-transformers"
                 )
 
+            device = _resolve_device(self.device)
+            if self.backend == "onnx":
+                provider = (
+                    "CUDAExecutionProvider"
+                    if device.startswith("cuda")
+                    else "CPUExecutionProvider"
+                )
+                model_kwargs: Dict[str, Any] = {"provider": provider}
+                if self.onnx_file:
+                    model_kwargs["file_name"] = self.onnx_file
+                self._model = SentenceTransformer(
+                    self.model_name,
+                    device=device,
+                    backend="onnx",
+                    model_kwargs=model_kwargs,
+                )
+                return
+
+            self._model = SentenceTransformer(self.model_name, device=device)
+            if self.fp16 and device != "cpu":
+                self._model.half()
+
     def embed_text(self, text: str) -> List[float]:
         """Generate embeddings using sentence-transformers."""
         self._load_model()
-        embedding = self._model.encode(text, convert_to_numpy=True)
+        embedding = self._model.encode(
+            text, convert_to_numpy=True, normalize_embeddings=True
+        )
         return embedding.tolist()
 
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for texts in length-bucketed encode calls.
+
+        Texts are grouped by approximate token count (words) into
+        LENGTH_BUCKETS and each group is encoded separately, so a batch never
+        pads a one-line description to the length of a README excerpt.
+        """
+        if not texts:
+            return []
+        self._load_model()
+
+        buckets: Dict[int, List[int]] = {}
+        for index, text in enumerate(texts):
+            bucket = bisect_left(LENGTH_BUCKETS, len(text.split()))
+            buckets.setdefault(bucket, []).append(index)
+
+        results: List[List[float]] = [None] * len(texts)
+        for bucket in sorted(buckets):
+            indices = buckets[bucket]
+            embeddings = self._model.encode(
+                [texts[i] for i in indices],
+                batch_size=ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+            for index, embedding in zip(indices, embeddings.tolist()):
+                results[index] = embedding
+        return results
+
 
 class ChromaDBDefaultStrategy(EmbeddingStrategy):
     """ChromaDB's default embedding function."""
@@ -123,6 +490,106 @@ class ChromaDBDefaultStrategy(EmbeddingStrategy):
         return []
 
 
+def _unit_vector(embedding: List[float]) -> Any:
+    """Convert an embedding to a unit-length numpy vector."""
+    import numpy as np
+
+    vector = np.asarray(embedding, dtype=np.float64)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class EmbeddingCache:
+    """Persistent SQLite cache of embedding vectors keyed by content hash.
+
+    Keys are the SHA-256 of the namespace (strategy and model) and the text,
+    so a cached vector is only reused for identical input to the same model.
+    The cache is best effort: SQLite errors are treated as cache misses.
+    """
+
+    # Keys per SELECT, below SQLite's bound parameter limit
+    _LOOKUP_CHUNK = 500
+
+    def __init__(self, path: Path, namespace: str):
+        """Initialize the embedding cache.
+
+        Args:
+            path: Path to the SQLite database file
+            namespace: Strategy and model identifier included in every key
+        """
+        self.path = Path(path)
+        self.namespace = namespace
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the database on first use."""
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(hash BLOB PRIMARY KEY, embedding BLOB NOT NULL)"
+            )
+            self._initialized = True
+        return conn
+
+    def _key(self, text: str) -> bytes:
+        """Hash a text into its cache key."""
+        return hashlib.sha256(f"{self.namespace}|{text}".encode()).digest()
+
+    def embed(
+        self,
+        texts: List[str],
+        embed_texts: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """Get embeddings for texts, computing and storing only cache misses.
+
+        Args:
+            texts: The texts to embed
+            embed_texts: Function embedding a list of texts
+
+        Returns:
+            One embedding vector per text, in input order
+        """
+        keys = [self._key(text) for text in texts]
+        cached: Dict[bytes, List[float]] = {}
+        try:
+            with closing(self._connect()) as conn:
+                for start in range(0, len(keys), self._LOOKUP_CHUNK):
+                    chunk = keys[start : start + self._LOOKUP_CHUNK]
+                    rows = conn.execute(
+                        "SELECT hash, embedding FROM cache WHERE hash IN "
+                        f"({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    cached.update(
+                        (key, array("d", blob).tolist()) for key, blob in rows
+                    )
+        except sqlite3.Error:
+            pass
+
+        # Identical texts share a key and are embedded once
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+
+        if missing:
+            computed = embed_texts(list(missing.values()))
+            cached.update(zip(missing, computed))
+            try:
+                with closing(self._connect()) as conn, conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO cache (hash, embedding) VALUES (?, ?)",
+                        [(key, array("d", cached[key]).tobytes()) for key in missing],
+                    )
+            except sqlite3.Error:
+                pass
+
+        return [cached[key] for key in keys]
+
+
 class VectorDBManager:
     """Manager for vector database operations with ChromaDB."""
 
@@ -136,6 +603,16 @@ class VectorDBManager:
         self.client = None
         self.collection = None
         self.embedding_strategy = self._initialize_embedding_strategy()
+        self._embedding_cache: Optional[EmbeddingCache] = None
+        # Recent searches: (query, filters, n_results) -> (unit query vector
+        # or None, formatted results). Cleared whenever this manager changes
+        # the collection; writes by other managers call clear_query_cache
+        self._query_cache: OrderedDict = OrderedDict()
+        self._async_collection = None
+
+    def _chromadb_path(self) -> str:
+        """Get the local ChromaDB directory (env var takes precedence over config)."""
+        return os.getenv("TERRAFORM_INGEST_CHROMADB_PATH", self.config.chromadb_path)
 
     def _initialize_embedding_strategy(self) -> Optional[EmbeddingStrategy]:
         """Initialize the appropriate embedding strategy based on config."""
@@ -146,17 +623,26 @@ class VectorDBManager:
             if not self.config.openai_api_key:
                 raise ValueError("OpenAI API key is required for OpenAI embeddings")
             return OpenAIEmbeddingStrategy(
-                api_key=self.config.openai_api_key, model=self.config.openai_model
+                api_key=self.config.openai_api_key,
+                model=self.config.openai_model,
+                max_concurrent_batches=self.config.max_concurrent_batches,
             )
         elif self.config.strategy == "claude":
             if not self.config.anthropic_api_key:
                 raise ValueError(
                     "Anthropic/Voyage API key is required for Claude embeddings"
                 )
-            return ClaudeEmbeddingStrategy(api_key=self.config.anthropic_api_key)
+            return ClaudeEmbeddingStrategy(
+                api_key=self.config.anthropic_api_key,
+                max_concurrent_batches=self.config.max_concurrent_batches,
+            )
         elif self.config.strategy == "sentence-transformers":
             return SentenceTransformersStrategy(
-                model_name=self.config.sentence_transformers_model
+                model_name=self.config.sentence_transformers_model,
+                device=self.config.sentence_transformers_device,
+                fp16=self.config.sentence_transformers_fp16,
+                backend=self.config.sentence_transformers_backend,
+                onnx_file=self.config.sentence_transformers_onnx_file,
             )
         elif self.config.strategy == "chromadb-default":
             return ChromaDBDefaultStrategy()
@@ -183,10 +669,7 @@ class VectorDBManager:
             ) from e
 
         try:
-            # Determine chromadb path with precedence: env var > config
-            chromadb_path = os.getenv(
-                "TERRAFORM_INGEST_CHROMADB_PATH", self.config.chromadb_path
-            )
+            chromadb_path = self._chromadb_path()
 
             # Initialize client
             if self.config.chromadb_host:
@@ -202,50 +685,51 @@ class VectorDBManager:
                     settings=Settings(anonymized_telemetry=False),
                 )
 
-            # Get or create collection
-            if self.config.strategy == "chromadb-default":
-                # Use ChromaDB's default embedding function
-                self.collection = self.client.get_or_create_collection(
-                    name=self.config.collection_name,
-                    metadata={"description": "Terraform module embeddings"},
-                )
-            else:
-                # Use custom embedding function
-                from chromadb.utils import embedding_functions
-
-                if self.config.strategy == "openai":
-                    embedding_function = embedding_functions.OpenAIEmbeddingFunction(
-                        api_key=self.config.openai_api_key,
-                        model_name=self.config.openai_model,
-                    )
-                elif self.config.strategy == "sentence-transformers":
-                    embedding_function = (
-                        embedding_functions.SentenceTransformerEmbeddingFunction(
-                            model_name=self.config.sentence_transformers_model
-                        )
-                    )
-                else:
-                    # For Claude/Voyage, we'll need to create custom embeddings
-                    embedding_function = None
-
-                if embedding_function:
-                    self.collection = self.client.get_or_create_collection(
-                        name=self.config.collection_name,
-                        embedding_function=embedding_function,
-                        metadata={"description": "Terraform module embeddings"},
-                    )
-                else:
-                    # Fallback to default
-                    self.collection = self.client.get_or_create_collection(
-                        name=self.config.collection_name,
-                        metadata={"description": "Terraform module embeddings"},
-                    )
+            # Get or create collection. No embedding function is attached:
+            # openai and sentence-transformers vectors are computed by the
+            # embedding strategy and passed in, the other strategies use
+            # ChromaDB's default embedding function
+            self.collection = self.client.get_or_create_collection(
+                name=self.config.collection_name,
+                metadata=COLLECTION_METADATA,
+            )
         except Exception as e:
             raise RuntimeError(
                 f"Failed to initialize ChromaDB: {e}. "
                 "Check your chromadb configuration and ensure the package is properly installed."
             ) from e
 
+    def _embed_documents(
+        self, documents: List[str], cache: bool = True
+    ) -> Optional[List[List[float]]]:
+        """Compute embeddings for documents with the embedding strategy.
+
+        Args:
+            documents: Document texts
+            cache: Reuse and store vectors in the on-disk embedding cache, so
+                unchanged documents are not embedded again on re-ingest
+
+        Returns:
+            One embedding per document, or None if ChromaDB embeds them itself
+        """
+        if self.config.strategy not in CLIENT_EMBEDDING_STRATEGIES:
+            return None
+        if not cache:
+            return self.embedding_strategy.embed_texts(documents)
+
+        if self._embedding_cache is None:
+            if self.config.strategy == "openai":
+                model = self.config.openai_model
+            else:
+                model = self.config.sentence_transformers_model
+            self._embedding_cache = EmbeddingCache(
+                Path(self._chromadb_path()) / EMBEDDING_CACHE_FILE,
+                namespace=f"{self.config.strategy}|{model}",
+            )
+        return self._embedding_cache.embed(
+            documents, self.embedding_strategy.embed_texts
+        )
+
     def _generate_document_id(self, summary: TerraformModuleSummary) -> str:
         """Generate unique ID based on repo:ref:path.
 
@@ -255,9 +739,7 @@ class VectorDBManager:
         Returns:
             Unique document ID
         """
-        id_string = f"{summary.repository}:{summary.ref}:{summary.path}"
-        # Use hash to ensure valid ID format
-        return hashlib.sha256(id_string.encode()).hexdigest()
+        return module_document_id(summary.repository, summary.ref, summary.path)
 
     def _prepare_document_text(self, summary: TerraformModuleSummary) -> str:
         """Prepare text content for embedding.
@@ -282,43 +764,48 @@ class VectorDBManager:
 
         # Variables
         if self.config.include_variables and summary.variables:
-            var_texts = []
-            for var in summary.variables:
-                var_text = f"{var.name}"
-                if var.description:
-                    var_text += f": {var.description}"
-                if var.type:
-                    var_text += f" (type: {var.type})"
-                var_texts.append(var_text)
-            parts.append(f"Variables: {', '.join(var_texts)}")
+            var_texts = [
+                f"{var.name}"
+                f"{f': {var.description}' if var.description else ''}"
+                f"{f' (type: {var.type})' if var.type else ''}"
+                for var in summary.variables
+            ]
+            parts.append("Variables: " + ", ".join(var_texts))
 
         # Outputs
         if self.config.include_outputs and summary.outputs:
-            output_texts = []
-            for output in summary.outputs:
-                output_text = f"{output.name}"
-                if output.description:
-                    output_text += f": {output.description}"
-                output_texts.append(output_text)
-            parts.append(f"Outputs: {', '.join(output_texts)}")
+            output_texts = [
+                (
+                    f"{output.name}: {output.description}"
+                    if output.description
+                    else output.name
+                )
+                for output in summary.outputs
+            ]
+            parts.append("Outputs: " + ", ".join(output_texts))
 
         # Resource types (from providers and modules)
         if self.config.include_resource_types:
-            resource_types = []
-            for provider in summary.providers:
-                resource_types.append(f"{provider.name} provider")
-            for module in summary.modules:
-                resource_types.append(f"module: {module.source}")
+            resource_types = [
+                f"{provider.name} provider" for provider in summary.providers
+            ]
+            resource_types.extend(
+                f"module: {module.source}" for module in summary.modules
+            )
             if resource_types:
-                parts.append(f"Resources: {', '.join(resource_types)}")
+                parts.append("Resources: " + ", ".join(resource_types))
 
         return "\n\n".join(parts)
 
-    def _prepare_metadata(self, summary: TerraformModuleSummary) -> Dict[str, Any]:
+    def _prepare_metadata(
+        self, summary: TerraformModuleSummary, timestamp: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Prepare metadata for filtering.
 
         Args:
             summary: Terraform module summary
+            timestamp: ISO 8601 last_updated value; batch writers pass one
+                timestamp for the whole batch (default: now)
 
         Returns:
             Metadata dictionary
@@ -327,14 +814,16 @@ class VectorDBManager:
             "repository": summary.repository,
             "ref": summary.ref,
             "path": summary.path,
-            "last_updated": datetime.now(timezone.utc).isoformat(),
+            "last_updated": timestamp or datetime.now(timezone.utc).isoformat(),
         }
 
+        provider_names = [provider.name for provider in summary.providers]
+
         # Provider (normalized - take first one if multiple)
-        if summary.providers:
-            metadata["provider"] = summary.providers[0].name
+        if provider_names:
+            metadata["provider"] = provider_names[0]
             # Store all providers as a comma-separated string
-            metadata["providers"] = ",".join([p.name for p in summary.providers])
+            metadata["providers"] = ",".join(provider_names)
         else:
             metadata["provider"] = "unknown"
             metadata["providers"] = ""
@@ -347,9 +836,7 @@ class VectorDBManager:
             tags.extend([p for p in path_parts if p and p != "."])
 
         # Add provider names as tags
-        for provider in summary.providers:
-            if provider.name:
-                tags.append(provider.name)
+        tags.extend(name for name in provider_names if name)
 
         metadata["tags"] = ",".join(tags) if tags else ""
 
@@ -373,26 +860,143 @@ class VectorDBManager:
         document_text = self._prepare_document_text(summary)
         metadata = self._prepare_metadata(summary)
 
-        # Check if document already exists
-        try:
-            existing = self.collection.get(ids=[doc_id])
-            exists = len(existing["ids"]) > 0
-        except Exception:
-            exists = False
+        self._query_cache.clear()
 
-        if exists:
-            # Update existing document
-            self.collection.update(
-                ids=[doc_id], documents=[document_text], metadatas=[metadata]
-            )
-        else:
-            # Add new document
-            self.collection.add(
-                ids=[doc_id], documents=[document_text], metadatas=[metadata]
-            )
+        # upsert adds the document or replaces an existing one in one call
+        self.collection.upsert(
+            ids=[doc_id],
+            documents=[document_text],
+            metadatas=[metadata],
+            embeddings=self._embed_documents([document_text]),
+        )
 
         return doc_id
 
+    def upsert_modules(self, summaries: List[TerraformModuleSummary]) -> List[str]:
+        """Insert or update several modules in the vector database.
+
+        Modules are written with collection.upsert in chunks of
+        UPSERT_BATCH_SIZE through upsert_stream.
+
+        Args:
+            summaries: Terraform module summaries
+
+        Returns:
+            Document IDs, in the same order as the summaries
+        """
+        if not self.config.enabled or not summaries:
+            return []
+        return self.upsert_stream(summaries, batch_size=UPSERT_BATCH_SIZE)
+
+    def upsert_stream(
+        self, summaries: Iterable[TerraformModuleSummary], batch_size: int = 64
+    ) -> List[str]:
+        """Insert or update modules from an iterable as a pipeline.
+
+        Batches of batch_size modules go through three overlapping stages:
+        document text and metadata are prepared in the calling thread while
+        the previous batch is embedded in one worker thread and the batch
+        before that is written to the collection in another. Embedding API
+        calls, model forward passes and ChromaDB writes release the GIL, so
+        the stages run concurrently. At most one batch waits at each stage.
+
+        Args:
+            summaries: Terraform module summaries, e.g. a generator
+            batch_size: Modules per embedding call and collection write
+
+        Returns:
+            Document IDs, in the same order as the summaries
+        """
+        if not self.config.enabled:
+            return []
+
+        self._initialize_chromadb()
+        self._query_cache.clear()
+
+        doc_ids: List[str] = []
+        with (
+            ThreadPoolExecutor(max_workers=1) as embedder,
+            ThreadPoolExecutor(max_workers=1) as writer,
+        ):
+            embedding = None  # (batch, future) of the batch being embedded
+            writing = None  # future of the batch being written
+
+            def write_embedded():
+                nonlocal writing
+                batch, future = embedding
+                embeddings = future.result()
+                if writing is not None:
+                    writing.result()
+                writing = writer.submit(self._write_batch, batch, embeddings)
+
+            for batch in self._prepare_batches(summaries, batch_size, doc_ids):
+                submitted = (batch, embedder.submit(self._embed_documents, batch[1]))
+                if embedding is not None:
+                    write_embedded()
+                embedding = submitted
+
+            if embedding is not None:
+                write_embedded()
+            if writing is not None:
+                writing.result()
+
+        return doc_ids
+
+    def _prepare_batches(
+        self,
+        summaries: Iterable[TerraformModuleSummary],
+        batch_size: int,
+        doc_ids: List[str],
+    ) -> Iterator[Tuple[List[str], List[str], List[Dict[str, Any]]]]:
+        """Group summaries into (ids, documents, metadatas) batches.
+
+        Args:
+            summaries: Terraform module summaries
+            batch_size: Summaries per batch
+            doc_ids: List that receives the ID of every summary, in order
+
+        Yields:
+            IDs, document texts and metadata for each batch
+        """
+        batch: Dict[str, TerraformModuleSummary] = {}
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        def prepared():
+            # A module listed twice in a batch keeps its last summary; the
+            # collection rejects duplicate IDs within one call
+            ids = list(batch)
+            return (
+                ids,
+                [self._prepare_document_text(batch[i]) for i in ids],
+                [self._prepare_metadata(batch[i], timestamp) for i in ids],
+            )
+
+        for count, summary in enumerate(summaries, 1):
+            doc_id = self._generate_document_id(summary)
+            doc_ids.append(doc_id)
+            batch[doc_id] = summary
+            if count % batch_size == 0:
+                yield prepared()
+                batch = {}
+        if batch:
+            yield prepared()
+
+    def _write_batch(
+        self,
+        batch: Tuple[List[str], List[str], List[Dict[str, Any]]],
+        embeddings: Optional[List[List[float]]],
+    ) -> None:
+        """Upsert one prepared batch into the collection.
+
+        Args:
+            batch: IDs, document texts and metadata
+            embeddings: Vectors for the documents, or None to let ChromaDB embed
+        """
+        ids, documents, metadatas = batch
+        self.collection.upsert(
+            ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings
+        )
+
     def search_modules(
         self, query: str, filters: Optional[Dict[str, Any]] = None, n_results: int = 10
     ) -> List[Dict[str, Any]]:
@@ -411,20 +1015,202 @@ class VectorDBManager:
 
         self._initialize_chromadb()
 
-        # Prepare where clause for metadata filtering
-        where_clause = None
-        if filters:
-            where_clause = {}
-            for key, value in filters.items():
-                if key in ["repository", "ref", "path", "provider"]:
-                    where_clause[key] = value
-
-        # Perform vector search
-        results = self.collection.query(
-            query_texts=[query], n_results=n_results, where=where_clause
+        where_clause = self._where_clause(filters)
+
+        # Repeated searches are answered from the query cache
+        cache_key = (
+            query,
+            repr(sorted(where_clause.items())) if where_clause else "",
+            n_results,
         )
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            self._query_cache.move_to_end(cache_key)
+            return copy.deepcopy(cached[1])
+
+        # Perform vector search, embedding the query the same way as the
+        # stored documents
+        query_vector = None
+        query_embeddings = self._embed_documents([query], cache=False)
+        if query_embeddings is None:
+            results = self.collection.query(
+                query_texts=[query],
+                n_results=n_results,
+                where=where_clause,
+                include=QUERY_INCLUDE,
+            )
+        else:
+            query_vector = _unit_vector(query_embeddings[0])
+            similar = self._find_similar_query(query_vector, cache_key)
+            if similar is not None:
+                return copy.deepcopy(similar)
+            results = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                where=where_clause,
+                include=QUERY_INCLUDE,
+            )
+
+        formatted_results = self._format_query_results(results)
+
+        if self.config.query_cache_size > 0:
+            self._query_cache[cache_key] = (
+                query_vector,
+                copy.deepcopy(formatted_results),
+            )
+            if len(self._query_cache) > self.config.query_cache_size:
+                self._query_cache.popitem(last=False)
+
+        return formatted_results
+
+    async def _get_async_collection(self):
+        """Connect to the remote ChromaDB server with AsyncHttpClient.
+
+        Returns:
+            Async collection, created on first use and then reused
+
+        Raises:
+            ImportError: If chromadb package is not available
+            RuntimeError: If connecting to the server fails
+        """
+        if self._async_collection is not None:
+            return self._async_collection
+
+        try:
+            import chromadb
+        except ImportError as e:
+            raise ImportError(
+                "chromadb package is required for vector embeddings. "
+                "Install with: pip install chromadb or use: terraform-ingest install-deps"
+            ) from e
+
+        try:
+            client = await chromadb.AsyncHttpClient(
+                host=self.config.chromadb_host, port=self.config.chromadb_port
+            )
+            self._async_collection = await client.get_or_create_collection(
+                name=self.config.collection_name,
+                metadata=COLLECTION_METADATA,
+            )
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to connect to ChromaDB at {self.config.chromadb_host}: {e}"
+            ) from e
+        return self._async_collection
+
+    async def aupsert_modules(
+        self, summaries: List[TerraformModuleSummary]
+    ) -> List[str]:
+        """Insert or update several modules without blocking the event loop.
+
+        With a remote ChromaDB server (chromadb_host), batches of
+        UPSERT_BATCH_SIZE modules are embedded and upserted concurrently over
+        AsyncHttpClient, up to max_concurrent_batches at a time. A local
+        persistent database is written with upsert_modules in a worker thread.
+
+        Args:
+            summaries: Terraform module summaries
+
+        Returns:
+            Document IDs, in the same order as the summaries
+        """
+        if not self.config.enabled or not summaries:
+            return []
+        if not self.config.chromadb_host:
+            return await asyncio.to_thread(self.upsert_modules, summaries)
+
+        collection = await self._get_async_collection()
+        self._query_cache.clear()
+
+        # Concurrent batches must not share IDs, so the last summary of a
+        # module listed twice is kept before batching
+        doc_ids = [self._generate_document_id(summary) for summary in summaries]
+        unique = list(dict(zip(doc_ids, summaries)).values())
+        batches = self._prepare_batches(unique, UPSERT_BATCH_SIZE, [])
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_batches)
+
+        async def write(batch):
+            ids, documents, metadatas = batch
+            async with semaphore:
+                embeddings = await asyncio.to_thread(self._embed_documents, documents)
+                await collection.upsert(
+                    ids=ids,
+                    documents=documents,
+                    metadatas=metadatas,
+                    embeddings=embeddings,
+                )
+
+        await asyncio.gather(*(write(batch) for batch in batches))
+        return doc_ids
+
+    async def asearch_modules(
+        self, query: str, filters: Optional[Dict[str, Any]] = None, n_results: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Search for modules without blocking the event loop.
+
+        With a remote ChromaDB server (chromadb_host) the query goes over
+        AsyncHttpClient; otherwise search_modules runs in a worker thread.
+
+        Args:
+            query: Search query
+            filters: Optional metadata filters
+            n_results: Number of results to return
+
+        Returns:
+            List of matching modules with scores
+        """
+        if not self.config.enabled:
+            return []
+        if not self.config.chromadb_host:
+            return await asyncio.to_thread(
+                self.search_modules, query, filters, n_results
+            )
+
+        collection = await self._get_async_collection()
+        where_clause = self._where_clause(filters)
+
+        if self.config.strategy in CLIENT_EMBEDDING_STRATEGIES:
+            results = await collection.query(
+                query_embeddings=await self.embedding_strategy.aembed_texts([query]),
+                n_results=n_results,
+                where=where_clause,
+                include=QUERY_INCLUDE,
+            )
+        else:
+            results = await collection.query(
+                query_texts=[query],
+                n_results=n_results,
+                where=where_clause,
+                include=QUERY_INCLUDE,
+            )
+        return self._format_query_results(results)
+
+    @staticmethod
+    def _where_clause(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Build the ChromaDB where clause for metadata filtering.
+
+        Args:
+            filters: Optional metadata filters; unsupported keys are ignored
+
+        Returns:
+            Where clause, or None without supported filters
+        """
+        if not filters:
+            return None
+        return {
+            key: value for key, value in filters.items() if key in FILTER_KEYS
+        } or None
+
+    @staticmethod
+    def _format_query_results(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Flatten a single-query ChromaDB result into one dict per match.
+
+        Args:
+            results: Result of collection.query for one query
 
-        # Format results
+        Returns:
+            List of matching modules with scores
+        """
         formatted_results = []
         if results and results["ids"] and len(results["ids"]) > 0:
             for i in range(len(results["ids"][0])):
@@ -445,6 +1231,48 @@ class VectorDBManager:
 
         return formatted_results
 
+    def _find_similar_query(
+        self, query_vector: Any, cache_key: Tuple[str, str, int]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Find cached results for a semantically equivalent earlier search.
+
+        Args:
+            query_vector: Unit-length embedding of the query
+            cache_key: Query cache key; only entries with the same filters
+                and result count are considered
+
+        Returns:
+            Cached formatted results, or None if no cached query has cosine
+            similarity of at least semantic_cache_threshold
+        """
+        candidates = [
+            (key, vector)
+            for key, (vector, _) in self._query_cache.items()
+            if vector is not None and key[1:] == cache_key[1:]
+        ]
+        if not candidates:
+            return None
+
+        import numpy as np
+
+        # Vectors are unit length, so the dot product is the cosine similarity
+        similarities = np.stack([vector for _, vector in candidates]) @ query_vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.config.semantic_cache_threshold:
+            return None
+
+        key = candidates[best][0]
+        self._query_cache.move_to_end(key)
+        return self._query_cache[key][1]
+
+    def clear_query_cache(self) -> None:
+        """Forget cached search results.
+
+        Writes through this manager clear the cache themselves. Call this
+        after the collection was changed by another manager or process.
+        """
+        self._query_cache.clear()
+
     def delete_module(self, summary: TerraformModuleSummary) -> bool:
         """Delete a module from the vector database.
 
@@ -460,6 +1288,7 @@ class VectorDBManager:
         self._initialize_chromadb()
 
         doc_id = self._generate_document_id(summary)
+        self._query_cache.clear()
 
         try:
             self.collection.delete(ids=[doc_id])
@@ -467,6 +1296,22 @@ class VectorDBManager:
         except Exception:
             return False
 
+    def existing_ids(self, doc_ids: List[str]) -> Set[str]:
+        """Get which of some document IDs are stored in the collection.
+
+        Args:
+            doc_ids: Document IDs to look up
+
+        Returns:
+            The document IDs present in the collection
+        """
+        if not self.config.enabled or not doc_ids:
+            return set()
+
+        self._initialize_chromadb()
+
+        return set(self.collection.get(ids=list(doc_ids), include=[])["ids"])
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection.
 
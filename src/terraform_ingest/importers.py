@@ -1,16 +1,749 @@
 """Repository importers for updating configuration files."""
 
+import json
+import os
+import sqlite3
+import threading
+import time
 import yaml
 import requests
 import click
 from abc import ABC, abstractmethod
-from pathlib import Path
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from terraform_ingest import json_utils
 from terraform_ingest.models import RepositoryConfig
+from terraform_ingest.yaml_utils import SafeLoader, write_yaml_file
+
+# Seconds to wait for an API server to respond
+REQUEST_TIMEOUT = 30
+
+# Pages requested concurrently once the page count is known
+MAX_PAGE_WORKERS = 16
+
+# Repositories checked for Terraform files concurrently; kept low because
+# the code search API has a much smaller rate limit than the rest of the API
+MAX_CHECK_WORKERS = 8
+
+# Repository fields kept from GitHub REST listings, matching what the
+# GraphQL listing returns; the rest of each payload is dropped per page
+GITHUB_REPOSITORY_FIELDS = ("name", "full_name", "clone_url", "archived", "pushed_at")
+
+# Project fields kept from GitLab group listings; the rest of each project
+# payload is dropped as soon as its page is decoded
+GITLAB_PROJECT_FIELDS = (
+    "id",
+    "name",
+    "http_url_to_repo",
+    "archived",
+    "visibility",
+    "last_activity_at",
+)
+
+# Pages of bulk code search results read before falling back to checking
+# the remaining repositories one by one (GitHub stops at 1000 results)
+SEARCH_MAX_PAGES = 10
+
+# GitHub REST API root and code search endpoint
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_SEARCH_URL = f"{GITHUB_API_URL}/search/code"
+
+# Media type and pinned API version sent with every GitHub request
+GITHUB_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
+
+# GitHub GraphQL endpoint and the query listing an organization's
+# repositories together with the module directory's tree entries
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+GITHUB_REPOSITORIES_QUERY = """
+query($org: String!, $cursor: String, $privacy: RepositoryPrivacy, $tree: String!) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor, privacy: $privacy) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        url
+        isArchived
+        pushedAt
+        object(expression: $tree) { ... on Tree { entries { name type } } }
+      }
+    }
+  }
+}
+"""
+
+# File caching Terraform detection results and listing responses between runs
+TERRAFORM_CACHE_FILE = "tf.sqlite"
+
+# Response headers stored with cached listing pages: the validators sent
+# back on the next request, and the pagination headers a 304 may omit
+CACHED_RESPONSE_HEADERS = (
+    "ETag",
+    "Last-Modified",
+    "Link",
+    "X-Total-Pages",
+    "X-Next-Page",
+)
+
+# Retries of a rate limited (403/429) request, and the backoff cap in seconds
+RATE_LIMIT_RETRIES = 3
+MAX_BACKOFF = 60
+
+
+def _header_int(headers: Any, name: str) -> Optional[int]:
+    """Read an integer response header.
+
+    Args:
+        headers: Response headers
+        name: Header name
+
+    Returns:
+        Header value, or None if it is missing or not an integer
+    """
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _tree_path(base_path: str) -> str:
+    """Normalize a base path for a git tree expression such as HEAD:<path>.
+
+    Args:
+        base_path: Base path relative to the repository root, e.g. ./src
+
+    Returns:
+        The path without ./ prefixes or surrounding slashes, empty for the
+        repository root
+    """
+    path = PurePosixPath(base_path.strip("/") or ".").as_posix()
+    return "" if path == "." else path
+
+
+def _response_json(response: requests.Response) -> Any:
+    """Decode a JSON response body, with orjson when it is installed.
+
+    Args:
+        response: API response
+
+    Returns:
+        Decoded JSON document
+
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON,
+            as response.json() would.
+    """
+    try:
+        return json_utils.loads(response.content)
+    except json.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+
+class _RateLimiter:
+    """Track an API rate limit from response headers and wait out exhaustion.
+
+    Reads the GitHub (X-RateLimit-*) and GitLab (RateLimit-*) headers. The
+    limiter is shared by concurrent requests; a request that finds the quota
+    exhausted holds the others until the reset time.
+    """
+
+    def __init__(self, threshold: int = 1):
+        """Initialize the rate limiter.
+
+        Args:
+            threshold: Remaining requests at or below which to wait for reset
+        """
+        self.threshold = threshold
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, response: requests.Response) -> None:
+        """Record the rate limit state reported by a response.
+
+        Args:
+            response: Latest API response
+        """
+        headers = response.headers
+        remaining = _header_int(headers, "X-RateLimit-Remaining")
+        if remaining is None:
+            remaining = _header_int(headers, "RateLimit-Remaining")
+        reset_at = _header_int(headers, "X-RateLimit-Reset")
+        if reset_at is None:
+            reset_at = _header_int(headers, "RateLimit-Reset")
+        if remaining is None:
+            return
+        with self._lock:
+            self.remaining = remaining
+            if reset_at is not None:
+                self.reset_at = float(reset_at)
+
+    def wait(self) -> None:
+        """Sleep until the rate limit resets if the quota is (nearly) used up."""
+        with self._lock:
+            if self.remaining is None or self.remaining > self.threshold:
+                return
+            delay = self.reset_at - time.time()
+            if delay > 0:
+                click.echo(
+                    f"Rate limit nearly exhausted, waiting {int(delay) + 1}s for reset",
+                    err=True,
+                )
+                time.sleep(delay + 1)
+            self.remaining = None
+
+
+def _create_session(headers: Dict[str, str]) -> requests.Session:
+    """Create an HTTP session that keeps connections alive between API calls.
+
+    Transient server errors are retried with exponential backoff, honouring
+    the Retry-After header. Rate limit responses are left to the importers'
+    own rate limit handling, so they are not retried twice.
+
+    Args:
+        headers: Headers sent with every request
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    retry = Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 503, 504],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def default_cache_dir() -> Path:
+    """Get the directory for importer caches.
+
+    Returns:
+        TERRAFORM_INGEST_CACHE_DIR if set, otherwise terraform-ingest under
+        XDG_CACHE_HOME (default: ~/.cache)
+    """
+    cache_dir = os.getenv("TERRAFORM_INGEST_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    return (
+        Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "terraform-ingest"
+    )
+
+
+class ImporterCache:
+    """Persistent SQLite cache of importer API results.
+
+    Terraform detection results are keyed by provider and repository and
+    remember the push time they were computed for, so a result is only
+    reused while the repository is unchanged. Listing responses are stored
+    with their ETag/Last-Modified validators for conditional requests.
+
+    The database is opened on first use. The cache is best effort: SQLite
+    errors are treated as cache misses.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the tables on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS terraform_check ("
+                "provider TEXT, full_name TEXT, pushed_at TEXT, has_tf INTEGER, "
+                "PRIMARY KEY (provider, full_name))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS etags ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                "headers TEXT, body BLOB)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get_terraform_check(
+        self, provider: str, full_name: str, pushed_at: str
+    ) -> Optional[bool]:
+        """Look up a cached result.
+
+        Args:
+            provider: Provider name
+            full_name: Repository name or ID
+            pushed_at: Last push time of the repository
+
+        Returns:
+            Cached result, or None if it is missing or stale
+        """
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute(
+                        "SELECT pushed_at, has_tf FROM terraform_check "
+                        "WHERE provider = ? AND full_name = ?",
+                        (provider, full_name),
+                    )
+                    .fetchone()
+                )
+        except (OSError, sqlite3.Error):
+            return None
+        if row is None or row[0] != pushed_at:
+            return None
+        return bool(row[1])
+
+    def set_terraform_check(
+        self, provider: str, full_name: str, pushed_at: str, has_tf: bool
+    ) -> None:
+        """Store a result; it is written to disk by commit().
+
+        Args:
+            provider: Provider name
+            full_name: Repository name or ID
+            pushed_at: Last push time of the repository
+            has_tf: Whether the repository contains Terraform files
+        """
+        try:
+            with self._lock:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO terraform_check VALUES (?, ?, ?, ?)",
+                    (provider, full_name, pushed_at, int(has_tf)),
+                )
+        except (OSError, sqlite3.Error):
+            pass
+
+    def get_response(self, url: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """Look up a stored response.
+
+        Args:
+            url: Request URL including the query string
+
+        Returns:
+            Validator and pagination headers, and the response body, or None
+        """
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute("SELECT headers, body FROM etags WHERE url = ?", (url,))
+                    .fetchone()
+                )
+        except (OSError, sqlite3.Error):
+            return None
+        if row is None:
+            return None
+        return json_utils.loads(row[0]), row[1]
+
+    def set_response(self, url: str, headers: Dict[str, str], body: bytes) -> None:
+        """Store a response; it is written to disk by commit().
+
+        Args:
+            url: Request URL including the query string
+            headers: Validator and pagination headers of the response
+            body: Response body
+        """
+        try:
+            with self._lock:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO etags VALUES (?, ?, ?, ?, ?)",
+                    (
+                        url,
+                        headers.get("ETag"),
+                        headers.get("Last-Modified"),
+                        json_utils.dumps(headers, pretty=False),
+                        body,
+                    ),
+                )
+        except (OSError, sqlite3.Error):
+            pass
+
+    def commit(self) -> None:
+        """Write the stored results in a single transaction."""
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Commit pending results and close the database."""
+        self.commit()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 
 class RepositoryImporter(ABC):
-    """Base class for repository importers."""
+    """Base class for repository importers.
+
+    Importers hold an HTTP session; use them as a context manager or call
+    close() to release its connections.
+    """
+
+    _session: requests.Session
+    _rate_limiter: _RateLimiter
+    _cache: ImporterCache
+    retry_forbidden: bool = False
+    # Repositories found by the bulk Terraform search, and whether that
+    # search covered every repository with Terraform files
+    _terraform_repos: Optional[Set[Any]] = None
+    _terraform_repos_complete: bool = False
+
+    def close(self) -> None:
+        """Close the HTTP session and the Terraform check cache."""
+        self._session.close()
+        self._cache.close()
+
+    def __enter__(self) -> "RepositoryImporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _is_rate_limited(self, response: requests.Response) -> bool:
+        """Check if a response was refused because of rate limiting.
+
+        Args:
+            response: API response
+
+        Returns:
+            True for 429 responses, and for 403 responses that report an
+            exhausted quota or a Retry-After delay (or any 403 when
+            retry_forbidden is set)
+        """
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        return (
+            self.retry_forbidden
+            or _header_int(response.headers, "X-RateLimit-Remaining") == 0
+            or _header_int(response.headers, "Retry-After") is not None
+        )
+
+    def _request(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        limiter: Optional[_RateLimiter] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> requests.Response:
+        """Send a request that respects the API rate limit.
+
+        Waits for the rate limit reset when the quota is nearly exhausted and
+        retries rate limited responses with exponential backoff, honouring
+        the Retry-After header.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            limiter: Rate limiter for the API resource (default: core API)
+            json: Body to POST; a GET request is sent without one
+            headers: Extra request headers
+
+        Returns:
+            Last response, which may still be rate limited once the retries
+            are used up
+        """
+        limiter = limiter or self._rate_limiter
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            limiter.wait()
+            if json is None:
+                response = self._session.get(
+                    url, params=params, timeout=REQUEST_TIMEOUT, headers=headers
+                )
+            else:
+                response = self._session.post(
+                    url, json=json, timeout=REQUEST_TIMEOUT, headers=headers
+                )
+            limiter.update(response)
+            if attempt == RATE_LIMIT_RETRIES or not self._is_rate_limited(response):
+                break
+            delay = _header_int(response.headers, "Retry-After")
+            if delay is None:
+                delay = min(MAX_BACKOFF, 2**attempt)
+            time.sleep(delay)
+        return response
+
+    def _get_page(
+        self, url: str, params: Dict[str, Any], page: int
+    ) -> requests.Response:
+        """Request one page of a paginated API listing.
+
+        Args:
+            url: Listing URL
+            params: Query parameters other than the page number
+            page: Page number, starting at 1
+
+        Returns:
+            Successful response
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        response = self._conditional_get(url, {**params, "page": page})
+        response.raise_for_status()
+        return response
+
+    def _conditional_get(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        """Send a GET request that revalidates a cached copy of the response.
+
+        The ETag and Last-Modified validators of the previous response are
+        sent back; on 304 Not Modified (which does not count against
+        GitHub's rate limit) the cached body and pagination headers are used.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Response, with the cached body when the server reported no change
+        """
+        key = requests.Request("GET", url, params=params).prepare().url
+        cached = self._cache.get_response(key)
+        headers = {}
+        if cached is not None:
+            cached_headers, body = cached
+            if cached_headers.get("ETag"):
+                headers["If-None-Match"] = cached_headers["ETag"]
+            if cached_headers.get("Last-Modified"):
+                headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+
+        response = self._request(url, params, headers=headers or None)
+
+        if response.status_code == 304 and cached is not None:
+            response.status_code = 200
+            response._content = body
+            for name, value in cached_headers.items():
+                response.headers.setdefault(name, value)
+        elif response.status_code == 200:
+            stored = {
+                name: response.headers[name]
+                for name in CACHED_RESPONSE_HEADERS
+                if name in response.headers
+            }
+            if "ETag" in stored or "Last-Modified" in stored:
+                self._cache.set_response(key, stored, response.content)
+        return response
+
+    def _last_page(self, response: requests.Response) -> Optional[int]:
+        """Get the last page number from a paginated response.
+
+        Args:
+            response: Response for the first page
+
+        Returns:
+            Last page number from the Link header, or None if it is not given
+        """
+        last_url = response.links.get("last", {}).get("url")
+        if not last_url:
+            return None
+        try:
+            return int(parse_qs(urlparse(last_url).query)["page"][0])
+        except (KeyError, ValueError):
+            return None
+
+    def _has_next_page(self, response: requests.Response) -> bool:
+        """Check if a paginated response announces a next page.
+
+        Args:
+            response: Response for a page
+
+        Returns:
+            True if the Link header has a rel="next" entry
+        """
+        return "next" in response.links
+
+    def _fetch_pages(
+        self, url: str, params: Dict[str, Any]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Fetch every page of an API listing, in page order.
+
+        The first page reveals the page count (GitHub's Link rel="last",
+        GitLab's X-Total-Pages), after which the remaining pages are
+        requested concurrently on the shared session. Without a page count
+        the pages are requested one by one for as long as a next page is
+        announced.
+
+        Args:
+            url: Listing URL
+            params: Query parameters other than the page number
+
+        Yields:
+            Items of each page
+
+        Raises:
+            requests.exceptions.RequestException: If a request fails.
+        """
+        first = self._get_page(url, params, 1)
+        items = _response_json(first)
+        if not items:
+            return
+        yield items
+
+        last_page = self._last_page(first)
+        if last_page is None:
+            response, page = first, 1
+            while self._has_next_page(response):
+                page += 1
+                response = self._get_page(url, params, page)
+                items = _response_json(response)
+                if not items:
+                    return
+                yield items
+            return
+
+        if last_page < 2:
+            return
+        executor = ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, last_page - 1))
+        try:
+            responses = executor.map(
+                lambda page: self._get_page(url, params, page),
+                range(2, last_page + 1),
+            )
+            for response in responses:
+                yield _response_json(response)
+        finally:
+            # A failed page or a consumer that stops early leaves nothing to
+            # wait for; pages not yet requested are dropped
+            executor.shutdown(cancel_futures=True)
+
+    def _has_terraform_files(self, repo: Dict[str, Any]) -> bool:
+        """Check if a repository contains Terraform files.
+
+        Results are cached on disk by repository and last push, so
+        repositories that have not changed since the previous run skip the
+        API calls. Repositories that cannot be checked are included.
+
+        Args:
+            repo: Repository data from the provider API
+
+        Returns:
+            True if the repository contains .tf files, False otherwise.
+        """
+        provider = self.get_provider_name()
+        key = self._cache_key(repo)
+        if key is not None:
+            cached = self._cache.get_terraform_check(provider, *key)
+            if cached is not None:
+                return cached
+
+        found = self._check_terraform_files(repo)
+        if found is None:
+            return True  # Include by default if the check was inconclusive
+
+        if key is not None:
+            self._cache.set_terraform_check(provider, *key, found)
+        return found
+
+    @abstractmethod
+    def _check_terraform_files(self, repo: Dict[str, Any]) -> Optional[bool]:
+        """Check the provider API for Terraform files in a repository.
+
+        Args:
+            repo: Repository data from the provider API
+
+        Returns:
+            True if the repository contains .tf files, False if it does not,
+            or None if that could not be determined.
+        """
+        pass
+
+    def _cache_key(self, repo: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Get the Terraform check cache key of a repository.
+
+        Args:
+            repo: Repository data from the provider API
+
+        Returns:
+            Repository name and last push time, or None to skip the cache
+        """
+        return None
+
+    def _bulk_search_result(self, key: Any) -> Optional[bool]:
+        """Look up a repository in the bulk Terraform search results.
+
+        Args:
+            key: Repository key used by the search results
+
+        Returns:
+            True if the search found Terraform files in the repository, False
+            if a complete search did not, or None if the repository has to be
+            checked on its own
+        """
+        if self._terraform_repos is None:
+            return None
+        if key in self._terraform_repos:
+            return True
+        return False if self._terraform_repos_complete else None
+
+    def _filter_terraform(self, repos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep the repositories that contain Terraform files.
+
+        The repositories are checked concurrently.
+
+        Args:
+            repos: Repository data from the provider API
+
+        Returns:
+            Repositories with Terraform files, in their original order
+        """
+        if not repos:
+            return []
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CHECK_WORKERS, len(repos))
+        ) as executor:
+            matches = list(executor.map(self._has_terraform_files, repos))
+        self._cache.commit()
+        return [repo for repo, match in zip(repos, matches) if match]
+
+    def _repository_config(self, name: str, url: str) -> RepositoryConfig:
+        """Build the configuration entry for an imported repository.
+
+        The values come from the provider API and the importer's own
+        settings, so pydantic validation is skipped.
+
+        Args:
+            name: Repository name
+            url: Clone URL
+
+        Returns:
+            RepositoryConfig for the repository
+        """
+        return RepositoryConfig.model_construct(
+            name=name,
+            url=url,
+            branches=list(self.branches),
+            include_tags=True,
+            max_tags=self.max_tags,
+            path=self.base_path,
+            recursive=False,
+            exclude_paths=[],
+        )
 
     @abstractmethod
     def fetch_repositories(self, **kwargs) -> List[RepositoryConfig]:
@@ -41,6 +774,10 @@ class GitHubImporter(RepositoryImporter):
         include_private: bool = False,
         terraform_only: bool = False,
         base_path: str = "./src",
+        max_tags: int = 1,
+        branches: Optional[List[str]] = None,
+        retry_forbidden: bool = False,
+        cache_dir: Optional[Path] = None,
     ):
         """Initialize GitHub importer.
 
@@ -50,15 +787,32 @@ class GitHubImporter(RepositoryImporter):
             include_private: Include private repositories
             terraform_only: Only include repositories with Terraform files
             base_path: Base path for module scanning
+            max_tags: Maximum number of tags to include per imported repository
+            branches: Branches to include for each imported repository
+            retry_forbidden: Retry every 403 response with backoff, not only
+                those identified as rate limiting
+            cache_dir: Directory for the Terraform check cache
+                (default: default_cache_dir())
         """
         self.org = org
         self.token = token
         self.include_private = include_private
         self.terraform_only = terraform_only
         self.base_path = base_path
-        self.headers = {}
+        self.max_tags = max_tags
+        self.branches = branches or []
+        self.retry_forbidden = retry_forbidden
+        self.headers = dict(GITHUB_HEADERS)
         if token:
             self.headers["Authorization"] = f"token {token}"
+        self._session = _create_session(self.headers)
+        self._rate_limiter = _RateLimiter()
+        self._cache = ImporterCache(
+            Path(cache_dir or default_cache_dir()) / TERRAFORM_CACHE_FILE
+        )
+        # The code search and GraphQL APIs have their own quotas
+        self._search_limiter = _RateLimiter()
+        self._graphql_limiter = _RateLimiter()
 
     def get_provider_name(self) -> str:
         """Get the provider name."""
@@ -74,78 +828,202 @@ class GitHubImporter(RepositoryImporter):
             click.ClickException: If there's an error fetching repositories.
         """
         repositories = []
-        page = 1
-        per_page = 100
 
         click.echo(
             f"Fetching repositories from GitHub organization: {self.org}", err=True
         )
 
-        while True:
-            url = f"https://api.github.com/orgs/{self.org}/repos"
-            params = {
-                "page": page,
-                "per_page": per_page,
-                "type": "all" if self.include_private else "public",
-            }
-
-            try:
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-            except requests.exceptions.RequestException as e:
-                raise click.ClickException(f"Error fetching repositories: {e}")
-
-            repos = response.json()
-            if not repos:
-                break
+        if self.terraform_only:
+            self._terraform_repos, self._terraform_repos_complete = (
+                self._search_terraform_repos()
+            )
 
-            for repo in repos:
+        try:
+            for page, repos in enumerate(self._repository_pages(), 1):
                 # Skip archived repositories
-                if repo.get("archived", False):
-                    continue
+                candidates = [repo for repo in repos if not repo.get("archived", False)]
 
                 # Skip if filtering for Terraform repos only
-                if self.terraform_only and not self._has_terraform_files(repo):
-                    continue
-
-                repo_config = RepositoryConfig(
-                    name=repo["name"],
-                    url=repo["clone_url"],
-                    branches=[],
-                    include_tags=True,
-                    max_tags=1,
-                    path=self.base_path,
-                    recursive=False,
-                    exclude_paths=[],
-                )
-                repositories.append(repo_config)
+                if self.terraform_only:
+                    candidates = self._filter_terraform(candidates)
 
-            page += 1
-            click.echo(f"Processed page {page - 1} ({len(repos)} repos)", err=True)
+                for repo in candidates:
+                    repositories.append(
+                        self._repository_config(repo["name"], repo["clone_url"])
+                    )
+
+                click.echo(f"Processed page {page} ({len(repos)} repos)", err=True)
+        except requests.exceptions.RequestException as e:
+            raise click.ClickException(f"Error fetching repositories: {e}")
 
         click.echo(f"Found {len(repositories)} repositories", err=True)
         return repositories
 
-    def _has_terraform_files(self, repo: Dict[str, Any]) -> bool:
+    def _repository_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """Fetch the organization's repositories page by page.
+
+        With a token the GraphQL API is used, which also reports whether the
+        module directory contains .tf files. The REST API is used without a
+        token, or when the GraphQL query fails before returning any page.
+
+        Yields:
+            Repository data of each page, reduced to GITHUB_REPOSITORY_FIELDS
+            (plus has_terraform from GraphQL)
+
+        Raises:
+            requests.exceptions.RequestException: If a request fails.
+        """
+        if self.token:
+            listed = False
+            try:
+                for repos in self._graphql_repository_pages():
+                    listed = True
+                    yield repos
+                return
+            except (requests.exceptions.RequestException, KeyError, TypeError) as e:
+                if listed:
+                    raise
+                click.echo(
+                    f"Warning: GraphQL repository listing failed ({e}), "
+                    "using the REST API",
+                    err=True,
+                )
+
+        url = f"{GITHUB_API_URL}/orgs/{self.org}/repos"
+        params = {
+            "per_page": 100,
+            "type": "all" if self.include_private else "public",
+        }
+        for repos in self._fetch_pages(url, params):
+            yield [
+                {key: repo[key] for key in GITHUB_REPOSITORY_FIELDS if key in repo}
+                for repo in repos
+            ]
+
+    def _graphql_repository_pages(self) -> Iterator[List[Dict[str, Any]]]:
+        """List the organization's repositories with the GraphQL API.
+
+        Each page of 100 repositories also returns the entries of the module
+        directory (base_path) on the default branch, so repositories with
+        .tf files there need no further API calls.
+
+        Yields:
+            Repository data of each page, in the REST API's shape, with
+            has_terraform set to True when .tf files were found
+
+        Raises:
+            requests.exceptions.RequestException: If a request or the query
+                fails.
+        """
+        variables = {
+            "org": self.org,
+            "cursor": None,
+            "privacy": None if self.include_private else "PUBLIC",
+            "tree": "HEAD:" + _tree_path(self.base_path),
+        }
+
+        while True:
+            response = self._request(
+                GITHUB_GRAPHQL_URL,
+                limiter=self._graphql_limiter,
+                json={"query": GITHUB_REPOSITORIES_QUERY, "variables": variables},
+            )
+            response.raise_for_status()
+            result = _response_json(response)
+            if result.get("errors"):
+                raise requests.exceptions.RequestException(
+                    result["errors"][0].get("message", "GraphQL query failed")
+                )
+
+            repositories = result["data"]["organization"]["repositories"]
+            yield [
+                {
+                    "name": node["name"],
+                    "full_name": node["nameWithOwner"],
+                    "clone_url": f"{node['url']}.git",
+                    "archived": node["isArchived"],
+                    "pushed_at": node["pushedAt"],
+                    "has_terraform": any(
+                        entry["type"] == "blob" and entry["name"].endswith(".tf")
+                        for entry in (node.get("object") or {}).get("entries", [])
+                    ),
+                }
+                for node in repositories["nodes"]
+            ]
+
+            page_info = repositories["pageInfo"]
+            if not page_info["hasNextPage"]:
+                return
+            variables = {**variables, "cursor": page_info["endCursor"]}
+
+    def _search_terraform_repos(self) -> Tuple[Set[str], bool]:
+        """Find the organization's repositories with Terraform files.
+
+        A single code search across the organization replaces one search per
+        repository. GitHub returns at most 1000 results, so very large
+        organizations may not be covered completely.
+
+        Returns:
+            Full names of repositories with .tf files, and whether the search
+            covered all of them
+        """
+        per_page = 100
+        params = {"q": f"extension:tf org:{self.org}", "per_page": per_page}
+        names: Set[str] = set()
+
+        try:
+            for page in range(1, SEARCH_MAX_PAGES + 1):
+                response = self._request(
+                    GITHUB_SEARCH_URL, {**params, "page": page}, self._search_limiter
+                )
+                if response.status_code != 200:
+                    return names, False
+
+                result = _response_json(response)
+                names.update(
+                    item["repository"]["full_name"] for item in result.get("items", [])
+                )
+                if page * per_page >= result.get("total_count", 0):
+                    return names, not result.get("incomplete_results", False)
+        except requests.exceptions.RequestException as e:
+            click.echo(f"Warning: Terraform code search failed: {e}", err=True)
+        return names, False
+
+    def _cache_key(self, repo: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Key Terraform check results by full name and last push."""
+        if not repo.get("full_name") or not repo.get("pushed_at"):
+            return None
+        return repo["full_name"], repo["pushed_at"]
+
+    def _check_terraform_files(self, repo: Dict[str, Any]) -> Optional[bool]:
         """Check if a repository contains Terraform files.
 
+        Uses the organization-wide search results when available and falls
+        back to searching the repository on its own.
+
         Args:
             repo: Repository data from GitHub API
 
         Returns:
-            True if repository contains .tf files, False otherwise.
+            True if repository contains .tf files, False if it does not, or
+            None if the check failed.
         """
+        if repo.get("has_terraform"):
+            return True
+
+        found = self._bulk_search_result(repo.get("full_name"))
+        if found is not None:
+            return found
+
         repo_name = repo.get("name", repo.get("full_name", "unknown"))
 
         try:
             # Search for .tf files in the repository
-            search_url = "https://api.github.com/search/code"
             params = {"q": f"extension:tf repo:{repo['full_name']}", "per_page": 1}
-
-            response = requests.get(search_url, headers=self.headers, params=params)
+            response = self._request(GITHUB_SEARCH_URL, params, self._search_limiter)
 
             if response.status_code == 200:
-                result = response.json()
+                result = _response_json(response)
                 return result.get("total_count", 0) > 0
             elif response.status_code == 403:
                 # Check rate limit headers to distinguish between rate limiting and auth issues
@@ -161,7 +1039,7 @@ class GitHubImporter(RepositoryImporter):
                             f"(GitHub API rate limited - reset at {reset_time})",
                             err=True,
                         )
-                        return True  # Include by default if we can't check due to rate limit
+                        return None  # Can't check due to rate limit
                 except (ValueError, TypeError):
                     pass
 
@@ -178,7 +1056,7 @@ class GitHubImporter(RepositoryImporter):
                         f"(GitHub search API returned 403 - verify token has required scopes)",
                         err=True,
                     )
-                return True  # Include by default if we can't check
+                return None  # Can't check
             else:
                 return False
         except Exception as e:
@@ -187,7 +1065,7 @@ class GitHubImporter(RepositoryImporter):
                 f"Warning: Error checking Terraform files for {repo_name}: {e}",
                 err=True,
             )
-            return True  # Include by default if check fails
+            return None
 
 
 class GitLabImporter(RepositoryImporter):
@@ -202,6 +1080,10 @@ class GitLabImporter(RepositoryImporter):
         base_path: str = ".",
         recursive: bool = True,
         gitlab_url: str = "https://gitlab.com",
+        max_tags: int = 1,
+        branches: Optional[List[str]] = None,
+        retry_forbidden: bool = False,
+        cache_dir: Optional[Path] = None,
     ):
         """Initialize GitLab importer.
 
@@ -213,6 +1095,12 @@ class GitLabImporter(RepositoryImporter):
             base_path: Base path for module scanning
             recursive: Recursively fetch repositories from subgroups
             gitlab_url: GitLab instance URL (default: https://gitlab.com)
+            max_tags: Maximum number of tags to include per imported repository
+            branches: Branches to include for each imported repository
+            retry_forbidden: Retry every 403 response with backoff, not only
+                those identified as rate limiting
+            cache_dir: Directory for the Terraform check cache
+                (default: default_cache_dir())
         """
         self.group = group
         self.token = token
@@ -220,10 +1108,19 @@ class GitLabImporter(RepositoryImporter):
         self.terraform_only = terraform_only
         self.base_path = base_path
         self.recursive = recursive
+        self.max_tags = max_tags
+        self.branches = branches or []
+        self.retry_forbidden = retry_forbidden
         self.gitlab_url = gitlab_url.rstrip("/")
+        self._api_url = f"{self.gitlab_url}/api/v4"
         self.headers = {}
         if token:
             self.headers["PRIVATE-TOKEN"] = token
+        self._session = _create_session(self.headers)
+        self._rate_limiter = _RateLimiter()
+        self._cache = ImporterCache(
+            Path(cache_dir or default_cache_dir()) / TERRAFORM_CACHE_FILE
+        )
 
     def get_provider_name(self) -> str:
         """Get the provider name."""
@@ -245,30 +1142,25 @@ class GitLabImporter(RepositoryImporter):
         # Fetch projects from the group
         projects = self._fetch_group_projects(self.group)
 
+        # Skip archived projects, and private projects if not including them
+        projects = [
+            project
+            for project in projects
+            if not project.get("archived", False)
+            and (self.include_private or project.get("visibility") != "private")
+        ]
+
+        # Skip if filtering for Terraform repos only
+        if self.terraform_only:
+            self._terraform_repos, self._terraform_repos_complete = (
+                self._search_terraform_repos()
+            )
+            projects = self._filter_terraform(projects)
+
         for project in projects:
-            # Skip archived projects
-            if project.get("archived", False):
-                continue
-
-            # Skip if filtering for Terraform repos only
-            if self.terraform_only and not self._has_terraform_files(project):
-                continue
-
-            # Skip private projects if not including them
-            if not self.include_private and project.get("visibility") == "private":
-                continue
-
-            repo_config = RepositoryConfig(
-                name=project["name"],
-                url=project["http_url_to_repo"],
-                branches=[],
-                include_tags=True,
-                max_tags=1,
-                path=self.base_path,
-                recursive=False,
-                exclude_paths=[],
+            repositories.append(
+                self._repository_config(project["name"], project["http_url_to_repo"])
             )
-            repositories.append(repo_config)
 
         click.echo(f"Found {len(repositories)} repositories", err=True)
         return repositories
@@ -280,96 +1172,167 @@ class GitLabImporter(RepositoryImporter):
             group: Group name or ID
 
         Returns:
-            List of project dictionaries from GitLab API
+            List of project dictionaries from GitLab API, reduced to
+            GITLAB_PROJECT_FIELDS
         """
         projects = []
-        page = 1
-        per_page = 100
+        url = f"{self._api_url}/groups/{group}/projects"
+        params = {
+            "per_page": 100,
+            "include_subgroups": self.recursive,
+            "with_shared": False,
+        }
 
-        while True:
-            url = f"{self.gitlab_url}/api/v4/groups/{group}/projects"
-            params = {
-                "page": page,
-                "per_page": per_page,
-                "include_subgroups": self.recursive,
-                "with_shared": False,
-            }
+        try:
+            for page, page_projects in enumerate(self._fetch_pages(url, params), 1):
+                projects.extend(
+                    {
+                        key: project[key]
+                        for key in GITLAB_PROJECT_FIELDS
+                        if key in project
+                    }
+                    for project in page_projects
+                )
+                click.echo(
+                    f"Processed page {page} ({len(page_projects)} projects)", err=True
+                )
+        except requests.exceptions.RequestException as e:
+            raise click.ClickException(f"Error fetching projects: {e}")
 
-            try:
-                response = requests.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-            except requests.exceptions.RequestException as e:
-                raise click.ClickException(f"Error fetching projects: {e}")
+        return projects
 
-            page_projects = response.json()
-            if not page_projects:
-                break
+    def _last_page(self, response: requests.Response) -> Optional[int]:
+        """Get the last page number from GitLab's X-Total-Pages header.
 
-            projects.extend(page_projects)
-            page += 1
-            click.echo(
-                f"Processed page {page - 1} ({len(page_projects)} projects)", err=True
-            )
+        GitLab omits the header for very large listings, in which case the
+        Link header is used if present.
 
-        return projects
+        Args:
+            response: Response for the first page
+
+        Returns:
+            Last page number, or None if it is not given
+        """
+        try:
+            return int(response.headers["X-Total-Pages"])
+        except (KeyError, ValueError):
+            return super()._last_page(response)
+
+    def _has_next_page(self, response: requests.Response) -> bool:
+        """Check GitLab's X-Next-Page header for a next page.
+
+        Args:
+            response: Response for a page
+
+        Returns:
+            True if a next page is announced
+        """
+        next_page = response.headers.get("X-Next-Page")
+        if next_page is None:
+            return super()._has_next_page(response)
+        return bool(next_page)
+
+    def _search_terraform_repos(self) -> Tuple[Set[int], bool]:
+        """Find the group's projects with Terraform files.
+
+        A single blob search across the group replaces one tree listing per
+        project. The extension:tf filter needs advanced search on the GitLab
+        instance. Basic search matches it as plain text instead, so the
+        results are only trusted as complete when there are some and every
+        hit is a .tf file; otherwise the other projects are checked on their
+        own.
 
-    def _has_terraform_files(self, project: Dict[str, Any]) -> bool:
+        Returns:
+            IDs of projects with .tf files, and whether the search covered
+            all of them
+        """
+        url = f"{self._api_url}/groups/{self.group}/search"
+        per_page = 100
+        params = {"scope": "blobs", "search": "extension:tf", "per_page": per_page}
+        project_ids: Set[int] = set()
+        filtered = True  # Whether every hit so far was a .tf file
+
+        try:
+            for page in range(1, SEARCH_MAX_PAGES + 1):
+                response = self._request(url, {**params, "page": page})
+                if response.status_code != 200:
+                    return project_ids, False
+
+                blobs = _response_json(response)
+                for blob in blobs:
+                    if str(blob.get("filename") or "").endswith(".tf"):
+                        project_ids.add(blob["project_id"])
+                    else:
+                        filtered = False
+                if len(blobs) < per_page:
+                    return project_ids, filtered and bool(project_ids)
+        except requests.exceptions.RequestException as e:
+            click.echo(f"Warning: Terraform blob search failed: {e}", err=True)
+        return project_ids, False
+
+    def _cache_key(self, project: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Key Terraform check results by instance, project ID and activity."""
+        if not project.get("id") or not project.get("last_activity_at"):
+            return None
+        # Project IDs are only unique within one GitLab instance
+        return f"{self.gitlab_url}/{project['id']}", project["last_activity_at"]
+
+    def _check_terraform_files(self, project: Dict[str, Any]) -> Optional[bool]:
         """Check if a project contains Terraform files.
 
+        Uses the group-wide search results when available and falls back to
+        listing the project's repository tree.
+
         Args:
             project: Project data from GitLab API
 
         Returns:
-            True if project contains .tf files, False otherwise.
+            True if project contains .tf files, False if it does not, or None
+            if the check failed.
         """
         project_id = project.get("id")
         project_name = project.get("name", "unknown")
 
         if not project_id:
-            return True  # Include by default if we can't get project ID
+            return None  # Can't check without a project ID
 
-        try:
-            # Use repository tree API to search for .tf files
-            url = f"{self.gitlab_url}/api/v4/projects/{project_id}/repository/tree"
-            params = {
-                "recursive": True,
-                "per_page": 1,
-            }
+        found = self._bulk_search_result(project_id)
+        if found is not None:
+            return found
 
-            response = requests.get(url, headers=self.headers, params=params)
-
-            if response.status_code == 200:
-                tree_items = response.json()
-                # Check if any file has .tf extension
-                for item in tree_items:
+        try:
+            # Walk the repository tree page by page, stopping at the first
+            # .tf file
+            url = f"{self._api_url}/projects/{project_id}/repository/tree"
+            params = {"recursive": True, "per_page": 100}
+            page = 1
+
+            while True:
+                response = self._request(url, {**params, "page": page})
+                if response.status_code != 200:
+                    break
+
+                for item in _response_json(response):
                     if item.get("type") == "blob" and item.get("name", "").endswith(
                         ".tf"
                     ):
                         return True
 
-                # If we got results but no .tf files, check more carefully
-                # Make a more specific search
-                url = f"{self.gitlab_url}/api/v4/projects/{project_id}/repository/tree"
-                params = {"recursive": True, "per_page": 100}
-                response = requests.get(url, headers=self.headers, params=params)
-
-                if response.status_code == 200:
-                    tree_items = response.json()
-                    for item in tree_items:
-                        if item.get("type") == "blob" and item.get("name", "").endswith(
-                            ".tf"
-                        ):
-                            return True
+                next_page = _header_int(response.headers, "X-Next-Page")
+                if next_page is None:
                     return False
-                else:
-                    return True  # Include by default if we can't check
-            elif response.status_code == 403:
+                page = next_page
+
+            if page > 1:
+                return None  # A later page failed
+
+            if response.status_code == 403:
                 click.echo(
                     f"Warning: Cannot check Terraform files for {project_name} "
                     f"(GitLab API returned 403 - verify token permissions)",
                     err=True,
                 )
-                return True  # Include by default
+                return None
             elif response.status_code == 404:
                 # Repository might be empty
                 click.echo(
@@ -378,14 +1341,14 @@ class GitLabImporter(RepositoryImporter):
                 )
                 return False
             else:
-                return True  # Include by default if check fails
+                return None
         except Exception as e:
             # Log the exception for debugging but don't fail the whole operation
             click.echo(
                 f"Warning: Error checking Terraform files for {project_name}: {e}",
                 err=True,
             )
-            return True  # Include by default if check fails
+            return None
 
 
 def merge_repositories(
@@ -406,24 +1369,71 @@ def merge_repositories(
     if replace:
         return new_repos
 
-    # Create a dictionary of existing repos by URL for fast lookup
-    existing_by_url = {repo.url: repo for repo in existing_repos}
+    # Add new repos that don't already exist, once each
+    seen_urls = {repo.url for repo in existing_repos}
+    extras = []
+    for new_repo in new_repos:
+        if new_repo.url not in seen_urls:
+            seen_urls.add(new_repo.url)
+            extras.append(new_repo)
 
-    # Start with existing repos
-    merged = list(existing_repos)
+    return list(existing_repos) + extras
 
-    # Add new repos that don't already exist
-    for new_repo in new_repos:
-        if new_repo.url not in existing_by_url:
-            merged.append(new_repo)
 
-    return merged
+class PendingConfigUpdates:
+    """Configuration file updates held in memory until they are flushed.
+
+    Passing the same instance to several update_config_file calls keeps
+    each parsed configuration in memory, so later updates to the same file
+    skip the YAML round-trip. Used as a context manager, the pending
+    updates are written when the block exits.
+    """
+
+    def __init__(self):
+        """Initialize with no pending updates."""
+        # Parsed configurations keyed by resolved config path
+        self._configs: Dict[Path, Dict[str, Any]] = {}
+
+    def __enter__(self) -> "PendingConfigUpdates":
+        """Return the instance for staging updates in a with block."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Write the pending updates when the with block exits."""
+        self.flush()
+
+    def pop(self, config_path: Path) -> Optional[Dict[str, Any]]:
+        """Take the pending configuration of a file, if there is one.
+
+        Args:
+            config_path: Path to the configuration file
+
+        Returns:
+            The pending configuration, or None if the file has none
+        """
+        return self._configs.pop(Path(config_path).resolve(), None)
+
+    def stage(self, config_path: Path, config: Dict[str, Any]) -> None:
+        """Hold a configuration in memory until the next flush.
+
+        Args:
+            config_path: Path to the configuration file
+            config: Configuration to write
+        """
+        self._configs[Path(config_path).resolve()] = config
+
+    def flush(self) -> None:
+        """Write all pending configurations to their files."""
+        while self._configs:
+            config_path, config = self._configs.popitem()
+            write_yaml_file(config_path, config)
 
 
 def update_config_file(
     config_path: Path,
     new_repos: List[RepositoryConfig],
     replace: bool = False,
+    pending: Optional[PendingConfigUpdates] = None,
 ) -> None:
     """Update a configuration file with new repositories.
 
@@ -431,22 +1441,33 @@ def update_config_file(
         config_path: Path to the configuration file
         new_repos: New repository configurations to add
         replace: If True, replace all existing repos. If False, merge.
+        pending: If given, stage the update in it instead of writing the
+            file now; the caller writes it with pending.flush()
     """
-    # Load existing configuration if file exists
-    existing_config = {}
-    existing_repos = []
-
-    if config_path.exists():
-        with open(config_path, "r") as f:
-            existing_config = yaml.safe_load(f) or {}
-            existing_repo_data = existing_config.get("repositories", [])
-            existing_repos = [RepositoryConfig(**repo) for repo in existing_repo_data]
-
-    # Merge repositories
-    merged_repos = merge_repositories(existing_repos, new_repos, replace=replace)
+    # Load existing configuration, preferring a pending in-memory copy
+    existing_config = pending.pop(config_path) if pending is not None else None
+    if existing_config is None:
+        existing_config = {}
+        if config_path.exists():
+            with open(config_path, "r") as f:
+                existing_config = yaml.load(f, Loader=SafeLoader) or {}
+
+    existing_repo_data = existing_config.get("repositories") or []
+
+    # Merge repositories. Existing entries were loaded from the file and are
+    # kept as they are; only added repositories are validated and dumped
+    if replace:
+        existing_repo_data = []
+    existing_repos = [
+        RepositoryConfig.model_construct(**repo) for repo in existing_repo_data
+    ]
+    merged_repos = merge_repositories(existing_repos, new_repos)
+    added_repos = merged_repos[len(existing_repos) :]
 
     # Update the configuration
-    existing_config["repositories"] = [repo.model_dump() for repo in merged_repos]
+    existing_config["repositories"] = existing_repo_data + [
+        repo.model_dump() for repo in added_repos
+    ]
 
     # Ensure other required keys exist with defaults if not present
     if "output_dir" not in existing_config:
@@ -454,8 +1475,14 @@ def update_config_file(
     if "clone_dir" not in existing_config:
         existing_config["clone_dir"] = "./repos"
 
+    if pending is not None:
+        pending.stage(config_path, existing_config)
+        click.echo(
+            f"Staged {len(merged_repos)} repositories for {config_path} (pending write)"
+        )
+        return
+
     # Write back to file
-    with open(config_path, "w") as f:
-        yaml.dump(existing_config, f, default_flow_style=False, sort_keys=False)
+    write_yaml_file(config_path, existing_config)
 
     click.echo(f"Updated {config_path} with {len(merged_repos)} repositories")
@@ -2,11 +2,160 @@
 
 import hashlib
 import json
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from terraform_ingest.models import TerraformModuleSummary
+from pydantic import BaseModel, Field
+
+from terraform_ingest.json_utils import dumps as dump_json, loads as load_json
+from terraform_ingest.models import TerraformModuleSummary, module_summary_filename
+
+# Summary files at least this large are memory-mapped when the index is
+# rebuilt; smaller files are cheaper to read with a single read call
+MMAP_MIN_SIZE = 1 << 20
+
+# Summary files parsed in worker processes when the index is rebuilt from at
+# least this many files; below it, starting the workers costs more than the
+# parsing they take over
+PARALLEL_REBUILD_MIN_FILES = 256
+
+
+class _IndexedProvider(BaseModel):
+    """Provider fields used by the module index."""
+
+    name: str
+
+
+class _IndexedSummary(BaseModel):
+    """The TerraformModuleSummary fields used by the module index.
+
+    Rebuilding the index validates summary files against this subset, so the
+    variables, outputs and resources of each module are neither validated
+    nor turned into models. Field names match TerraformModuleSummary, so it
+    can be passed to ModuleIndexer.add_module.
+    """
+
+    repository: str
+    ref: str
+    path: str = "."
+    providers: List[_IndexedProvider] = Field(default_factory=list)
+
+
+def _read_json_file(path: Path) -> Any:
+    """Read and decode a JSON file.
+
+    Large files are decoded straight from a read-only memory map instead of
+    being copied into a bytes buffer first.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Decoded JSON document
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+        OSError: If the file cannot be read
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+            return load_json(f.read())
+        with (
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped) as view,
+        ):
+            return load_json(view)
+
+
+def _parse_summary_file(path: Path) -> Optional[_IndexedSummary]:
+    """Read the indexed fields of a summary file.
+
+    Runs in worker processes when the index is rebuilt, so it must stay a
+    module-level function.
+
+    Args:
+        path: Path to the summary JSON file
+
+    Returns:
+        Indexed fields of the summary, or None if the file is not a module
+        summary
+    """
+    try:
+        return _IndexedSummary.model_validate(_read_json_file(path))
+    except (json.JSONDecodeError, ValueError):
+        return None
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Get the distinct three-character substrings of some text.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Trigrams of the text, empty if it is shorter than three characters
+    """
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _checksum_file(checksums: List[str]) -> bytes:
+    """Build the contents of an index checksum file.
+
+    Args:
+        checksums: Accepted index checksums
+
+    Returns:
+        One checksum per line, encoded as UTF-8
+    """
+    return "".join(f"{checksum}\n" for checksum in checksums).encode("utf-8")
+
+
+def _write_file_atomic(path: Path, payload: bytes) -> None:
+    """Replace a file with new contents without exposing a partial write.
+
+    Args:
+        path: File to replace
+        payload: New contents of the file
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        if path.exists():
+            shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+@lru_cache(maxsize=4096)
+def module_document_id(repository: str, ref: str, path: str) -> str:
+    """Generate the document ID shared by the module index and vector DB.
+
+    The ID is the SHA256 hash of repo:ref:path. It must stay stable, as it
+    keys documents already stored in existing indexes and collections.
+
+    Args:
+        repository: Repository URL
+        ref: Git ref (branch or tag)
+        path: Module path within the repository
+
+    Returns:
+        Unique document ID (SHA256 hex digest)
+    """
+    id_string = f"{repository}:{ref}:{path}"
+    return hashlib.sha256(id_string.encode()).hexdigest()
 
 
 class ModuleIndexer:
@@ -15,41 +164,251 @@ class ModuleIndexer:
     DEFAULT_INDEX_FILENAME = "module_index.json"
 
     def __init__(
-        self, output_dir: str = "./output", index_filename: str = DEFAULT_INDEX_FILENAME
+        self,
+        output_dir: str = "./output",
+        index_filename: str = DEFAULT_INDEX_FILENAME,
+        lazy: bool = True,
     ):
         """Initialize the module indexer.
 
         Args:
             output_dir: Directory containing module summary JSON files
             index_filename: Name of the index file to maintain
+            lazy: If True, read the index file on first access instead of now
         """
         self.output_dir = Path(output_dir)
         self.index_path = self.output_dir / index_filename
-        self.modules: Dict[str, Dict[str, Any]] = {}
-        self._load_index()
+
+        # Loaded from the index file on first access to self.modules
+        self._modules: Optional[Dict[str, Dict[str, Any]]] = None
+        self._load_lock = threading.Lock()
+
+        # Whether modules were added or removed since the index was loaded
+        # or saved; save() skips rewriting an unchanged index file
+        self._unsaved = False
+
+        # Result of get_stats, reset whenever the modules change
+        self._stats: Optional[Dict[str, Any]] = None
+
+        # Reverse indexes from lowercased provider names, tags and lowercased
+        # repository URLs to the IDs of their modules. The IDs are kept in
+        # dicts used as ordered sets, in the same order as self.modules
+        self._by_provider: Dict[str, Dict[str, None]] = {}
+        self._by_tag: Dict[str, Dict[str, None]] = {}
+        self._by_repository: Dict[str, Dict[str, None]] = {}
+
+        # Trigrams of the repository keys above, mapped to the keys containing
+        # them, so repository searches only substring-match likely keys
+        self._repository_trigrams: Dict[str, Set[str]] = {}
+
+        if not lazy:
+            self._load_index()
+
+    @property
+    def modules(self) -> Dict[str, Dict[str, Any]]:
+        """Module index entries keyed by document ID.
+
+        The index file is read on first access, so indexers that are only
+        cleared, rebuilt or never queried do not parse it.
+        """
+        if self._modules is None:
+            with self._load_lock:
+                if self._modules is None:
+                    self._load_index()
+        return self._modules
 
     def _load_index(self) -> None:
         """Load existing index from file if it exists."""
+        modules: Dict[str, Dict[str, Any]] = {}
         if self.index_path.exists():
             try:
-                with open(self.index_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.modules = data.get("modules", {})
-            except (json.JSONDecodeError, IOError):
-                # If index is corrupted, start fresh
-                self.modules = {}
+                payload = self.index_path.read_bytes()
+                if not self._checksum_matches(payload):
+                    raise ValueError("Index checksum mismatch")
+                modules = load_json(payload).get("modules", {})
+            except (ValueError, IOError):
+                # If index is corrupted, keep a copy of it and start fresh
+                self._backup_corrupt_index()
+                modules = {}
+
+        for lookup in (self._by_provider, self._by_tag, self._by_repository):
+            lookup.clear()
+        self._repository_trigrams.clear()
+        for doc_id, module in modules.items():
+            # Indexes written before providers became a list joined the
+            # names with commas
+            if isinstance(module["providers"], str):
+                module["providers"] = [n for n in module["providers"].split(",") if n]
+            self._update_lookups(doc_id, None, module)
+
+        # Published last, so concurrent readers never see half-built lookups
+        self._stats = None
+        self._modules = modules
+
+    @property
+    def checksum_path(self) -> Path:
+        """Path of the SHA-256 checksum file written next to the index."""
+        return self.index_path.with_name(f"{self.index_path.name}.sha256")
+
+    def _saved_checksums(self) -> Optional[List[str]]:
+        """Read the checksums listed in the checksum file.
+
+        Returns:
+            Accepted index checksums, or None if there is no checksum file
+        """
+        try:
+            return self.checksum_path.read_text(encoding="utf-8").split()
+        except FileNotFoundError:
+            return None
+
+    def _checksum_matches(self, payload: bytes) -> bool:
+        """Check index file contents against the saved checksums.
+
+        Indexes saved before checksums were written have no checksum file
+        and are accepted as they are.
+
+        Args:
+            payload: Contents of the index file
+
+        Returns:
+            False if a checksum file exists and none of its checksums match,
+            True otherwise
+        """
+        expected = self._saved_checksums()
+        return expected is None or hashlib.sha256(payload).hexdigest() in expected
+
+    def _backup_corrupt_index(self) -> None:
+        """Move a corrupt index aside so its entries can still be recovered."""
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        backup_path = self.index_path.with_name(
+            f"{self.index_path.name}.corrupt-{timestamp}"
+        )
+        try:
+            os.replace(self.index_path, backup_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _lookup_keys(
+        module: Optional[Dict[str, Any]],
+    ) -> Tuple[Set[str], Set[str], Set[str]]:
+        """Get the reverse index keys of a module entry.
+
+        Args:
+            module: Module index entry, or None for no keys
+
+        Returns:
+            Provider, tag and repository keys of the entry
+        """
+        if module is None:
+            return set(), set(), set()
+        providers = {module["provider"].lower()}
+        providers.update(name.lower() for name in module["providers"])
+        return providers, set(module["tags"]), {module["repository"].lower()}
+
+    def _update_lookups(
+        self,
+        doc_id: str,
+        old: Optional[Dict[str, Any]],
+        new: Optional[Dict[str, Any]],
+    ) -> None:
+        """Move a module between reverse index buckets.
+
+        Keys the old and new entries share are left alone, so a re-added
+        module keeps its position in each bucket.
+
+        Args:
+            doc_id: The document ID of the module
+            old: Previous module entry, or None if the module is new
+            new: New module entry, or None if the module is removed
+        """
+        lookups = (self._by_provider, self._by_tag, self._by_repository)
+        for lookup, old_keys, new_keys in zip(
+            lookups, self._lookup_keys(old), self._lookup_keys(new)
+        ):
+            for key in old_keys - new_keys:
+                ids = lookup[key]
+                del ids[doc_id]
+                if not ids:
+                    del lookup[key]
+                    if lookup is self._by_repository:
+                        self._update_trigrams(key, remove=True)
+            for key in new_keys - old_keys:
+                if lookup is self._by_repository and key not in lookup:
+                    self._update_trigrams(key)
+                lookup.setdefault(key, {})[doc_id] = None
+
+    def _update_trigrams(self, key: str, remove: bool = False) -> None:
+        """Add a repository key to, or remove it from, the trigram index.
+
+        Args:
+            key: Lowercased repository URL
+            remove: Whether to remove the key instead of adding it
+        """
+        for trigram in _trigrams(key):
+            if remove:
+                keys = self._repository_trigrams[trigram]
+                keys.discard(key)
+                if not keys:
+                    del self._repository_trigrams[trigram]
+            else:
+                self._repository_trigrams.setdefault(trigram, set()).add(key)
+
+    def _matching(
+        self,
+        lookup: Dict[str, Dict[str, None]],
+        text: str,
+        candidates: Optional[Set[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get the modules of every reverse index key containing some text.
+
+        Args:
+            lookup: Reverse index to search
+            text: Lowercased text to look for in the keys
+            candidates: Keys that may contain the text; defaults to all keys
+
+        Returns:
+            Matching module entries, in index order
+        """
+        modules = self.modules
+        keys = lookup if candidates is None else candidates
+        buckets = [lookup[key] for key in keys if text in key]
+        if len(buckets) == 1:
+            return [modules[doc_id] for doc_id in buckets[0]]
+        matches = set().union(*buckets)
+        return [module for doc_id, module in modules.items() if doc_id in matches]
 
     def _save_index(self) -> None:
-        """Save the index to file."""
+        """Save the index and its SHA-256 checksum to file.
+
+        The index is serialized in memory, written to a temporary file in
+        the same directory with a single write and moved over the index
+        with os.replace, so an interrupted save never leaves a truncated
+        index behind. The checksum lets the next load detect an index that
+        was damaged after it was written.
+
+        The index and checksum files cannot be replaced together. The new
+        checksum is therefore first listed next to the previous one, so
+        either index matches the checksum file at every point of the save.
+        """
         index_data = {
             "index_version": "1.0",
             "generated_at": datetime.now(timezone.utc).isoformat(),
             "total_modules": len(self.modules),
             "modules": self.modules,
         }
+        payload = dump_json(index_data).encode("utf-8")
+        checksum = hashlib.sha256(payload).hexdigest()
+
+        previous = self._saved_checksums()
+        if previous is None and self.index_path.exists():
+            previous = [hashlib.sha256(self.index_path.read_bytes()).hexdigest()]
 
-        with open(self.index_path, "w", encoding="utf-8") as f:
-            json.dump(index_data, f, indent=2)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        checksums = [checksum] + [c for c in previous or [] if c != checksum]
+        _write_file_atomic(self.checksum_path, _checksum_file(checksums))
+        _write_file_atomic(self.index_path, payload)
+        _write_file_atomic(self.checksum_path, _checksum_file([checksum]))
 
     def _generate_document_id(self, summary: TerraformModuleSummary) -> str:
         """Generate unique ID based on repo:ref:path (same as vector DB).
@@ -60,11 +419,10 @@ class ModuleIndexer:
         Returns:
             Unique document ID (SHA256 hash)
         """
-        id_string = f"{summary.repository}:{summary.ref}:{summary.path}"
-        return hashlib.sha256(id_string.encode()).hexdigest()
+        return module_document_id(summary.repository, summary.ref, summary.path)
 
     def _get_summary_filename(self, summary: TerraformModuleSummary) -> str:
-        """Generate the summary JSON filename following ingest.py's pattern.
+        """Generate the summary JSON filename of a module.
 
         Args:
             summary: Terraform module summary
@@ -72,26 +430,22 @@ class ModuleIndexer:
         Returns:
             Filename of the JSON summary file
         """
-        repo_name = summary.repository.rstrip("/").split("/")[-1]
-        if repo_name.endswith(".git"):
-            repo_name = repo_name[:-4]
-
-        ref_name = summary.ref.replace("/", "_")
-
-        # Include module path in filename if it's not the root
-        if summary.path and summary.path != "." and summary.path != "/":
-            path_part = summary.path.replace("/", "_").replace("\\", "_")
-            filename = f"{repo_name}_{ref_name}_{path_part}.json"
-        else:
-            filename = f"{repo_name}_{ref_name}.json"
-
-        return filename
-
-    def add_module(self, summary: TerraformModuleSummary) -> str:
+        return module_summary_filename(summary.repository, summary.ref, summary.path)
+
+    def add_module(
+        self,
+        summary: TerraformModuleSummary,
+        content_hash: Optional[str] = None,
+        indexed_at: Optional[str] = None,
+    ) -> str:
         """Add or update a module in the index.
 
         Args:
             summary: Terraform module summary
+            content_hash: Hash of the saved summary, stored so unchanged
+                modules can be skipped on the next ingest
+            indexed_at: ISO timestamp stored as last_indexed, so a batch of
+                modules can share one (default: now)
 
         Returns:
             The document ID for the module
@@ -99,21 +453,23 @@ class ModuleIndexer:
         doc_id = self._generate_document_id(summary)
         filename = self._get_summary_filename(summary)
 
-        self.modules[doc_id] = {
+        module = {
             "id": doc_id,
             "repository": summary.repository,
             "ref": summary.ref,
             "path": summary.path,
             "summary_file": f"output/{filename}",
             "provider": (summary.providers[0].name if summary.providers else "unknown"),
-            "providers": (
-                ",".join([p.name for p in summary.providers])
-                if summary.providers
-                else ""
-            ),
+            "providers": [p.name for p in summary.providers],
             "tags": self._extract_tags(summary),
-            "last_indexed": datetime.now(timezone.utc).isoformat(),
+            "last_indexed": indexed_at or datetime.now(timezone.utc).isoformat(),
         }
+        if content_hash is not None:
+            module["content_hash"] = content_hash
+        self._update_lookups(doc_id, self.modules.get(doc_id), module)
+        self.modules[doc_id] = module
+        self._unsaved = True
+        self._stats = None
 
         return doc_id
 
@@ -150,7 +506,9 @@ class ModuleIndexer:
             True if module was removed, False if not found
         """
         if doc_id in self.modules:
-            del self.modules[doc_id]
+            self._update_lookups(doc_id, self.modules.pop(doc_id), None)
+            self._unsaved = True
+            self._stats = None
             return True
         return False
 
@@ -188,13 +546,7 @@ class ModuleIndexer:
         Returns:
             List of matching module entries
         """
-        results = []
-        for module in self.modules.values():
-            if provider.lower() in module["provider"].lower():
-                results.append(module)
-            elif provider.lower() in module["providers"].lower():
-                results.append(module)
-        return results
+        return self._matching(self._by_provider, provider.lower())
 
     def search_by_tag(self, tag: str) -> List[Dict[str, Any]]:
         """Search modules by tag.
@@ -205,11 +557,8 @@ class ModuleIndexer:
         Returns:
             List of matching module entries
         """
-        results = []
-        for module in self.modules.values():
-            if tag.lower() in module["tags"]:
-                results.append(module)
-        return results
+        modules = self.modules
+        return [modules[doc_id] for doc_id in self._by_tag.get(tag.lower(), {})]
 
     def search_by_repository(self, repository: str) -> List[Dict[str, Any]]:
         """Search modules by repository URL.
@@ -220,11 +569,19 @@ class ModuleIndexer:
         Returns:
             List of matching module entries
         """
-        return [
-            module
-            for module in self.modules.values()
-            if repository.lower() in module["repository"].lower()
-        ]
+        text = repository.lower()
+        trigrams = _trigrams(text)
+        # Checking self.modules first also loads the index and its trigrams
+        if not self.modules or not trigrams:
+            return self._matching(self._by_repository, text)
+
+        # A key containing the text contains all of its trigrams
+        key_sets = sorted(
+            (self._repository_trigrams.get(trigram, set()) for trigram in trigrams),
+            key=len,
+        )
+        candidates = key_sets[0].intersection(*key_sets[1:])
+        return self._matching(self._by_repository, text, candidates)
 
     def list_all(self) -> List[Dict[str, Any]]:
         """Get all modules in the index.
@@ -236,11 +593,20 @@ class ModuleIndexer:
 
     def clear(self) -> None:
         """Clear all entries from the index."""
-        self.modules.clear()
+        self._modules = {}
+        self._unsaved = True
+        self._stats = None
+        self._by_provider.clear()
+        self._by_tag.clear()
+        self._by_repository.clear()
+        self._repository_trigrams.clear()
 
     def rebuild_from_files(self) -> int:
         """Rebuild the index from all JSON summary files in output directory.
 
+        Large output directories are parsed in a process pool; the index is
+        updated from the results in file order.
+
         Returns:
             Number of modules indexed
         """
@@ -249,47 +615,73 @@ class ModuleIndexer:
         if not self.output_dir.exists():
             return 0
 
-        count = 0
-        for json_file in self.output_dir.glob("*.json"):
-            # Skip the index file itself
-            if json_file.name == self.index_path.name:
-                continue
+        # Skip the index file itself
+        json_files = [
+            json_file
+            for json_file in self.output_dir.glob("*.json")
+            if json_file.name != self.index_path.name
+        ]
 
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    summary = TerraformModuleSummary(**data)
-                    self.add_module(summary)
-                    count += 1
-            except (json.JSONDecodeError, ValueError):
-                # Skip files that don't match the summary schema
-                continue
+        if len(json_files) >= PARALLEL_REBUILD_MIN_FILES:
+            with ProcessPoolExecutor() as executor:
+                summaries = list(
+                    executor.map(_parse_summary_file, json_files, chunksize=64)
+                )
+        else:
+            summaries = [_parse_summary_file(json_file) for json_file in json_files]
+
+        count = 0
+        indexed_at = datetime.now(timezone.utc).isoformat()
+        for summary in summaries:
+            # Skip files that don't match the summary schema
+            if summary is not None:
+                self.add_module(summary, indexed_at=indexed_at)
+                count += 1
 
         self.save()
         return count
 
     def save(self) -> None:
-        """Save the index to file."""
+        """Save the index to file, unless it is unchanged since the last save.
+
+        An index that was loaded or saved and not modified since is already
+        on disk, so an ingest run that skipped every module does not rewrite
+        the whole file.
+        """
+        if (
+            not self._unsaved
+            and self.index_path.exists()
+            and self.checksum_path.exists()
+        ):
+            return
         self._save_index()
+        self._unsaved = False
 
     def get_stats(self) -> Dict[str, Any]:
         """Get index statistics.
 
+        The statistics are computed once and reused until the index changes.
+
         Returns:
             Dictionary with index statistics
         """
-        providers = set()
-        all_tags = set()
-
-        for module in self.modules.values():
-            if module["provider"] != "unknown":
-                providers.add(module["provider"])
-            all_tags.update(module["tags"])
-
-        return {
-            "total_modules": len(self.modules),
-            "unique_providers": len(providers),
-            "providers": sorted(list(providers)),
-            "unique_tags": len(all_tags),
-            "index_file": str(self.index_path),
-        }
+        modules = self.modules
+        if self._stats is None:
+            providers = set()
+            all_tags = set()
+
+            for module in modules.values():
+                if module["provider"] != "unknown":
+                    providers.add(module["provider"])
+                all_tags.update(module["tags"])
+
+            self._stats = {
+                "total_modules": len(modules),
+                "unique_providers": len(providers),
+                "providers": sorted(list(providers)),
+                "unique_tags": len(all_tags),
+                "index_file": str(self.index_path),
+            }
+
+        # Copied so callers cannot alter the cached result
+        return dict(self._stats, providers=list(self._stats["providers"]))
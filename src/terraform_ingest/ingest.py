@@ -1,17 +1,59 @@
 """Main ingestion logic for processing terraform repositories."""
 
 import os
-import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 import yaml
-from terraform_ingest.models import IngestConfig, TerraformModuleSummary
+from terraform_ingest.models import (
+    EmbeddingConfig,
+    IngestConfig,
+    TerraformModuleSummary,
+)
 from terraform_ingest.repository import RepositoryManager
 from terraform_ingest.embeddings import VectorDBManager
-from terraform_ingest.indexer import ModuleIndexer
+from terraform_ingest.indexer import ModuleIndexer, module_document_id
 from terraform_ingest.tty_logger import get_logger
 from terraform_ingest.dependency_installer import ensure_embeddings_available
 
+# Summary files of a repository written concurrently
+MAX_WRITE_WORKERS = 8
+
+# EmbeddingConfig fields that change the embedded documents or their vectors.
+# API keys, caches and concurrency settings do not, so changing them does not
+# re-embed unchanged modules
+VECTOR_CONFIG_FIELDS = frozenset(
+    {
+        "strategy",
+        "openai_model",
+        "anthropic_model",
+        "sentence_transformers_model",
+        "sentence_transformers_device",
+        "sentence_transformers_fp16",
+        "sentence_transformers_backend",
+        "sentence_transformers_onnx_file",
+        "include_description",
+        "include_readme",
+        "include_variables",
+        "include_outputs",
+        "include_resource_types",
+    }
+)
+
+
+def embedding_hash_salt(embedding: EmbeddingConfig) -> bytes:
+    """Serialize the embedding settings that summary content hashes depend on.
+
+    Args:
+        embedding: Embedding configuration
+
+    Returns:
+        JSON of the VECTOR_CONFIG_FIELDS settings, encoded as UTF-8
+    """
+    return embedding.model_dump_json(include=VECTOR_CONFIG_FIELDS).encode("utf-8")
+
 
 class TerraformIngest:
     """Main class for ingesting terraform repositories."""
@@ -61,6 +103,12 @@ class TerraformIngest:
         # Initialize module indexer for fast lookups
         self.indexer = ModuleIndexer(config.output_dir)
 
+        # Mixed into summary content hashes, so enabling embeddings or
+        # changing how they are computed re-embeds unchanged modules
+        self._hash_salt = (
+            embedding_hash_salt(config.embedding) if self.vector_db else b""
+        )
+
     @classmethod
     def from_yaml(
         cls,
@@ -100,62 +148,181 @@ class TerraformIngest:
         os.environ["TOKENIZERS_PARALLELISM"] = "true"
 
         all_summaries = []
+        indexed_at = datetime.now(timezone.utc).isoformat()
 
         for repo_config in self.config.repositories:
             self.logger.info(f"Processing repository: {repo_config.url}")
             summaries = self.repo_manager.process_repository(repo_config)
             all_summaries.extend(summaries)
 
-            # Save summaries for this repository
-            for summary in summaries:
-                self._save_summary(summary)
+            # Save summaries for this repository, skipping unchanged modules
+            # unless the vector database lost them
+            changed = self._save_summaries(summaries)
+            changed += self._missing_from_vector_db(summaries, changed)
+            upserted = self._upsert_summaries([summary for summary, _ in changed])
+            for summary, content_hash in changed:
+                # Without a stored hash a failed upsert is retried next run
+                self._index_summary(
+                    summary, content_hash if upserted else None, indexed_at
+                )
 
         # Save the module index after all modules are processed
         self.finalize_index()
 
         return all_summaries
 
-    def _save_summary(self, summary: TerraformModuleSummary):
-        """Save a summary to a JSON file.
+    def _save_summaries(
+        self, summaries: List[TerraformModuleSummary]
+    ) -> List[Tuple[TerraformModuleSummary, str]]:
+        """Save the summaries that changed since the last run to JSON files.
+
+        The files are written concurrently. The caller adds the changed
+        summaries to the module index with their content hashes.
 
         Args:
-            summary: TerraformModuleSummary instance to save
+            summaries: TerraformModuleSummary instances to save
+
+        Returns:
+            Changed summaries with their content hashes
+        """
+        if not summaries:
+            return []
+
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_WRITE_WORKERS, len(summaries))
+        ) as executor:
+            hashes = list(executor.map(self._save_summary, summaries))
+
+        return [
+            (summary, content_hash)
+            for summary, content_hash in zip(summaries, hashes)
+            if content_hash is not None
+        ]
+
+    def _missing_from_vector_db(
+        self,
+        summaries: List[TerraformModuleSummary],
+        changed: List[Tuple[TerraformModuleSummary, str]],
+    ) -> List[Tuple[TerraformModuleSummary, str]]:
+        """Find unchanged summaries that are not in the vector database.
+
+        Unchanged summaries are normally not upserted again. A collection
+        that was deleted or recreated since the last run no longer holds
+        them, so they are upserted with their stored content hashes.
+
+        Args:
+            summaries: TerraformModuleSummary instances of a repository
+            changed: Changed summaries with their content hashes
+
+        Returns:
+            Unchanged summaries missing from the vector database, with the
+            content hashes stored in the module index
         """
-        # Create a safe filename from repository, ref, and path
-        repo_name = summary.repository.rstrip("/").split("/")[-1]
-        if repo_name.endswith(".git"):
-            repo_name = repo_name[:-4]
+        if not self.vector_db:
+            return []
+
+        changed_ids = {id(summary) for summary, _ in changed}
+        unchanged = {
+            module_document_id(summary.repository, summary.ref, summary.path): summary
+            for summary in summaries
+            if id(summary) not in changed_ids
+        }
+        if not unchanged:
+            return []
+
+        try:
+            existing = self.vector_db.existing_ids(list(unchanged))
+        except Exception as e:
+            self.logger.warning(f"Failed to look up modules in vector database: {e}")
+            return []
+
+        missing = [
+            (summary, self.indexer.get_module(doc_id)["content_hash"])
+            for doc_id, summary in unchanged.items()
+            if doc_id not in existing
+        ]
+        if missing:
+            self.logger.info(
+                f"Upserting {len(missing)} unchanged modules missing from the "
+                f"vector database"
+            )
+        return missing
 
-        ref_name = summary.ref.replace("/", "_")
+    def _save_summary(self, summary: TerraformModuleSummary) -> Optional[str]:
+        """Save a summary to a JSON file unless it is unchanged.
 
-        # Include module path in filename if it's not the root
-        if summary.path and summary.path != "." and summary.path != "/":
-            # Clean up the path for filename use
-            path_part = summary.path.replace("/", "_").replace("\\", "_")
-            filename = f"{repo_name}_{ref_name}_{path_part}.json"
-        else:
-            filename = f"{repo_name}_{ref_name}.json"
+        A summary is unchanged when its content hash matches the one stored
+        in the module index and its file still exists.
 
-        output_path = Path.joinpath(self.output_dir, filename)
+        Args:
+            summary: TerraformModuleSummary instance to save
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(summary.model_dump(), f, indent=2, default=str)
+        Returns:
+            Content hash of the saved summary, or None if it was unchanged
+        """
+        output_path = self.output_dir / summary.summary_filename
+
+        # Summaries are machine-read, so they are written without indentation.
+        # model_dump_json serializes in pydantic-core without building a dict
+        payload = summary.model_dump_json().encode("utf-8")
+        content_hash = hashlib.blake2b(
+            payload + self._hash_salt, digest_size=16
+        ).hexdigest()
+
+        doc_id = module_document_id(summary.repository, summary.ref, summary.path)
+        entry = self.indexer.get_module(doc_id)
+        if (
+            entry is not None
+            and entry.get("content_hash") == content_hash
+            and output_path.exists()
+        ):
+            self.logger.debug(f"Summary unchanged, skipping {output_path}")
+            return None
+
+        output_path.write_bytes(payload)
         self.logger.info(f"Saved summary to {output_path}")
+        return content_hash
 
-        # Add to module index
+    def _index_summary(
+        self,
+        summary: TerraformModuleSummary,
+        content_hash: Optional[str] = None,
+        indexed_at: Optional[str] = None,
+    ):
+        """Add a summary to the module index.
+
+        Args:
+            summary: TerraformModuleSummary instance to index
+            content_hash: Content hash of the saved summary
+            indexed_at: ISO timestamp of the ingest run
+        """
         try:
-            doc_id = self.indexer.add_module(summary)
+            doc_id = self.indexer.add_module(
+                summary, content_hash=content_hash, indexed_at=indexed_at
+            )
             self.logger.debug(f"Added module to index with ID: {doc_id}")
         except Exception as e:
             self.logger.warning(f"Failed to add module to index: {e}")
 
-        # Upsert to vector database if enabled
-        if self.vector_db:
-            try:
-                doc_id = self.vector_db.upsert_module(summary)
-                self.logger.info(f"Upserted to vector database with ID: {doc_id}")
-            except Exception as e:
-                self.logger.warning(f"Failed to upsert to vector database: {e}")
+    def _upsert_summaries(self, summaries: List[TerraformModuleSummary]) -> bool:
+        """Upsert summaries to the vector database in one batch, if enabled.
+
+        Args:
+            summaries: TerraformModuleSummary instances to upsert
+
+        Returns:
+            False if the upsert failed, True otherwise
+        """
+        if not self.vector_db or not summaries:
+            return True
+
+        try:
+            doc_ids = self.vector_db.upsert_modules(summaries)
+            self.logger.info(f"Upserted {len(doc_ids)} modules to vector database")
+        except Exception as e:
+            self.logger.warning(f"Failed to upsert to vector database: {e}")
+            return False
+        return True
 
     def finalize_index(self) -> None:
         """Save the module index after ingestion is complete."""
@@ -170,9 +337,9 @@ class TerraformIngest:
             self.logger.warning(f"Failed to save module index: {e}")
 
     def get_all_summaries_json(self) -> str:
-        """Get all summaries as a single JSON string."""
+        """Get all summaries as a single compact JSON string."""
         summaries = self.ingest()
-        return json.dumps([s.model_dump() for s in summaries], indent=2, default=str)
+        return "[" + ",".join(s.model_dump_json() for s in summaries) + "]"
 
     def cleanup(self):
         """Clean up temporary files."""
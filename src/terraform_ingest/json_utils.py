@@ -0,0 +1,54 @@
+"""JSON serialization helpers that use orjson when it is installed."""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+
+def dumps(obj: Any, pretty: bool = True) -> str:
+    """Serialize an object to a JSON string.
+
+    Uses orjson when available and the standard library json module otherwise.
+    Values that are not natively JSON serializable are converted with str().
+
+    Args:
+        obj: Object to serialize
+        pretty: Indent the output with two spaces (default: True)
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        # Like the json module, convert non-string keys instead of raising
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option, default=str).decode("utf-8")
+
+    if pretty:
+        return json.dumps(obj, indent=2, default=str)
+    return json.dumps(obj, separators=(",", ":"), default=str)
+
+
+def loads(data: Union[bytes, memoryview, str]) -> Any:
+    """Deserialize a JSON document.
+
+    Uses orjson when available and the standard library json module otherwise.
+    Both raise json.JSONDecodeError on invalid input. orjson decodes a
+    memoryview (e.g. of an mmap) in place; the fallback copies it first.
+
+    Args:
+        data: JSON document as bytes, memoryview or str
+
+    Returns:
+        Deserialized Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -1615,6 +1615,12 @@ def _run_ingestion(config_file: str = "config.yaml"):
         ingester = TerraformIngest.from_yaml(config_file, logger=logger)
         summaries = ingester.ingest()
         logger.info(f"Auto-ingestion completed: {len(summaries)} modules processed")
+
+        # The server searches through its own vector database manager, whose
+        # cached results predate this ingestion
+        server_ingester = MCPContext.get_instance().ingester
+        if server_ingester is not None and server_ingester.vector_db is not None:
+            server_ingester.vector_db.clear_query_cache()
     except Exception as e:
         logger.error(f"Error during auto-ingestion: {e}")
 
@@ -1,9 +1,40 @@
 """Data models for terraform-ingest."""
 
+from functools import lru_cache
 from typing import List, Optional, Any, Literal, Dict
 from pydantic import BaseModel, Field
 
 
+@lru_cache(maxsize=4096)
+def module_summary_filename(repository: str, ref: str, path: str) -> str:
+    """Build the name of a module's summary JSON file.
+
+    The name combines the repository name, the ref and, for modules below
+    the repository root, the module path, with separators replaced by
+    underscores. Names are memoized, since the indexer and the ingester
+    both derive them for every module of a repository.
+
+    Args:
+        repository: Repository URL
+        ref: Git ref (branch or tag)
+        path: Module path within the repository
+
+    Returns:
+        Summary filename, e.g. terraform-aws-vpc_v5.0.0_modules_nat.json
+    """
+    repo_name = repository.rstrip("/").split("/")[-1]
+    if repo_name.endswith(".git"):
+        repo_name = repo_name[:-4]
+
+    ref_name = ref.replace("/", "_")
+
+    # Include module path in filename if it's not the root
+    if path and path != "." and path != "/":
+        path_part = path.replace("/", "_").replace("\\", "_")
+        return f"{repo_name}_{ref_name}_{path_part}.json"
+    return f"{repo_name}_{ref_name}.json"
+
+
 class TerraformVariable(BaseModel):
     """Model for a Terraform variable."""
 
@@ -61,6 +92,11 @@ class TerraformModuleSummary(BaseModel):
     resources: List[TerraformResource] = Field(default_factory=list)
     readme_content: Optional[str] = None
 
+    @property
+    def summary_filename(self) -> str:
+        """Name of the module's summary JSON file in the output directory."""
+        return module_summary_filename(self.repository, self.ref, self.path)
+
 
 class RepositoryConfig(BaseModel):
     """Configuration for a repository to ingest."""
@@ -125,6 +161,14 @@ class EmbeddingConfig(BaseModel):
     openai_model: str = "text-embedding-3-small"
     anthropic_model: str = "claude-3-haiku-20240307"
     sentence_transformers_model: str = "all-MiniLM-L6-v2"
+    sentence_transformers_device: str = "auto"  # auto, cpu, cuda, cuda:1, mps
+    sentence_transformers_fp16: bool = True  # Half precision on GPU devices
+    sentence_transformers_backend: Literal["torch", "onnx"] = "torch"
+    # ONNX weights file inside the model repo, e.g. onnx/model_qint8_avx512.onnx
+    sentence_transformers_onnx_file: Optional[str] = None
+
+    # Maximum concurrent embedding requests for the openai/claude strategies
+    max_concurrent_batches: int = Field(default=5, ge=1)
 
     # ChromaDB configuration
     chromadb_host: Optional[str] = None  # For client/server mode
@@ -144,6 +188,13 @@ class EmbeddingConfig(BaseModel):
     keyword_weight: float = 0.3  # Weight for keyword search (0.0 to 1.0)
     vector_weight: float = 0.7  # Weight for vector search (0.0 to 1.0)
 
+    # Search result cache: repeated queries, and (for the openai and
+    # sentence-transformers strategies) queries whose embedding has at least
+    # this cosine similarity to a cached one, reuse earlier results. Off by
+    # default, as writes from other processes do not invalidate it
+    query_cache_size: int = 0  # 0 disables the cache
+    semantic_cache_threshold: float = 0.97
+
 
 class IngestConfig(BaseModel):
     """Configuration for the ingestion process."""
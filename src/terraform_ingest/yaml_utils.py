@@ -0,0 +1,65 @@
+"""YAML helpers that use the libyaml-backed loader and dumper when available."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Union
+
+import yaml
+
+try:
+    # Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+__all__ = ["SafeDumper", "SafeLoader", "write_yaml_file"]
+
+
+def _current_umask() -> int:
+    """Return the process umask, which can only be read by setting it."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def write_yaml_file(path: Union[str, Path], data: Dict[str, Any]) -> None:
+    """Atomically write a configuration dictionary as YAML.
+
+    The document is written to a temporary file in the same directory and
+    moved over the target with os.replace, so readers never observe a
+    partially written file and an interrupted write never leaves a
+    truncated one behind. The original file's permissions are preserved,
+    new files get the default permissions for the current umask, and a
+    symlinked path is written through to its target.
+
+    Args:
+        path: Path to the YAML file
+        data: Configuration to write
+    """
+    # Replace the symlink target rather than the link itself
+    path = Path(path).resolve()
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        # The emitter encodes straight to UTF-8 bytes into a large buffer
+        with os.fdopen(fd, "wb", buffering=1 << 16) as f:
+            yaml.dump(
+                data,
+                f,
+                Dumper=SafeDumper,
+                default_flow_style=False,
+                sort_keys=False,
+                encoding="utf-8",
+            )
+        if path.exists():
+            shutil.copymode(path, tmp_name)
+        else:
+            # mkstemp creates the file as 0600; use what open() would have
+            os.chmod(tmp_name, 0o666 & ~_current_umask())
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
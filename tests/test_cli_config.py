@@ -3,7 +3,14 @@
 import pytest
 import yaml
 from click.testing import CliRunner
-from terraform_ingest.cli import cli
+from terraform_ingest.cli import (
+    cli,
+    _convert_value,
+    _load_yaml_config,
+    _load_yaml_key,
+    _load_yaml_key_cached,
+)
+from terraform_ingest.models import RepositoryConfig
 
 
 @pytest.fixture
@@ -241,6 +248,26 @@ class TestConfigSet:
             config = yaml.safe_load(f)
         assert config["new"]["nested"]["value"] == "test"
 
+    def test_set_replaces_file_atomically(self, runner, sample_config):
+        """Test that set keeps file permissions and leaves no temp files."""
+        sample_config.chmod(0o640)
+        result = runner.invoke(
+            cli,
+            [
+                "config",
+                "set",
+                "--config",
+                str(sample_config),
+                "--target",
+                "output_dir",
+                "--value",
+                "./new-output",
+            ],
+        )
+        assert result.exit_code == 0
+        assert sample_config.stat().st_mode & 0o777 == 0o640
+        assert [p.name for p in sample_config.parent.iterdir()] == [sample_config.name]
+
     def test_set_nonexistent_config_file(self, runner, tmp_path):
         """Test setting value in nonexistent config file."""
         config_path = tmp_path / "nonexistent.yaml"
@@ -261,6 +288,34 @@ class TestConfigSet:
         assert "Configuration file not found" in result.output
 
 
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("true", True),
+        ("ON", True),
+        ("1", True),
+        ("no", False),
+        ("0", False),
+        ("42", 42),
+        ("-7", -7),
+        ("3.14", 3.14),
+        ("1e3", 1000.0),
+        (".5", 0.5),
+        (" 5 ", 5),
+        ("2.5\n", 2.5),
+        (" hello ", " hello "),
+        ("hello", "hello"),
+        ("v1.2.3", "v1.2.3"),
+        ("nan", "nan"),
+    ],
+)
+def test_convert_value(value, expected):
+    """Test type conversion of config set values."""
+    result = _convert_value(value)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
 class TestConfigGet:
     """Tests for config get command."""
 
@@ -358,6 +413,16 @@ class TestConfigGet:
         assert result.exit_code != 0
         assert "Configuration key not found" in result.output
 
+    @pytest.mark.parametrize("target", ["output_dir.deeper", "repositories.0"])
+    def test_get_through_non_mapping(self, runner, sample_config, target):
+        """Test paths that descend into a scalar or list are reported missing."""
+        result = runner.invoke(
+            cli,
+            ["config", "get", "--config", str(sample_config), "--target", target],
+        )
+        assert result.exit_code != 0
+        assert f"Configuration key not found: {target}" in result.output
+
     def test_get_entire_config_as_yaml(self, runner, sample_config):
         """Test getting entire configuration without target (YAML output)."""
         result = runner.invoke(
@@ -387,6 +452,107 @@ class TestConfigGet:
         assert '"mcp"' in result.output
 
 
+class TestLoadYamlKey:
+    """Tests for partial config parsing used by config get."""
+
+    def test_skips_repositories_block(self, tmp_path):
+        """Test the repositories block is not parsed for other keys."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "output_dir: ./output\n"
+            "repositories:\n"
+            "- url: https://github.com/org/repo1.git\n"
+            "  # comment inside the block\n"
+            "  branches: [main\n"
+            "mcp:\n"
+            "  port: 3000\n"
+        )
+        # The (invalid) repositories block is skipped entirely
+        assert _load_yaml_key(config_path, "mcp") == {
+            "output_dir": "./output",
+            "mcp": {"port": 3000},
+        }
+
+    def test_falls_back_to_full_parse(self, tmp_path):
+        """Test aliases into the repositories block still resolve."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "repositories:\n"
+            "  - url: &repo_url https://github.com/org/repo1.git\n"
+            "default_repo: *repo_url\n"
+        )
+        data = _load_yaml_key(config_path, "default_repo")
+        assert data["default_repo"] == "https://github.com/org/repo1.git"
+        assert len(data["repositories"]) == 1
+
+    def test_reads_utf8(self, tmp_path):
+        """Test the partial parse decodes UTF-8 regardless of the locale."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_bytes(
+            "repositories: []\nmcp:\n  name: Módulos\n".encode("utf-8")
+        )
+        assert _load_yaml_key(config_path, "mcp")["mcp"] == {"name": "Módulos"}
+
+    def test_repositories_key_parses_everything(self, sample_config):
+        """Test asking for repositories returns the full configuration."""
+        data = _load_yaml_key(sample_config, "repositories")
+        assert data["repositories"][0]["name"] == "repo1"
+        assert data["mcp"]["port"] == 3000
+
+
+class TestLoadYamlConfig:
+    """Tests for the cached config loader used by add-repo/remove-repo."""
+
+    def test_returns_independent_copies(self, sample_config):
+        """Test callers can modify the result without affecting the cache."""
+        first = _load_yaml_config(sample_config)
+        first["repositories"].clear()
+
+        second = _load_yaml_config(sample_config)
+        assert len(second["repositories"]) == 1
+
+    def test_reparses_changed_file(self, sample_config):
+        """Test a modified file is parsed again."""
+        assert _load_yaml_config(sample_config)["output_dir"] == "./output"
+
+        sample_config.write_text("output_dir: ./elsewhere\n")
+        assert _load_yaml_config(sample_config) == {"output_dir": "./elsewhere"}
+
+    def test_repeated_get_reuses_parse(self, runner, sample_config):
+        """Test repeated config get calls reuse the cached parse."""
+        _load_yaml_key_cached.cache_clear()
+        for _ in range(3):
+            result = runner.invoke(
+                cli,
+                ["config", "get", "--config", str(sample_config), "-t", "output_dir"],
+            )
+            assert result.exit_code == 0
+        info = _load_yaml_key_cached.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    def test_write_invalidates_cache(self, runner, sample_config):
+        """Test config set invalidates cached parses of the file."""
+        args = ["config", "get", "--config", str(sample_config), "-t", "output_dir"]
+        assert runner.invoke(cli, args).output.strip() == "./output"
+
+        result = runner.invoke(
+            cli,
+            [
+                "config",
+                "set",
+                "--config",
+                str(sample_config),
+                "--target",
+                "output_dir",
+                "--value",
+                "./other",
+            ],
+        )
+        assert result.exit_code == 0
+        assert _load_yaml_key_cached.cache_info().currsize == 0
+        assert runner.invoke(cli, args).output.strip() == "./other"
+
+
 class TestConfigAddRepo:
     """Tests for config add-repo command."""
 
@@ -416,6 +582,27 @@ class TestConfigAddRepo:
             config["repositories"][1]["url"] == "https://github.com/test-org/repo2.git"
         )
 
+    def test_add_repo_non_ascii_name(self, runner, sample_config):
+        """Test that non-ASCII values survive the binary UTF-8 write."""
+        result = runner.invoke(
+            cli,
+            [
+                "config",
+                "add-repo",
+                "--config",
+                str(sample_config),
+                "--url",
+                "https://github.com/test-org/repo2.git",
+                "--name",
+                "réseau-模块",
+            ],
+        )
+        assert result.exit_code == 0
+
+        with open(sample_config, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+        assert config["repositories"][1]["name"] == "réseau-模块"
+
     def test_add_repo_with_options(self, runner, sample_config):
         """Test adding a repository with various options."""
         result = runner.invoke(
@@ -452,6 +639,10 @@ class TestConfigAddRepo:
         assert new_repo["recursive"] is True
         assert new_repo["path"] == "./modules"
 
+        # The entry matches what the RepositoryConfig model would produce
+        assert new_repo == RepositoryConfig(**new_repo).model_dump()
+        assert list(new_repo) == list(RepositoryConfig.model_fields)
+
     def test_add_repo_duplicate_url(self, runner, sample_config):
         """Test adding a repository with duplicate URL."""
         result = runner.invoke(
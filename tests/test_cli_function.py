@@ -0,0 +1,203 @@
+"""Tests for CLI function commands."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+from terraform_ingest.cli import (
+    cli,
+    _ModuleRefArgs,
+    _get_mcp_functions,
+    _stream_json_array,
+    _to_bool,
+    _to_int,
+)
+from terraform_ingest.json_utils import dumps as dump_json
+
+
+@pytest.fixture
+def runner():
+    """Create a Click CLI runner."""
+    return CliRunner()
+
+
+class TestFunctionShow:
+    """Tests for function show subcommand."""
+
+    def test_show_json(self, runner):
+        """Test listing functions as JSON."""
+        result = runner.invoke(cli, ["function", "show", "--format", "json"])
+        assert result.exit_code == 0
+
+        functions = json.loads(result.output)
+        names = [f["name"] for f in functions]
+        assert names == sorted(names)
+        assert "list_modules" in names
+
+        list_modules = next(f for f in functions if f["name"] == "list_modules")
+        assert "limit" in list_modules["parameters"]
+
+    def test_show_table(self, runner):
+        """Test listing functions as a table."""
+        result = runner.invoke(cli, ["function", "show"])
+        assert result.exit_code == 0
+        assert "Available MCP Functions:" in result.output
+        assert "Function: search_modules" in result.output
+
+    def test_functions_are_cached(self):
+        """Test that tool metadata is collected once per tool registry."""
+        from terraform_ingest.mcp_service import mcp
+
+        tools = mcp._tool_manager._tools
+        assert _get_mcp_functions(tools) is _get_mcp_functions(tools)
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    """Create an output directory with a single module summary."""
+    summary = {
+        "repository": "https://github.com/test-org/terraform-aws-vpc",
+        "ref": "main",
+        "path": ".",
+        "description": "AWS VPC module",
+        "variables": [{"name": "cidr", "required": True}],
+        "outputs": [],
+        "providers": [{"name": "aws", "source": "hashicorp/aws"}],
+        "modules": [],
+        "resources": [{"type": "aws_vpc", "name": "this"}],
+    }
+    (tmp_path / "terraform-aws-vpc_main.json").write_text(json.dumps(summary))
+    return tmp_path
+
+
+class TestFunctionExec:
+    """Tests for function exec subcommand."""
+
+    def test_exec_list_modules(self, runner, output_dir):
+        """Test executing list_modules."""
+        result = runner.invoke(
+            cli, ["function", "exec", "list_modules", "-o", str(output_dir)]
+        )
+        assert result.exit_code == 0
+        modules = json.loads(result.output)
+        assert len(modules) == 1
+        assert modules[0]["resource_count"] == 1
+
+    def test_exec_list_module_resources(self, runner, output_dir):
+        """Test executing list_module_resources with arguments."""
+        result = runner.invoke(
+            cli,
+            [
+                "function",
+                "exec",
+                "list_module_resources",
+                "-o",
+                str(output_dir),
+                "-a",
+                "repository",
+                "https://github.com/test-org/terraform-aws-vpc",
+                "-a",
+                "ref",
+                "main",
+            ],
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.output) == [{"type": "aws_vpc", "name": "this"}]
+
+    def test_exec_get_module_details_defaults_path(self, runner, output_dir):
+        """Test get_module_details falls back to the root module path."""
+        result = runner.invoke(
+            cli,
+            [
+                "function",
+                "exec",
+                "get_module_details",
+                "-o",
+                str(output_dir),
+                "-a",
+                "repository",
+                "https://github.com/test-org/terraform-aws-vpc",
+                "-a",
+                "ref",
+                "main",
+            ],
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.output)["description"] == "AWS VPC module"
+
+    def test_module_ref_args_from_args(self):
+        """Test module reference arguments apply defaults and ignore extras."""
+        module = _ModuleRefArgs.from_args({"ref": "v1", "output_dir": "./output"})
+        assert (module.repository, module.ref, module.path) == ("", "v1", ".")
+
+    def test_stream_json_array_matches_dump(self, capsys):
+        """Test that streamed arrays match a single JSON dump."""
+        records = [{"name": "a", "tags": ["x", "y"]}, {"name": "b", "tags": []}]
+        for pretty in (True, False):
+            for value in (records, []):
+                _stream_json_array(iter(value), pretty=pretty)
+                expected = dump_json(value, pretty=pretty) + "\n"
+                assert capsys.readouterr().out == expected
+
+    def test_exec_json_is_compact_when_piped(self, runner, output_dir):
+        """Test JSON output is compact when stdout is not a terminal."""
+        result = runner.invoke(
+            cli, ["function", "exec", "list_modules", "-o", str(output_dir)]
+        )
+        assert result.exit_code == 0
+        assert result.output.count("\n") == 1
+        assert json.loads(result.output)[0]["ref"] == "main"
+
+    def test_exec_unknown_function(self, runner, output_dir):
+        """Test executing an unknown function."""
+        result = runner.invoke(
+            cli, ["function", "exec", "does_not_exist", "-o", str(output_dir)]
+        )
+        assert result.exit_code != 0
+        assert "Unknown function 'does_not_exist'" in result.output
+
+    def test_exec_text_format(self, runner, output_dir):
+        """Test that text format emits one compact JSON record per line."""
+        result = runner.invoke(
+            cli,
+            ["function", "exec", "list_modules", "-o", str(output_dir), "-f", "text"],
+        )
+        assert result.exit_code == 0
+        lines = result.output.strip().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["ref"] == "main"
+        assert ", " not in lines[0]
+
+
+class TestArgumentCoercion:
+    """Tests for exec argument coercion helpers."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("true", True),
+            (" Yes ", True),
+            ("on", True),
+            ("1", True),
+            ("false", False),
+            ("0", False),
+            ("", False),
+            (True, True),
+            (False, False),
+        ],
+    )
+    def test_to_bool(self, value, expected):
+        """Test boolean coercion of argument values."""
+        assert _to_bool(value) is expected
+
+    def test_to_bool_default(self):
+        """Test that a missing argument returns the default."""
+        assert _to_bool(None) is False
+        assert _to_bool(None, default=True) is True
+
+    def test_to_int(self):
+        """Test integer coercion of argument values."""
+        assert _to_int("25", 10) == 25
+        assert _to_int(7, 10) == 7
+        assert _to_int(None, 10) == 10
+        assert _to_int("many", 10) == 10
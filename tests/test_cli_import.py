@@ -4,7 +4,7 @@ import pytest
 import yaml
 from click.testing import CliRunner
 from unittest.mock import patch, Mock
-from terraform_ingest.cli import cli
+from terraform_ingest.cli import cli, _split_csv
 from terraform_ingest.models import RepositoryConfig
 
 
@@ -73,7 +73,7 @@ class TestImportCommand:
 class TestGitHubImportCommand:
     """Tests for github import subcommand."""
 
-    @patch("terraform_ingest.cli.GitHubImporter")
+    @patch("terraform_ingest.importers.GitHubImporter")
     def test_github_import_basic(
         self, mock_importer_class, runner, tmp_path, mock_github_repos
     ):
@@ -108,7 +108,7 @@ class TestGitHubImportCommand:
         assert len(config["repositories"]) == 2
         assert config["repositories"][0]["name"] == "repo1"
 
-    @patch("terraform_ingest.cli.GitHubImporter")
+    @patch("terraform_ingest.importers.GitHubImporter")
     def test_github_import_with_token(
         self, mock_importer_class, runner, tmp_path, mock_github_repos
     ):
@@ -140,7 +140,7 @@ class TestGitHubImportCommand:
         call_kwargs = mock_importer_class.call_args[1]
         assert call_kwargs["token"] == "test-token"
 
-    @patch("terraform_ingest.cli.GitHubImporter")
+    @patch("terraform_ingest.importers.GitHubImporter")
     def test_github_import_merge(
         self, mock_importer_class, runner, tmp_path, mock_github_repos
     ):
@@ -195,7 +195,7 @@ class TestGitHubImportCommand:
         # Should have 3 repos: 1 existing + 2 new
         assert len(config["repositories"]) == 3
 
-    @patch("terraform_ingest.cli.GitHubImporter")
+    @patch("terraform_ingest.importers.GitHubImporter")
     def test_github_import_replace(
         self, mock_importer_class, runner, tmp_path, mock_github_repos
     ):
@@ -251,7 +251,7 @@ class TestGitHubImportCommand:
         assert len(config["repositories"]) == 2
         assert config["repositories"][0]["name"] == "repo1"
 
-    @patch("terraform_ingest.cli.GitHubImporter")
+    @patch("terraform_ingest.importers.GitHubImporter")
     def test_github_import_with_options(
         self, mock_importer_class, runner, tmp_path, mock_github_repos
     ):
@@ -289,7 +289,7 @@ class TestGitHubImportCommand:
         assert call_kwargs["terraform_only"] is True
         assert call_kwargs["base_path"] == "/custom/path"
 
-    @patch("terraform_ingest.cli.GitHubImporter")
+    @patch("terraform_ingest.importers.GitHubImporter")
     def test_github_import_no_repos(self, mock_importer_class, runner, tmp_path):
         """Test GitHub import when no repositories are found."""
         config_file = tmp_path / "test-config.yaml"
@@ -355,7 +355,7 @@ def mock_gitlab_repos():
 class TestGitLabImportCommand:
     """Tests for gitlab import subcommand."""
 
-    @patch("terraform_ingest.cli.GitLabImporter")
+    @patch("terraform_ingest.importers.GitLabImporter")
     def test_gitlab_import_basic(
         self, mock_importer_class, runner, tmp_path, mock_gitlab_repos
     ):
@@ -390,7 +390,7 @@ class TestGitLabImportCommand:
         assert len(config["repositories"]) == 2
         assert config["repositories"][0]["name"] == "repo1"
 
-    @patch("terraform_ingest.cli.GitLabImporter")
+    @patch("terraform_ingest.importers.GitLabImporter")
     def test_gitlab_import_with_token(
         self, mock_importer_class, runner, tmp_path, mock_gitlab_repos
     ):
@@ -422,7 +422,7 @@ class TestGitLabImportCommand:
         call_kwargs = mock_importer_class.call_args[1]
         assert call_kwargs["token"] == "test-token"
 
-    @patch("terraform_ingest.cli.GitLabImporter")
+    @patch("terraform_ingest.importers.GitLabImporter")
     def test_gitlab_import_merge(
         self, mock_importer_class, runner, tmp_path, mock_gitlab_repos
     ):
@@ -477,7 +477,7 @@ class TestGitLabImportCommand:
         # Should have 3 repos: 1 existing + 2 new
         assert len(config["repositories"]) == 3
 
-    @patch("terraform_ingest.cli.GitLabImporter")
+    @patch("terraform_ingest.importers.GitLabImporter")
     def test_gitlab_import_replace(
         self, mock_importer_class, runner, tmp_path, mock_gitlab_repos
     ):
@@ -533,7 +533,7 @@ class TestGitLabImportCommand:
         assert len(config["repositories"]) == 2
         assert config["repositories"][0]["name"] == "repo1"
 
-    @patch("terraform_ingest.cli.GitLabImporter")
+    @patch("terraform_ingest.importers.GitLabImporter")
     def test_gitlab_import_with_options(
         self, mock_importer_class, runner, tmp_path, mock_gitlab_repos
     ):
@@ -576,7 +576,7 @@ class TestGitLabImportCommand:
         assert call_kwargs["recursive"] is True
         assert call_kwargs["gitlab_url"] == "https://gitlab.example.com"
 
-    @patch("terraform_ingest.cli.GitLabImporter")
+    @patch("terraform_ingest.importers.GitLabImporter")
     def test_gitlab_import_no_repos(self, mock_importer_class, runner, tmp_path):
         """Test GitLab import when no repositories are found."""
         config_file = tmp_path / "test-config.yaml"
@@ -611,7 +611,7 @@ class TestGitLabImportCommand:
         assert result.exit_code != 0
         assert "Missing option" in result.output or "Error" in result.output
 
-    @patch("terraform_ingest.cli.GitLabImporter")
+    @patch("terraform_ingest.importers.GitLabImporter")
     def test_gitlab_import_with_branches_and_tags(
         self, mock_importer_class, runner, tmp_path, mock_gitlab_repos
     ):
@@ -633,7 +633,7 @@ class TestGitLabImportCommand:
                 "--config",
                 str(config_file),
                 "--branches",
-                "main,develop,staging",
+                " main, develop,,staging ",
                 "--max-tags",
                 "5",
             ],
@@ -642,10 +642,21 @@ class TestGitLabImportCommand:
         assert result.exit_code == 0
         assert "Merged 2 repositories" in result.output
 
-        # Verify the config file has the correct branches and max_tags
-        with open(config_file, "r") as f:
-            config = yaml.safe_load(f)
-
-        assert len(config["repositories"]) == 2
-        assert config["repositories"][0]["branches"] == ["main", "develop", "staging"]
-        assert config["repositories"][0]["max_tags"] == 5
+        # Verify the importer applies the branches and max_tags to each repository
+        call_kwargs = mock_importer_class.call_args[1]
+        assert call_kwargs["branches"] == ["main", "develop", "staging"]
+        assert call_kwargs["max_tags"] == 5
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("", []),
+        (None, []),
+        ("main", ["main"]),
+        (" main , develop,,", ["main", "develop"]),
+    ],
+)
+def test_split_csv(value, expected):
+    """Test parsing of comma-separated option values."""
+    assert _split_csv(value) == expected
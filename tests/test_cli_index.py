@@ -0,0 +1,91 @@
+"""Tests for CLI index commands."""
+
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+from terraform_ingest.cli import cli, _get_indexer
+from terraform_ingest.indexer import ModuleIndexer
+from terraform_ingest.models import TerraformModuleSummary, TerraformProvider
+
+
+@pytest.fixture
+def runner():
+    """Create a Click CLI runner."""
+    return CliRunner()
+
+
+@pytest.fixture
+def indexed_output_dir(tmp_path):
+    """Create an output directory with one indexed module summary."""
+    summary = TerraformModuleSummary(
+        repository="https://github.com/test-org/terraform-aws-vpc",
+        ref="v1.0.0",
+        path=".",
+        description="AWS VPC module",
+        providers=[TerraformProvider(name="aws", source="hashicorp/aws")],
+        readme_content="\n".join(f"line {i}" for i in range(15)),
+    )
+    (tmp_path / "terraform-aws-vpc_v1.0.0.json").write_text(
+        json.dumps(summary.model_dump())
+    )
+
+    indexer = ModuleIndexer(str(tmp_path))
+    doc_id = indexer.add_module(summary)
+    indexer.save()
+    return tmp_path, doc_id
+
+
+class TestIndexCommands:
+    """Tests for index command group."""
+
+    def test_stats(self, runner, indexed_output_dir):
+        """Test showing index statistics."""
+        output_dir, _ = indexed_output_dir
+        result = runner.invoke(cli, ["index", "stats", "--output-dir", str(output_dir)])
+        assert result.exit_code == 0
+        assert "Total Modules: 1" in result.output
+
+    def test_lookup_json(self, runner, indexed_output_dir):
+        """Test looking up a module entry as JSON."""
+        output_dir, doc_id = indexed_output_dir
+        result = runner.invoke(
+            cli, ["index", "lookup", doc_id, "--output-dir", str(output_dir), "--json"]
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.output)["id"] == doc_id
+
+    def test_by_provider(self, runner, indexed_output_dir):
+        """Test listing modules for a provider."""
+        output_dir, doc_id = indexed_output_dir
+        result = runner.invoke(
+            cli, ["index", "by-provider", "aws", "--output-dir", str(output_dir)]
+        )
+        assert result.exit_code == 0
+        assert (
+            "  • https://github.com/test-org/terraform-aws-vpc (v1.0.0)\n"
+            "    Path: .\n"
+            f"    ID: {doc_id}\n"
+        ) in result.output
+
+    def test_get_truncates_readme_preview(self, runner, indexed_output_dir):
+        """Test that index get shows the first ten README lines."""
+        output_dir, doc_id = indexed_output_dir
+        result = runner.invoke(
+            cli, ["index", "get", doc_id, "--output-dir", str(output_dir)]
+        )
+        assert result.exit_code == 0
+        assert "  line 9\n  ...\n" in result.output
+        assert "line 10" not in result.output
+
+    def test_indexer_is_reused_until_index_changes(self, indexed_output_dir):
+        """Test that the parsed index is cached until the index file changes."""
+        output_dir, _ = indexed_output_dir
+        first = _get_indexer(str(output_dir))
+        assert _get_indexer(str(output_dir)) is first
+
+        index_path = output_dir / ModuleIndexer.DEFAULT_INDEX_FILENAME
+        mtime_ns = index_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(index_path, ns=(mtime_ns, mtime_ns))
+        assert _get_indexer(str(output_dir)) is not first
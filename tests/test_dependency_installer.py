@@ -5,11 +5,20 @@ import pytest
 from unittest.mock import patch, MagicMock
 from terraform_ingest.dependency_installer import (
     DependencyInstaller,
+    _installed_distributions,
     ensure_embeddings_available,
 )
 from terraform_ingest.models import EmbeddingConfig
 
 
+@pytest.fixture(autouse=True)
+def clear_verified_strategies():
+    """Start each test without strategies verified by earlier tests."""
+    DependencyInstaller._verified_strategies.clear()
+    yield
+    DependencyInstaller._verified_strategies.clear()
+
+
 class TestDependencyInstaller:
     """Test suite for DependencyInstaller class."""
 
@@ -25,6 +34,25 @@ class TestDependencyInstaller:
             is False
         )
 
+    def test_check_package_installed_normalizes_names(self):
+        """Test that distribution names match regardless of case or separator."""
+        assert DependencyInstaller.check_package_installed("PyYAML") is True
+        assert DependencyInstaller.check_package_installed("pyyaml") is True
+
+    def test_refresh_sys_path_clears_distribution_cache(self):
+        """Test that newly installed packages are seen after a refresh."""
+        _installed_distributions()
+        assert _installed_distributions.cache_info().currsize == 1
+        DependencyInstaller._verified_strategies.add("openai")
+
+        with patch("site.main") as mock_site_main:
+            DependencyInstaller._refresh_sys_path()
+
+        mock_site_main.assert_not_called()
+
+        assert _installed_distributions.cache_info().currsize == 0
+        assert not DependencyInstaller._verified_strategies
+
     def test_get_missing_packages_all_present(self):
         """Test getting missing packages when all are present."""
         # These packages should be installed in test environment
@@ -38,6 +66,18 @@ class TestDependencyInstaller:
         assert "fake_nonexistent_package_xyz" in missing
         assert "pytest" not in missing
 
+    def test_get_missing_packages_checks_only_unknown_names(self):
+        """Test that names found in the distribution scan skip the full check."""
+        with patch.object(
+            DependencyInstaller, "check_package_installed", return_value=False
+        ) as mock_check:
+            missing = DependencyInstaller.get_missing_packages(
+                ["pytest", "PyYAML", "fake_nonexistent_package_xyz"]
+            )
+
+        assert missing == ["fake_nonexistent_package_xyz"]
+        mock_check.assert_called_once_with("fake_nonexistent_package_xyz")
+
     def test_get_missing_packages_all_missing(self):
         """Test getting missing packages when none are installed."""
         packages = ["fake_package_1", "fake_package_2"]
@@ -53,8 +93,9 @@ class TestDependencyInstaller:
         assert "claude" in DependencyInstaller.STRATEGY_PACKAGES
         assert "chromadb-default" in DependencyInstaller.STRATEGY_PACKAGES
 
+    @patch("shutil.which", return_value="/usr/local/bin/uv")
     @patch("subprocess.run")
-    def test_install_packages_with_uv_system_flag_success(self, mock_run):
+    def test_install_packages_with_uv_system_flag_success(self, mock_run, mock_which):
         """Test successful installation with uv --system flag for tool installations."""
         # First call with --system succeeds
         mock_run.return_value = MagicMock(returncode=0)
@@ -74,8 +115,9 @@ class TestDependencyInstaller:
         assert "uv" in call_args[0][0]
         # assert "--system" in call_args[0][0]
 
+    @patch("shutil.which", return_value="/usr/local/bin/uv")
     @patch("subprocess.run")
-    def test_install_packages_with_uv_fallback_to_pip(self, mock_run):
+    def test_install_packages_with_uv_fallback_to_pip(self, mock_run, mock_which):
         """Test fallback to regular uv pip install when --system fails."""
         # First call with --system fails, second with regular uv pip install succeeds
         mock_run.side_effect = [
@@ -96,8 +138,9 @@ class TestDependencyInstaller:
         # Verify both approaches were tried
         assert mock_run.call_count >= 1
 
+    @patch("shutil.which", return_value="/usr/local/bin/uv")
     @patch("subprocess.run")
-    def test_install_packages_with_uv_success(self, mock_run):
+    def test_install_packages_with_uv_success(self, mock_run, mock_which):
         """Test successful installation with uv."""
         mock_run.return_value = MagicMock(returncode=0)
 
@@ -125,6 +168,26 @@ class TestDependencyInstaller:
 
         assert success is True
 
+    @patch("shutil.which", return_value=None)
+    @patch("subprocess.run")
+    def test_install_packages_skips_missing_executables(self, mock_run, mock_which):
+        """Test that uv/pip commands not on PATH are never spawned."""
+        mock_run.side_effect = subprocess.CalledProcessError(1, "pip")
+
+        with patch.object(
+            DependencyInstaller,
+            "get_missing_packages",
+            return_value=["sentence-transformers"],
+        ):
+            success = DependencyInstaller.install_packages(
+                ["sentence-transformers"], use_uv=True
+            )
+
+        assert success is False
+        # Only 'python -m pip' is attempted
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][1:4] == ["-m", "pip", "install"]
+
     def test_install_packages_already_installed(self):
         """Test that installation is skipped if packages are already installed."""
         with patch.object(DependencyInstaller, "get_missing_packages", return_value=[]):
@@ -175,6 +238,57 @@ class TestDependencyInstaller:
         )
         assert success is False
 
+    def test_ensure_all_installs_combined_packages_once(self):
+        """Test that several strategies are resolved with one install call."""
+        with (
+            patch.object(
+                DependencyInstaller,
+                "get_missing_packages",
+                return_value=["openai", "voyageai", "chromadb"],
+            ) as mock_missing,
+            patch.object(
+                DependencyInstaller, "install_packages", return_value=True
+            ) as mock_install,
+        ):
+            success = DependencyInstaller.ensure_all(["openai", "claude"])
+
+        assert success is True
+        mock_missing.assert_called_once_with(["openai", "chromadb", "voyageai"])
+        mock_install.assert_called_once()
+        assert mock_install.call_args[0][0] == ["openai", "voyageai", "chromadb"]
+
+    def test_ensure_all_unknown_strategy(self):
+        """Test that any unknown strategy fails the whole check."""
+        with patch.object(DependencyInstaller, "get_missing_packages") as mock_missing:
+            success = DependencyInstaller.ensure_all(["openai", "unknown-strategy"])
+
+        assert success is False
+        mock_missing.assert_not_called()
+
+    def test_ensure_all_skips_verified_strategies(self):
+        """Test that a verified strategy is not checked again."""
+        with patch.object(
+            DependencyInstaller, "get_missing_packages", return_value=[]
+        ) as mock_missing:
+            assert DependencyInstaller.ensure_embedding_packages(strategy="openai")
+            assert DependencyInstaller.ensure_embedding_packages(strategy="openai")
+            assert DependencyInstaller.ensure_all(["openai", "claude"])
+
+        assert mock_missing.call_count == 2
+        assert mock_missing.call_args[0][0] == ["voyageai", "chromadb"]
+
+    def test_ensure_all_does_not_verify_failed_install(self):
+        """Test that a failed install leaves the strategy unverified."""
+        with (
+            patch.object(
+                DependencyInstaller, "get_missing_packages", return_value=["openai"]
+            ),
+            patch.object(DependencyInstaller, "install_packages", return_value=False),
+        ):
+            assert DependencyInstaller.ensure_all(["openai"]) is False
+
+        assert "openai" not in DependencyInstaller._verified_strategies
+
     def test_ensure_embedding_packages_missing_no_auto_install(self):
         """Test missing packages with auto_install=False raises error in convenience function."""
         config = EmbeddingConfig(enabled=True, strategy="sentence-transformers")
@@ -1,8 +1,9 @@
 """Tests for vector database embeddings."""
 
+import asyncio
 import pytest
 import sys
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
 # Mock openai module if not installed to prevent import errors during test collection
 try:
@@ -27,16 +28,35 @@ from terraform_ingest.models import (
     TerraformModuleSummary,
     TerraformVariable,
     TerraformOutput,
+    TerraformModule,
     TerraformProvider,
 )
 from terraform_ingest.embeddings import (
+    COLLECTION_METADATA,
+    QUERY_INCLUDE,
+    EmbeddingCache,
     VectorDBManager,
     ChromaDBDefaultStrategy,
+    ClaudeEmbeddingStrategy,
     OpenAIEmbeddingStrategy,
     SentenceTransformersStrategy,
+    _openai_client,
+    _resolve_device,
+    _tiktoken_encoding,
+    _voyage_client,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_api_clients():
+    """Do not share API clients created from mocked modules between tests."""
+    _openai_client.cache_clear()
+    _voyage_client.cache_clear()
+    yield
+    _openai_client.cache_clear()
+    _voyage_client.cache_clear()
+
+
 def test_embedding_config_defaults():
     """Test EmbeddingConfig with default values."""
     config = EmbeddingConfig()
@@ -228,6 +248,29 @@ def test_prepare_document_text_full():
     assert "aws provider" in text
 
 
+def test_prepare_document_text_optional_fields():
+    """Test entries without descriptions or types and module sources."""
+    config = EmbeddingConfig(enabled=True, strategy="chromadb-default")
+    manager = VectorDBManager(config)
+    summary = TerraformModuleSummary(
+        repository="https://github.com/test/repo",
+        ref="main",
+        path=".",
+        variables=[
+            TerraformVariable(name="name"),
+            TerraformVariable(name="tags", type="map(string)"),
+        ],
+        outputs=[TerraformOutput(name="arn")],
+        modules=[TerraformModule(name="sg", source="./modules/sg")],
+    )
+
+    assert manager._prepare_document_text(summary) == (
+        "Variables: name, tags (type: map(string))\n\n"
+        "Outputs: arn\n\n"
+        "Resources: module: ./modules/sg"
+    )
+
+
 def test_prepare_document_text_partial():
     """Test document text preparation with selective content."""
     config = EmbeddingConfig(
@@ -359,9 +402,10 @@ def test_upsert_module_new_document(mock_chromadb_client):
     # Should return a valid ID
     assert len(doc_id) == 64
 
-    # Should call add (not update)
-    mock_collection.add.assert_called_once()
-    mock_collection.update.assert_not_called()
+    # Should write with a single upsert, without looking the document up
+    mock_collection.upsert.assert_called_once()
+    mock_collection.get.assert_not_called()
+    mock_collection.add.assert_not_called()
 
 
 @pytest.mark.skipif(not HAS_CHROMADB, reason="chromadb package not installed")
@@ -392,9 +436,10 @@ def test_upsert_module_update_existing(mock_chromadb_client):
     # Should return a valid ID
     assert len(doc_id) == 64
 
-    # Should call update (not add)
-    mock_collection.update.assert_called_once()
-    mock_collection.add.assert_not_called()
+    # Should replace the document with a single upsert
+    mock_collection.upsert.assert_called_once()
+    assert mock_collection.upsert.call_args.kwargs["ids"] == [doc_id]
+    mock_collection.update.assert_not_called()
 
 
 @pytest.mark.skipif(not HAS_CHROMADB, reason="chromadb package not installed")
@@ -511,3 +556,636 @@ def test_search_modules_disabled():
     results = manager.search_modules("test query")
 
     assert results == []
+
+
+def test_openai_embed_texts_single_request():
+    """Test that OpenAI embeds a small batch in one request with a reused client."""
+    mock_openai = MagicMock()
+    mock_client = mock_openai.OpenAI.return_value
+    mock_client.embeddings.create.return_value = Mock(
+        data=[Mock(embedding=[0.1]), Mock(embedding=[0.2])]
+    )
+
+    with patch.dict(sys.modules, {"openai": mock_openai}):
+        strategy = OpenAIEmbeddingStrategy(api_key="test-key")
+        embeddings = strategy.embed_texts(["first", "second"])
+        strategy.embed_texts(["third"])
+
+    assert embeddings == [[0.1], [0.2]]
+    mock_openai.OpenAI.assert_called_once_with(api_key="test-key")
+    mock_client.embeddings.create.assert_any_call(
+        model="text-embedding-3-small", input=["first", "second"]
+    )
+    assert strategy.embed_texts([]) == []
+
+
+def test_openai_embed_texts_splits_batches(monkeypatch):
+    """Test that OpenAI requests carry at most API_BATCH_SIZE texts."""
+    monkeypatch.setattr("terraform_ingest.embeddings.API_BATCH_SIZE", 2)
+    mock_openai = MagicMock()
+    mock_client = mock_openai.OpenAI.return_value
+    mock_client.embeddings.create.side_effect = lambda model, input: Mock(
+        data=[Mock(embedding=[float(len(text))]) for text in input]
+    )
+
+    with patch.dict(sys.modules, {"openai": mock_openai}):
+        strategy = OpenAIEmbeddingStrategy(api_key="test-key")
+        embeddings = strategy.embed_texts(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    assert embeddings == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert [
+        c.kwargs["input"] for c in mock_client.embeddings.create.call_args_list
+    ] == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+
+
+def test_voyage_embed_texts_splits_batches(monkeypatch):
+    """Test that Voyage AI requests carry at most API_BATCH_SIZE texts."""
+    monkeypatch.setattr("terraform_ingest.embeddings.API_BATCH_SIZE", 2)
+    mock_voyageai = MagicMock()
+    mock_client = mock_voyageai.Client.return_value
+    mock_client.embed.side_effect = lambda batch, model: Mock(
+        embeddings=[[float(len(text))] for text in batch]
+    )
+
+    with patch.dict(sys.modules, {"voyageai": mock_voyageai}):
+        strategy = ClaudeEmbeddingStrategy(api_key="key")
+        embeddings = strategy.embed_texts(["a", "bb", "ccc"])
+
+    assert embeddings == [[1.0], [2.0], [3.0]]
+    assert mock_client.embed.call_count == 2
+
+
+def test_existing_ids():
+    """Test looking up which document IDs the collection holds."""
+    config = EmbeddingConfig(enabled=True, strategy="chromadb-default")
+    manager = VectorDBManager(config)
+    manager.client = Mock()
+    manager.collection = Mock()
+    manager.collection.get.return_value = {"ids": ["a"]}
+
+    assert manager.existing_ids(["a", "b"]) == {"a"}
+    manager.collection.get.assert_called_once_with(ids=["a", "b"], include=[])
+    assert manager.existing_ids([]) == set()
+
+
+def test_upsert_modules_batches_writes(monkeypatch):
+    """Test that modules are upserted in chunks with ChromaDB embedding them."""
+    monkeypatch.setattr("terraform_ingest.embeddings.UPSERT_BATCH_SIZE", 2)
+    config = EmbeddingConfig(enabled=True, strategy="chromadb-default")
+    manager = VectorDBManager(config)
+    summaries = [
+        TerraformModuleSummary(
+            repository="https://github.com/test/repo", ref="main", path=path
+        )
+        for path in [".", "modules/a", "modules/b", "modules/a"]
+    ]
+    doc_ids = [manager._generate_document_id(s) for s in summaries]
+
+    manager.client = Mock()
+    manager.collection = Mock()
+
+    assert manager.upsert_modules(summaries) == doc_ids
+
+    calls = manager.collection.upsert.call_args_list
+    assert [call.kwargs["ids"] for call in calls] == [doc_ids[:2], doc_ids[2:]]
+    assert all(call.kwargs["embeddings"] is None for call in calls)
+    assert len(calls[0].kwargs["documents"]) == len(calls[0].kwargs["metadatas"])
+
+
+def test_upsert_modules_passes_strategy_embeddings(tmp_path):
+    """Test that sentence-transformers vectors are computed client-side."""
+    config = EmbeddingConfig(
+        enabled=True, strategy="sentence-transformers", chromadb_path=str(tmp_path)
+    )
+    manager = VectorDBManager(config)
+    manager.embedding_strategy = Mock()
+    manager.embedding_strategy.embed_texts.return_value = [[0.1], [0.2]]
+    manager.client = Mock()
+    manager.collection = Mock()
+    summaries = [
+        TerraformModuleSummary(
+            repository="https://github.com/test/repo",
+            ref="main",
+            path=path,
+            description=f"Module at {path}",
+        )
+        for path in [".", "modules/a"]
+    ]
+
+    manager.upsert_modules(summaries)
+
+    kwargs = manager.collection.upsert.call_args.kwargs
+    manager.embedding_strategy.embed_texts.assert_called_once_with(kwargs["documents"])
+    assert kwargs["embeddings"] == [[0.1], [0.2]]
+
+
+def test_search_modules_embeds_query_client_side():
+    """Test that queries are embedded with the strategy used for documents."""
+    config = EmbeddingConfig(enabled=True, strategy="sentence-transformers")
+    manager = VectorDBManager(config)
+    manager.embedding_strategy = Mock()
+    manager.embedding_strategy.embed_texts.return_value = [[0.5]]
+    manager.client = Mock()
+    manager.collection = Mock()
+    manager.collection.query.return_value = {"ids": [[]]}
+
+    assert manager.search_modules("vpc", n_results=3) == []
+    manager.collection.query.assert_called_once_with(
+        query_embeddings=[[0.5]], n_results=3, where=None, include=QUERY_INCLUDE
+    )
+
+
+def test_where_clause_keeps_supported_filters():
+    """Test that unsupported filter keys are dropped."""
+    assert VectorDBManager._where_clause(None) is None
+    assert VectorDBManager._where_clause({"name": "vpc"}) is None
+    assert VectorDBManager._where_clause({"provider": "aws", "name": "vpc"}) == {
+        "provider": "aws"
+    }
+
+
+def test_upsert_modules_empty_or_disabled():
+    """Test that nothing is written for an empty batch or disabled config."""
+    assert VectorDBManager(EmbeddingConfig(enabled=False)).upsert_modules([]) == []
+
+    manager = VectorDBManager(EmbeddingConfig(enabled=True))
+    manager.client = Mock()
+    manager.collection = Mock()
+    assert manager.upsert_modules([]) == []
+    manager.collection.get.assert_not_called()
+
+
+class _RateLimitError(Exception):
+    """Stand-in for the API clients' rate limit exception."""
+
+    status_code = 429
+
+
+def test_openai_aembed_texts_concurrent_batches(monkeypatch):
+    """Test async embedding splits batches, bounds concurrency and keeps order."""
+    monkeypatch.setattr("terraform_ingest.embeddings.API_BATCH_SIZE", 2)
+    monkeypatch.setattr("terraform_ingest.embeddings.RATE_LIMIT_BACKOFF", 0)
+
+    in_flight = 0
+    max_in_flight = 0
+    attempts = {}
+
+    async def create(model, input):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01 if input[0] == "t0" else 0)
+        in_flight -= 1
+        attempts[input[0]] = attempts.get(input[0], 0) + 1
+        if input[0] == "t2" and attempts["t2"] == 1:
+            raise _RateLimitError()
+        return Mock(data=[Mock(embedding=[int(t[1:])]) for t in input])
+
+    mock_openai = MagicMock()
+    mock_openai.AsyncOpenAI.return_value.embeddings.create = create
+    texts = [f"t{i}" for i in range(7)]
+
+    with patch.dict(sys.modules, {"openai": mock_openai}):
+        strategy = OpenAIEmbeddingStrategy(api_key="key", max_concurrent_batches=2)
+        embeddings = asyncio.run(strategy.aembed_texts(texts))
+
+    assert embeddings == [[i] for i in range(7)]
+    assert max_in_flight == 2
+    assert attempts["t2"] == 2
+
+
+def test_aembed_texts_raises_other_errors_without_retry():
+    """Test that errors other than rate limits are not retried."""
+    calls = []
+
+    async def embed(texts, model):
+        calls.append(texts)
+        raise ValueError("bad request")
+
+    mock_voyageai = MagicMock()
+    mock_voyageai.AsyncClient.return_value.embed = embed
+
+    with patch.dict(sys.modules, {"voyageai": mock_voyageai}):
+        strategy = ClaudeEmbeddingStrategy(api_key="key")
+        with pytest.raises(ValueError):
+            asyncio.run(strategy.aembed_texts(["a"]))
+
+    assert len(calls) == 1
+
+
+def test_default_aembed_texts_uses_embed_texts():
+    """Test the default async path delegates to embed_texts."""
+    assert asyncio.run(ChromaDBDefaultStrategy().aembed_texts(["a", "b"])) == [[], []]
+
+
+def test_sentence_transformers_embed_texts_single_encode():
+    """Test that sentence-transformers encodes a batch in one call."""
+    strategy = SentenceTransformersStrategy()
+    strategy._model = Mock()
+    strategy._model.encode.return_value = Mock(tolist=lambda: [[0.1], [0.2]])
+
+    assert strategy.embed_texts(["a", "bb"]) == [[0.1], [0.2]]
+    strategy._model.encode.assert_called_once_with(
+        ["a", "bb"], batch_size=64, convert_to_numpy=True, normalize_embeddings=True
+    )
+    assert strategy.embed_texts([]) == []
+
+
+def test_sentence_transformers_embed_texts_buckets_by_length():
+    """Test that texts of different lengths are encoded in separate batches."""
+
+    def encode(batch, **kwargs):
+        vectors = [[float(len(text.split()))] for text in batch]
+        return Mock(tolist=lambda: vectors)
+
+    strategy = SentenceTransformersStrategy()
+    strategy._model = Mock()
+    strategy._model.encode.side_effect = encode
+    texts = ["short", " ".join(["word"] * 100), "also short", "w " * 600]
+
+    assert strategy.embed_texts(texts) == [[1.0], [100.0], [2.0], [600.0]]
+    batches = [call.args[0] for call in strategy._model.encode.call_args_list]
+    assert batches == [["short", "also short"], [texts[1]], [texts[3]]]
+
+
+@pytest.mark.parametrize(
+    "device,fp16,expected_device,half",
+    [
+        ("cuda", True, "cuda", True),
+        ("cuda", False, "cuda", False),
+        ("cpu", True, "cpu", False),
+    ],
+)
+def test_sentence_transformers_device_and_precision(
+    device, fp16, expected_device, half
+):
+    """Test that the model is placed on the device and halved only on GPU."""
+    mock_module = MagicMock()
+    strategy = SentenceTransformersStrategy(device=device, fp16=fp16)
+
+    with patch.dict(sys.modules, {"sentence_transformers": mock_module}):
+        strategy._load_model()
+
+    mock_module.SentenceTransformer.assert_called_once_with(
+        "all-MiniLM-L6-v2", device=expected_device
+    )
+    assert mock_module.SentenceTransformer.return_value.half.called is half
+
+
+@pytest.mark.parametrize(
+    "device,onnx_file,expected_kwargs",
+    [
+        ("cpu", None, {"provider": "CPUExecutionProvider"}),
+        (
+            "cpu",
+            "onnx/model_qint8_avx512.onnx",
+            {
+                "provider": "CPUExecutionProvider",
+                "file_name": "onnx/model_qint8_avx512.onnx",
+            },
+        ),
+        ("cuda", None, {"provider": "CUDAExecutionProvider"}),
+    ],
+)
+def test_sentence_transformers_onnx_backend(device, onnx_file, expected_kwargs):
+    """Test that the onnx backend loads through ONNX Runtime without halving."""
+    mock_module = MagicMock()
+    strategy = SentenceTransformersStrategy(
+        device=device, backend="onnx", onnx_file=onnx_file
+    )
+
+    with patch.dict(sys.modules, {"sentence_transformers": mock_module}):
+        strategy._load_model()
+
+    mock_module.SentenceTransformer.assert_called_once_with(
+        "all-MiniLM-L6-v2",
+        device=device,
+        backend="onnx",
+        model_kwargs=expected_kwargs,
+    )
+    assert not mock_module.SentenceTransformer.return_value.half.called
+
+
+def test_resolve_device_auto_without_gpu():
+    """Test that 'auto' falls back to the CPU without a GPU."""
+    mock_torch = MagicMock()
+    mock_torch.cuda.is_available.return_value = False
+    mock_torch.backends.mps.is_available.return_value = False
+
+    with patch.dict(sys.modules, {"torch": mock_torch}):
+        assert _resolve_device("auto") == "cpu"
+        mock_torch.cuda.is_available.return_value = True
+        assert _resolve_device("auto") == "cuda"
+    assert _resolve_device("cuda:1") == "cuda:1"
+
+
+class TestEmbeddingCache:
+    """Tests for the on-disk embedding cache."""
+
+    def test_embeds_only_misses(self, tmp_path):
+        """Test that cached texts are not embedded again, even across instances."""
+        path = tmp_path / "cache" / "emb_cache.sqlite"
+        embed = Mock(side_effect=lambda texts: [[float(len(t)), 0.5] for t in texts])
+
+        first = EmbeddingCache(path, namespace="openai|model")
+        assert first.embed(["a", "bb", "a"], embed) == [[1.0, 0.5], [2.0, 0.5]] + [
+            [1.0, 0.5]
+        ]
+        embed.assert_called_once_with(["a", "bb"])
+
+        second = EmbeddingCache(path, namespace="openai|model")
+        assert second.embed(["bb", "ccc"], embed) == [[2.0, 0.5], [3.0, 0.5]]
+        embed.assert_called_with(["ccc"])
+
+    def test_namespace_separates_models(self, tmp_path):
+        """Test that vectors are not shared between models."""
+        path = tmp_path / "emb_cache.sqlite"
+        EmbeddingCache(path, namespace="openai|a").embed(["x"], lambda t: [[1.0]])
+
+        embed = Mock(return_value=[[2.0]])
+        assert EmbeddingCache(path, namespace="openai|b").embed(["x"], embed) == [[2.0]]
+        embed.assert_called_once()
+
+    def test_unusable_database_falls_back_to_embedding(self, tmp_path):
+        """Test that a broken cache file does not prevent embedding."""
+        path = tmp_path / "emb_cache.sqlite"
+        path.write_text("not a database")
+
+        cache = EmbeddingCache(path, namespace="openai|model")
+        assert cache.embed(["x"], lambda texts: [[1.0]]) == [[1.0]]
+
+
+class TestQueryCache:
+    """Tests for the search result cache."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a manager whose query embeddings are controlled by the test."""
+        pytest.importorskip("numpy")
+        config = EmbeddingConfig(
+            enabled=True,
+            strategy="sentence-transformers",
+            chromadb_path=str(tmp_path),
+            query_cache_size=512,
+        )
+        manager = VectorDBManager(config)
+        manager.embedding_strategy = Mock()
+        manager.client = Mock()
+        manager.collection = Mock()
+        manager.collection.query.return_value = {
+            "ids": [["id1"]],
+            "documents": [["doc1"]],
+            "metadatas": [[{"provider": "aws"}]],
+            "distances": [[0.1]],
+        }
+        return manager
+
+    def test_similar_query_reuses_results(self, manager):
+        """Test that a near-identical query embedding skips the collection."""
+        manager.embedding_strategy.embed_texts.side_effect = [
+            [[1.0, 0.0]],
+            [[0.99, 0.01]],
+            [[0.0, 1.0]],
+        ]
+
+        first = manager.search_modules("aws vpc module")
+        first[0]["metadata"]["provider"] = "changed"
+        second = manager.search_modules("vpc module for aws")
+        manager.search_modules("unrelated")
+
+        assert second[0]["metadata"]["provider"] == "aws"
+        assert manager.collection.query.call_count == 2
+
+    def test_identical_query_skips_embedding(self, manager):
+        """Test that repeating a query reuses results without embedding it."""
+        manager.embedding_strategy.embed_texts.return_value = [[1.0, 0.0]]
+
+        manager.search_modules("vpc", n_results=5)
+        manager.search_modules("vpc", n_results=5)
+        manager.search_modules("vpc", n_results=3)
+
+        assert manager.embedding_strategy.embed_texts.call_count == 2
+        assert manager.collection.query.call_count == 2
+
+    def test_writes_clear_cache(self, manager):
+        """Test that modifying the collection invalidates cached searches."""
+        manager.embedding_strategy.embed_texts.return_value = [[1.0, 0.0]]
+        manager.search_modules("vpc")
+
+        manager.delete_module(
+            TerraformModuleSummary(repository="https://x/repo", ref="main", path=".")
+        )
+        manager.search_modules("vpc")
+
+        assert manager.collection.query.call_count == 2
+
+    def test_clear_query_cache(self, manager):
+        """Test that clearing the cache makes the next search query again."""
+        manager.embedding_strategy.embed_texts.return_value = [[1.0, 0.0]]
+        manager.search_modules("vpc")
+
+        manager.clear_query_cache()
+        manager.search_modules("vpc")
+
+        assert manager.collection.query.call_count == 2
+
+    def test_cache_disabled_by_default(self, manager):
+        """Test that searches are not cached unless configured."""
+        manager.config = EmbeddingConfig(enabled=True, strategy="sentence-transformers")
+        manager.embedding_strategy.embed_texts.return_value = [[1.0, 0.0]]
+
+        manager.search_modules("vpc")
+        manager.search_modules("vpc")
+
+        assert manager.collection.query.call_count == 2
+
+
+class TestUpsertStream:
+    """Tests for the pipelined upsert."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a manager with a mocked strategy and collection."""
+        config = EmbeddingConfig(
+            enabled=True, strategy="sentence-transformers", chromadb_path=str(tmp_path)
+        )
+        manager = VectorDBManager(config)
+        manager.embedding_strategy = Mock()
+        manager.embedding_strategy.embed_texts.side_effect = lambda docs: [
+            [float(len(doc))] for doc in docs
+        ]
+        manager.client = Mock()
+        manager.collection = Mock()
+        return manager
+
+    @staticmethod
+    def summaries(count):
+        """Generate distinct module summaries."""
+        for i in range(count):
+            yield TerraformModuleSummary(
+                repository="https://github.com/test/repo",
+                ref="main",
+                path=f"modules/m{i}",
+                description="x" * i,
+            )
+
+    def test_streams_generator_in_order(self, manager):
+        """Test every batch is embedded and written in input order."""
+        doc_ids = manager.upsert_stream(self.summaries(5), batch_size=2)
+
+        expected = [manager._generate_document_id(s) for s in self.summaries(5)]
+        assert doc_ids == expected
+        calls = manager.collection.upsert.call_args_list
+        assert [c.kwargs["ids"] for c in calls] == [
+            expected[:2],
+            expected[2:4],
+            expected[4:],
+        ]
+        for call in calls:
+            documents = call.kwargs["documents"]
+            assert call.kwargs["embeddings"] == [[float(len(d))] for d in documents]
+
+        # Every module written by one call is stamped with the same time
+        timestamps = {
+            metadata["last_updated"]
+            for call in calls
+            for metadata in call.kwargs["metadatas"]
+        }
+        assert len(timestamps) == 1
+
+    def test_propagates_stage_errors(self, manager):
+        """Test a failure in a worker stage is raised to the caller."""
+        manager.collection.upsert.side_effect = RuntimeError("write failed")
+
+        with pytest.raises(RuntimeError, match="write failed"):
+            manager.upsert_stream(self.summaries(5), batch_size=2)
+
+
+def test_api_clients_shared_and_required():
+    """Test strategies share a client per key and fail early without the package."""
+    mock_openai = MagicMock()
+    with patch.dict(sys.modules, {"openai": mock_openai}):
+        first = OpenAIEmbeddingStrategy(api_key="key")
+        second = OpenAIEmbeddingStrategy(api_key="key", model="other")
+    assert first._client is second._client
+    mock_openai.OpenAI.assert_called_once_with(api_key="key")
+
+    with patch.dict(sys.modules, {"voyageai": None}):
+        with pytest.raises(ImportError, match="pip install voyageai"):
+            ClaudeEmbeddingStrategy(api_key="key")
+
+
+class TestAsyncRemote:
+    """Tests for the AsyncHttpClient code paths."""
+
+    @pytest.fixture
+    def remote(self):
+        """Create a manager for a remote server with a mocked async client."""
+        collection = Mock()
+        collection.upsert = AsyncMock()
+        collection.query = AsyncMock(
+            return_value={
+                "ids": [["id1"]],
+                "documents": [["doc1"]],
+                "metadatas": [[{"provider": "aws"}]],
+                "distances": [[0.1]],
+            }
+        )
+        client = Mock()
+        client.get_or_create_collection = AsyncMock(return_value=collection)
+        mock_chromadb = MagicMock()
+        mock_chromadb.AsyncHttpClient = AsyncMock(return_value=client)
+
+        config = EmbeddingConfig(
+            enabled=True, strategy="chromadb-default", chromadb_host="chroma.local"
+        )
+        with patch.dict(sys.modules, {"chromadb": mock_chromadb}):
+            yield VectorDBManager(config), mock_chromadb, collection
+
+    def test_aupsert_modules_batches_concurrently(self, remote, monkeypatch):
+        """Test batches are upserted through the async client."""
+        monkeypatch.setattr("terraform_ingest.embeddings.UPSERT_BATCH_SIZE", 2)
+        manager, mock_chromadb, collection = remote
+        summaries = [
+            TerraformModuleSummary(
+                repository="https://github.com/test/repo", ref="main", path=path
+            )
+            for path in ["a", "b", "c", "a"]
+        ]
+
+        doc_ids = asyncio.run(manager.aupsert_modules(summaries))
+
+        assert doc_ids == [manager._generate_document_id(s) for s in summaries]
+        written = [c.kwargs["ids"] for c in collection.upsert.await_args_list]
+        assert sorted(sum(written, [])) == sorted(set(doc_ids))
+        mock_chromadb.AsyncHttpClient.assert_awaited_once_with(
+            host="chroma.local", port=8000
+        )
+
+    def test_asearch_modules(self, remote):
+        """Test searching through the async client reuses the collection."""
+        manager, mock_chromadb, collection = remote
+
+        asyncio.run(manager.asearch_modules("vpc"))
+        results = asyncio.run(manager.asearch_modules("vpc", {"provider": "aws"}, 3))
+
+        assert results[0]["id"] == "id1"
+        collection.query.assert_awaited_with(
+            query_texts=["vpc"],
+            n_results=3,
+            where={"provider": "aws"},
+            include=QUERY_INCLUDE,
+        )
+        mock_chromadb.AsyncHttpClient.assert_awaited_once()
+
+    def test_async_collection_uses_cosine_space(self, remote):
+        """Test the collection is created with the cosine HNSW settings."""
+        manager, mock_chromadb, _ = remote
+
+        asyncio.run(manager._get_async_collection())
+
+        client = mock_chromadb.AsyncHttpClient.return_value
+        client.get_or_create_collection.assert_awaited_once_with(
+            name="terraform_modules", metadata=COLLECTION_METADATA
+        )
+        assert COLLECTION_METADATA["hnsw:space"] == "cosine"
+
+
+class TestOpenAITruncation:
+    """Tests for OpenAI input truncation."""
+
+    @pytest.fixture
+    def strategy(self, monkeypatch):
+        """Create an OpenAI strategy with a small token limit."""
+        _tiktoken_encoding.cache_clear()
+        monkeypatch.setattr(OpenAIEmbeddingStrategy, "MAX_INPUT_TOKENS", 4)
+        with patch.dict(sys.modules, {"openai": MagicMock()}):
+            yield OpenAIEmbeddingStrategy(api_key="key")
+        _tiktoken_encoding.cache_clear()
+
+    def test_truncates_on_token_count(self, strategy):
+        """Test text is cut at the token limit using tiktoken."""
+        encoding = Mock()
+        encoding.encode.side_effect = lambda text: text.split()
+        encoding.decode.side_effect = lambda tokens: " ".join(tokens)
+        mock_tiktoken = MagicMock()
+        mock_tiktoken.encoding_for_model.return_value = encoding
+
+        with patch.dict(sys.modules, {"tiktoken": mock_tiktoken}):
+            assert strategy.truncate("one two three") == "one two three"
+            assert strategy.truncate("a b c d e f") == "a b c d"
+
+    def test_character_fallback_without_tiktoken(self, strategy):
+        """Test text is capped by characters when tiktoken is missing."""
+        with patch.dict(sys.modules, {"tiktoken": None}):
+            assert strategy.truncate("abcdefghijkl") == "abcdefgh"
+
+    def test_embed_texts_sends_truncated_input(self, strategy):
+        """Test API requests carry the truncated texts."""
+        strategy._client.embeddings.create.return_value = Mock(
+            data=[Mock(embedding=[0.1])]
+        )
+        with patch.dict(sys.modules, {"tiktoken": None}):
+            strategy.embed_texts(["x" * 20])
+
+        assert strategy._client.embeddings.create.call_args.kwargs["input"] == ["x" * 8]
@@ -1,17 +1,35 @@
 """Tests for repository importers."""
 
+import json
+
 import pytest
+import requests
 import yaml
 from unittest.mock import Mock, patch
 from terraform_ingest.importers import (
+    RATE_LIMIT_RETRIES,
+    REQUEST_TIMEOUT,
+    SEARCH_MAX_PAGES,
+    TERRAFORM_CACHE_FILE,
     GitHubImporter,
     GitLabImporter,
+    ImporterCache,
+    PendingConfigUpdates,
+    _RateLimiter,
+    _response_json,
     merge_repositories,
     update_config_file,
 )
 from terraform_ingest.models import RepositoryConfig
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep the Terraform check cache out of the user's cache directory."""
+    monkeypatch.setenv("TERRAFORM_INGEST_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
 @pytest.fixture
 def mock_github_response():
     """Mock GitHub API response for repositories."""
@@ -72,23 +90,306 @@ class TestGitHubImporter:
 
         assert importer.org == "test-org"
         assert importer.token is None
-        assert importer.headers == {}
+        assert "Authorization" not in importer.headers
+        assert importer.headers["Accept"] == "application/vnd.github+json"
 
     def test_get_provider_name(self):
         """Test get_provider_name method."""
         importer = GitHubImporter(org="test-org")
         assert importer.get_provider_name() == "github"
 
-    @patch("terraform_ingest.importers.requests.get")
+    def test_session_reused_with_auth_headers(self):
+        """Test that one session carries the auth headers and retries."""
+        with GitHubImporter(org="test-org", token="test-token") as importer:
+            session = importer._session
+            assert session.headers["Authorization"] == "token test-token"
+            assert session.headers["X-GitHub-Api-Version"] == "2022-11-28"
+            retries = session.get_adapter("https://api.github.com").max_retries
+            assert 503 in retries.status_forcelist
+            # Rate limits are handled by _request, not the adapter
+            assert 429 not in retries.status_forcelist
+
+        with patch.object(session, "close") as mock_close:
+            importer.close()
+        mock_close.assert_called_once()
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_requests_use_timeout(self, mock_get):
+        """Test that API requests are sent with a timeout."""
+        mock_get.return_value = Mock(status_code=200, headers={})
+        mock_get.return_value.content = json.dumps([]).encode()
+
+        GitHubImporter(org="test-org").fetch_repositories()
+
+        assert mock_get.call_args.kwargs["timeout"] == REQUEST_TIMEOUT
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_repositories_follows_next_links(self, mock_get):
+        """Test that pagination stops when no next page is announced."""
+        next_url = "https://api.github.com/organizations/1/repos?page=2"
+
+        def get_page(url, params, timeout, headers=None):
+            page = params["page"]
+            response = Mock(status_code=200, headers={})
+            response.links = {"next": {"url": next_url}} if page == 1 else {}
+            response.content = json.dumps(
+                [
+                    {
+                        "name": f"repo-{page}",
+                        "clone_url": f"https://github.com/test-org/repo-{page}.git",
+                    }
+                ]
+            ).encode()
+            return response
+
+        mock_get.side_effect = get_page
+
+        repos = GitHubImporter(org="test-org").fetch_repositories()
+
+        assert [repo.name for repo in repos] == ["repo-1", "repo-2"]
+        assert mock_get.call_count == 2
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_repositories_concurrent_pages(self, mock_get):
+        """Test that pages after the first are fetched up to the Link last page."""
+        last = "https://api.github.com/organizations/1/repos?per_page=100&page=3"
+
+        def get_page(url, params, timeout, headers=None):
+            page = params["page"]
+            response = Mock(status_code=200, headers={})
+            response.links = {"last": {"url": last}} if page == 1 else {}
+            response.content = json.dumps(
+                [
+                    {
+                        "name": f"repo-{page}",
+                        "clone_url": f"https://github.com/test-org/repo-{page}.git",
+                    }
+                ]
+            ).encode()
+            return response
+
+        mock_get.side_effect = get_page
+
+        repos = GitHubImporter(org="test-org").fetch_repositories()
+
+        assert [repo.name for repo in repos] == ["repo-1", "repo-2", "repo-3"]
+        assert mock_get.call_count == 3
+
+    def test_repository_config_matches_validated_model(self):
+        """Test that unvalidated entries equal validated ones."""
+        importer = GitHubImporter(org="test-org", branches=["main"], max_tags=3)
+        url = "https://github.com/test-org/repo.git"
+
+        config = importer._repository_config("repo", url)
+
+        assert config == RepositoryConfig(
+            name="repo", url=url, branches=["main"], max_tags=3, path="./src"
+        )
+        assert config.branches is not importer.branches
+
+    def test_repository_pages_keep_used_fields(self, mock_github_response):
+        """Test that REST listings are reduced to the fields the importer uses."""
+        importer = GitHubImporter(org="test-org")
+
+        with patch.object(
+            importer, "_fetch_pages", return_value=[mock_github_response]
+        ):
+            (repos,) = importer._repository_pages()
+
+        assert repos[0] == {
+            "name": "terraform-aws-vpc",
+            "full_name": "test-org/terraform-aws-vpc",
+            "clone_url": "https://github.com/test-org/terraform-aws-vpc.git",
+            "archived": False,
+        }
+
+    def test_fetch_repositories_filters_terraform_concurrently(
+        self, mock_github_response
+    ):
+        """Test that non-archived repos are checked and kept in order."""
+        importer = GitHubImporter(org="test-org", terraform_only=True)
+        checked = []
+
+        def has_terraform_files(repo):
+            checked.append(repo["name"])
+            return repo["name"] != "terraform-aws-vpc"
+
+        with (
+            patch.object(importer, "_fetch_pages", return_value=[mock_github_response]),
+            patch.object(
+                importer, "_search_terraform_repos", return_value=(set(), False)
+            ),
+            patch.object(
+                importer, "_has_terraform_files", side_effect=has_terraform_files
+            ),
+        ):
+            repos = importer.fetch_repositories()
+
+        assert sorted(checked) == ["terraform-aws-ec2", "terraform-aws-vpc"]
+        assert [repo.name for repo in repos] == ["terraform-aws-ec2"]
+
+    @patch("terraform_ingest.importers.requests.Session.post")
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_repositories_graphql(self, mock_get, mock_post):
+        """Test that a token lists repositories and .tf files through GraphQL."""
+
+        def node(name, entries, archived=False):
+            return {
+                "name": name,
+                "nameWithOwner": f"test-org/{name}",
+                "url": f"https://github.com/test-org/{name}",
+                "isArchived": archived,
+                "pushedAt": "2024-01-01T00:00:00Z",
+                "object": {"entries": entries},
+            }
+
+        pages = [
+            (
+                [node("vpc", [{"name": "main.tf", "type": "blob"}])],
+                {"hasNextPage": True, "endCursor": "c1"},
+            ),
+            (
+                [node("old", [], archived=True)],
+                {"hasNextPage": False, "endCursor": None},
+            ),
+        ]
+        responses = []
+        for nodes, page_info in pages:
+            response = Mock(status_code=200, headers={})
+            response.content = json.dumps(
+                {
+                    "data": {
+                        "organization": {
+                            "repositories": {"nodes": nodes, "pageInfo": page_info}
+                        }
+                    }
+                }
+            ).encode()
+            responses.append(response)
+        mock_post.side_effect = responses
+        mock_get.return_value = Mock(status_code=200, headers={})
+        mock_get.return_value.content = json.dumps({"total_count": 0}).encode()
+
+        importer = GitHubImporter(
+            org="test-org", token="test-token", terraform_only=True, base_path="./src"
+        )
+        repos = importer.fetch_repositories()
+
+        assert [repo.url for repo in repos] == ["https://github.com/test-org/vpc.git"]
+        variables = [c.kwargs["json"]["variables"] for c in mock_post.call_args_list]
+        assert [v["cursor"] for v in variables] == [None, "c1"]
+        assert variables[0]["tree"] == "HEAD:src"
+        assert variables[0]["privacy"] == "PUBLIC"
+        # Only the org-wide code search; vpc was resolved by the GraphQL tree
+        assert mock_get.call_count == 1
+
+    @pytest.mark.parametrize(
+        "base_path, tree",
+        [
+            ("./.terraform/modules/", "HEAD:.terraform/modules"),
+            (".modules", "HEAD:.modules"),
+            ("/src", "HEAD:src"),
+            (".", "HEAD:"),
+            ("./", "HEAD:"),
+        ],
+    )
+    @patch("terraform_ingest.importers.requests.Session.post")
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_repositories_graphql_tree_path(
+        self, mock_get, mock_post, base_path, tree
+    ):
+        """Test that only the ./ prefix and slashes are dropped from base_path."""
+        mock_post.return_value = Mock(status_code=200, headers={})
+        mock_post.return_value.content = json.dumps(
+            {
+                "data": {
+                    "organization": {
+                        "repositories": {
+                            "nodes": [],
+                            "pageInfo": {"hasNextPage": False, "endCursor": None},
+                        }
+                    }
+                }
+            }
+        ).encode()
+        mock_get.return_value = Mock(status_code=200, headers={})
+        mock_get.return_value.content = json.dumps({"total_count": 0}).encode()
+
+        importer = GitHubImporter(
+            org="test-org", token="test-token", terraform_only=True, base_path=base_path
+        )
+        importer.fetch_repositories()
+
+        assert mock_post.call_args.kwargs["json"]["variables"]["tree"] == tree
+
+    @patch("terraform_ingest.importers.requests.Session.post")
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_repositories_graphql_falls_back_to_rest(
+        self, mock_get, mock_post, mock_github_response
+    ):
+        """Test that a failing GraphQL query falls back to the REST listing."""
+        mock_post.return_value = Mock(status_code=200, headers={})
+        mock_post.return_value.content = json.dumps(
+            {"errors": [{"message": "Resource not accessible by integration"}]}
+        ).encode()
+        mock_get.return_value = Mock(status_code=200, headers={}, links={})
+        mock_get.return_value.content = json.dumps(mock_github_response).encode()
+
+        importer = GitHubImporter(org="test-org", token="test-token")
+        repos = importer.fetch_repositories()
+
+        assert len(repos) == 2
+        assert "/orgs/test-org/repos" in mock_get.call_args.args[0]
+
+    @pytest.mark.parametrize(
+        "total_count,complete,per_repo_searches",
+        [(1, True, 0), (5000, False, 1)],
+    )
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_repositories_bulk_terraform_search(
+        self, mock_get, mock_github_response, total_count, complete, per_repo_searches
+    ):
+        """Test that one org-wide search decides the Terraform filter."""
+
+        def get(url, params, timeout, headers=None):
+            response = Mock(status_code=200, headers={}, links={})
+            if "search" not in url:
+                page = mock_github_response if params["page"] == 1 else []
+                response.content = json.dumps(page).encode()
+            elif params["q"].endswith("org:test-org"):
+                response.content = json.dumps(
+                    {
+                        "total_count": total_count,
+                        "incomplete_results": False,
+                        "items": [
+                            {"repository": {"full_name": "test-org/terraform-aws-vpc"}}
+                        ],
+                    }
+                ).encode()
+            else:
+                response.content = json.dumps({"total_count": 0}).encode()
+            return response
+
+        mock_get.side_effect = get
+
+        importer = GitHubImporter(org="test-org", terraform_only=True)
+        repos = importer.fetch_repositories()
+
+        assert [repo.name for repo in repos] == ["terraform-aws-vpc"]
+        assert importer._terraform_repos_complete is complete
+        searches = [c for c in mock_get.call_args_list if "search" in c.args[0]]
+        org_searches = 1 if complete else SEARCH_MAX_PAGES
+        assert len(searches) == org_searches + per_repo_searches
+
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_fetch_repositories(self, mock_get, mock_github_response):
         """Test fetching repositories from GitHub."""
         # Mock the API response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.side_effect = [
-            mock_github_response,  # First page
-            [],  # Second page (empty to stop pagination)
-        ]
+        mock_response.links = {}
+        mock_response.headers = {}
+        mock_response.content = json.dumps(mock_github_response).encode()
         mock_get.return_value = mock_response
 
         importer = GitHubImporter(org="test-org", terraform_only=False)
@@ -101,7 +402,27 @@ class TestGitHubImporter:
         assert repos[0].url == "https://github.com/test-org/terraform-aws-vpc.git"
         assert repos[1].name == "terraform-aws-ec2"
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_repositories_applies_max_tags_and_branches(
+        self, mock_get, mock_github_response
+    ):
+        """Test that configured max_tags and branches are set on each repository."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.links = {}
+        mock_response.headers = {}
+        mock_response.content = json.dumps(mock_github_response).encode()
+        mock_get.return_value = mock_response
+
+        importer = GitHubImporter(
+            org="test-org", max_tags=5, branches=["main", "develop"]
+        )
+        repos = importer.fetch_repositories()
+
+        assert all(repo.max_tags == 5 for repo in repos)
+        assert all(repo.branches == ["main", "develop"] for repo in repos)
+
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_fetch_repositories_with_error(self, mock_get):
         """Test error handling when fetching repositories."""
         mock_get.side_effect = Exception("Network error")
@@ -111,12 +432,12 @@ class TestGitHubImporter:
         with pytest.raises(Exception):
             importer.fetch_repositories()
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_has_terraform_files_found(self, mock_get):
         """Test _has_terraform_files when Terraform files are found."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"total_count": 5}
+        mock_response.content = json.dumps({"total_count": 5}).encode()
         mock_get.return_value = mock_response
 
         importer = GitHubImporter(org="test-org")
@@ -124,12 +445,12 @@ class TestGitHubImporter:
 
         assert importer._has_terraform_files(repo) is True
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_has_terraform_files_not_found(self, mock_get):
         """Test _has_terraform_files when no Terraform files are found."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"total_count": 0}
+        mock_response.content = json.dumps({"total_count": 0}).encode()
         mock_get.return_value = mock_response
 
         importer = GitHubImporter(org="test-org")
@@ -137,7 +458,7 @@ class TestGitHubImporter:
 
         assert importer._has_terraform_files(repo) is False
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_has_terraform_files_rate_limited(self, mock_get):
         """Test _has_terraform_files when rate limited."""
         mock_response = Mock()
@@ -151,8 +472,65 @@ class TestGitHubImporter:
         importer = GitHubImporter(org="test-org")
         repo = {"full_name": "test-org/some-repo"}
 
-        # Should return True by default when rate limited
-        assert importer._has_terraform_files(repo) is True
+        # Should retry with backoff, then return True by default
+        with patch("terraform_ingest.importers.time.sleep") as mock_sleep:
+            assert importer._has_terraform_files(repo) is True
+
+        assert mock_get.call_count == RATE_LIMIT_RETRIES + 1
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2, 4]
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_request_retries_after_rate_limit(self, mock_get):
+        """Test that a rate limited request is retried after Retry-After."""
+        limited = Mock(status_code=429, headers={"Retry-After": "3"})
+        ok = Mock(status_code=200, headers={})
+        mock_get.side_effect = [limited, ok]
+
+        importer = GitHubImporter(org="test-org")
+        with patch("terraform_ingest.importers.time.sleep") as mock_sleep:
+            assert importer._request("https://api.github.com/x", {}) is ok
+
+        mock_sleep.assert_called_once_with(3)
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_forbidden_retried_only_when_enabled(self, mock_get):
+        """Test that plain 403 responses are retried only with retry_forbidden."""
+        mock_get.return_value = Mock(status_code=403, headers={})
+
+        with patch("terraform_ingest.importers.time.sleep"):
+            GitHubImporter(org="test-org")._request("https://api.github.com/x", {})
+            assert mock_get.call_count == 1
+
+            importer = GitHubImporter(org="test-org", retry_forbidden=True)
+            importer._request("https://api.github.com/x", {})
+            assert mock_get.call_count == 2 + RATE_LIMIT_RETRIES
+
+    def test_response_json_invalid_body(self):
+        """Test that invalid JSON raises the requests decode error."""
+        assert _response_json(Mock(content=b'{"total_count": 1}')) == {"total_count": 1}
+        with pytest.raises(requests.exceptions.JSONDecodeError):
+            _response_json(Mock(content=b"<html>"))
+
+    def test_rate_limiter_waits_for_reset(self):
+        """Test that an exhausted quota sleeps until the reset time."""
+        limiter = _RateLimiter()
+        limiter.update(
+            Mock(
+                headers={
+                    "X-RateLimit-Remaining": "1",
+                    "X-RateLimit-Reset": "1010",
+                }
+            )
+        )
+
+        with (
+            patch("terraform_ingest.importers.time.time", return_value=1000.0),
+            patch("terraform_ingest.importers.time.sleep") as mock_sleep,
+        ):
+            limiter.wait()
+            limiter.wait()
+
+        mock_sleep.assert_called_once_with(11.0)
 
 
 @pytest.fixture
@@ -227,16 +605,36 @@ class TestGitLabImporter:
         importer = GitLabImporter(group="test-group")
         assert importer.get_provider_name() == "gitlab"
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_group_projects_uses_total_pages(self, mock_get):
+        """Test that X-Total-Pages bounds the concurrent page requests."""
+
+        def get_page(url, params, timeout, headers=None):
+            response = Mock(status_code=200, links={})
+            response.headers = {"X-Total-Pages": "2"}
+            response.content = json.dumps(
+                [{"id": params["page"], "description": "x" * 100, "archived": False}]
+            ).encode()
+            return response
+
+        mock_get.side_effect = get_page
+
+        importer = GitLabImporter(group="test-group")
+        projects = importer._fetch_group_projects("test-group")
+
+        # Only the fields used by the importer are kept
+        assert projects == [{"id": 1, "archived": False}, {"id": 2, "archived": False}]
+        assert mock_get.call_count == 2
+
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_fetch_repositories(self, mock_get, mock_gitlab_response):
         """Test fetching repositories from GitLab."""
         # Mock the API response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.side_effect = [
-            mock_gitlab_response,  # First page
-            [],  # Second page (empty to stop pagination)
-        ]
+        mock_response.links = {}
+        mock_response.headers = {}
+        mock_response.content = json.dumps(mock_gitlab_response).encode()
         mock_get.return_value = mock_response
 
         importer = GitLabImporter(group="test-group", terraform_only=False)
@@ -249,7 +647,25 @@ class TestGitLabImporter:
         assert repos[0].url == "https://gitlab.com/test-group/terraform-aws-vpc.git"
         assert repos[1].name == "terraform-aws-ec2"
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_fetch_repositories_applies_max_tags_and_branches(
+        self, mock_get, mock_gitlab_response
+    ):
+        """Test that configured max_tags and branches are set on each repository."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.links = {}
+        mock_response.headers = {}
+        mock_response.content = json.dumps(mock_gitlab_response).encode()
+        mock_get.return_value = mock_response
+
+        importer = GitLabImporter(group="test-group", max_tags=3, branches=["main"])
+        repos = importer.fetch_repositories()
+
+        assert all(repo.max_tags == 3 for repo in repos)
+        assert all(repo.branches == ["main"] for repo in repos)
+
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_fetch_repositories_with_error(self, mock_get):
         """Test error handling when fetching repositories."""
         mock_get.side_effect = Exception("Network error")
@@ -259,7 +675,7 @@ class TestGitLabImporter:
         with pytest.raises(Exception):
             importer.fetch_repositories()
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_fetch_repositories_with_private_filter(self, mock_get):
         """Test fetching repositories with private filter."""
         mock_response_data = [
@@ -281,7 +697,9 @@ class TestGitLabImporter:
 
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.side_effect = [mock_response_data, []]
+        mock_response.links = {}
+        mock_response.headers = {}
+        mock_response.content = json.dumps(mock_response_data).encode()
         mock_get.return_value = mock_response
 
         # Test without include_private
@@ -294,15 +712,17 @@ class TestGitLabImporter:
         assert len(repos) == 1
         assert repos[0].name == "public-repo"
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_has_terraform_files_found(self, mock_get):
         """Test _has_terraform_files when Terraform files are found."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [
-            {"type": "blob", "name": "main.tf"},
-            {"type": "blob", "name": "variables.tf"},
-        ]
+        mock_response.content = json.dumps(
+            [
+                {"type": "blob", "name": "main.tf"},
+                {"type": "blob", "name": "variables.tf"},
+            ]
+        ).encode()
         mock_get.return_value = mock_response
 
         importer = GitLabImporter(group="test-group")
@@ -310,23 +730,44 @@ class TestGitLabImporter:
 
         assert importer._has_terraform_files(project) is True
 
-    @patch("terraform_ingest.importers.requests.get")
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_has_terraform_files_not_found(self, mock_get):
         """Test _has_terraform_files when no Terraform files are found."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.side_effect = [
-            [{"type": "blob", "name": "README.md"}],  # First call with limited results
-            [{"type": "blob", "name": "README.md"}],  # Second call with more results
-        ]
+        mock_response.headers = {"X-Next-Page": ""}
+        mock_response.content = json.dumps(
+            [{"type": "blob", "name": "README.md"}]
+        ).encode()
         mock_get.return_value = mock_response
 
         importer = GitLabImporter(group="test-group")
         project = {"id": 123, "name": "non-terraform-project"}
 
         assert importer._has_terraform_files(project) is False
+        mock_get.assert_called_once()
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_has_terraform_files_stops_at_first_match(self, mock_get):
+        """Test that tree pages are followed until a .tf file is found."""
+        pages = {
+            1: ([{"type": "blob", "name": "README.md"}], "2"),
+            2: ([{"type": "blob", "name": "main.tf"}], "3"),
+        }
+
+        def get(url, params, timeout, headers=None):
+            items, next_page = pages[params["page"]]
+            response = Mock(status_code=200, headers={"X-Next-Page": next_page})
+            response.content = json.dumps(items).encode()
+            return response
 
-    @patch("terraform_ingest.importers.requests.get")
+        mock_get.side_effect = get
+
+        importer = GitLabImporter(group="test-group")
+        assert importer._has_terraform_files({"id": 123, "name": "p"}) is True
+        assert mock_get.call_count == 2
+
+    @patch("terraform_ingest.importers.requests.Session.get")
     def test_has_terraform_files_api_error(self, mock_get):
         """Test _has_terraform_files when API returns error."""
         mock_response = Mock()
@@ -339,6 +780,111 @@ class TestGitLabImporter:
         # Should return True by default when API fails
         assert importer._has_terraform_files(project) is True
 
+    @pytest.mark.parametrize(
+        "blobs, complete",
+        [
+            # Advanced search applied the extension filter
+            ([{"project_id": 1, "filename": "main.tf"}], True),
+            # Basic search matched "extension:tf" as text
+            ([{"project_id": 1, "filename": "README.md"}], False),
+            ([], False),
+        ],
+    )
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_search_terraform_repos_needs_advanced_search(
+        self, mock_get, blobs, complete
+    ):
+        """Test that blob search is only complete when the filter was applied."""
+        mock_get.return_value = Mock(status_code=200, headers={})
+        mock_get.return_value.content = json.dumps(blobs).encode()
+
+        importer = GitLabImporter(group="test-group")
+        project_ids, searched = importer._search_terraform_repos()
+
+        assert searched is complete
+        assert project_ids == ({1} if complete else set())
+
+    def test_cache_key_includes_instance(self):
+        """Test that projects on different instances do not share cache keys."""
+        project = {"id": 1, "last_activity_at": "2024-01-01T00:00:00Z"}
+
+        public = GitLabImporter(group="g")._cache_key(project)
+        private = GitLabImporter(
+            group="g", gitlab_url="https://gitlab.example.com"
+        )._cache_key(project)
+
+        assert public != private
+
+
+class TestImporterCache:
+    """Tests for the on-disk Terraform check cache."""
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_unchanged_repository_skips_api(self, mock_get, cache_dir):
+        """Test that a result is reused until the repository is pushed again."""
+        mock_get.return_value = Mock(status_code=200, headers={})
+        mock_get.return_value.content = json.dumps({"total_count": 1}).encode()
+        repo = {"full_name": "test-org/vpc", "pushed_at": "2024-01-01T00:00:00Z"}
+
+        with GitHubImporter(org="test-org") as importer:
+            assert importer._filter_terraform([repo]) == [repo]
+        assert (cache_dir / TERRAFORM_CACHE_FILE).exists()
+
+        with GitHubImporter(org="test-org") as importer:
+            assert importer._has_terraform_files(repo) is True
+            assert mock_get.call_count == 1
+
+            pushed = {**repo, "pushed_at": "2024-02-01T00:00:00Z"}
+            mock_get.return_value.content = json.dumps({"total_count": 0}).encode()
+            assert importer._has_terraform_files(pushed) is False
+            assert mock_get.call_count == 2
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_inconclusive_result_not_cached(self, mock_get):
+        """Test that repositories included by default are checked again."""
+        mock_get.return_value = Mock(status_code=403, headers={})
+        repo = {"full_name": "test-org/vpc", "pushed_at": "2024-01-01T00:00:00Z"}
+
+        with GitHubImporter(org="test-org") as importer:
+            assert importer._has_terraform_files(repo) is True
+            assert importer._has_terraform_files(repo) is True
+
+        assert mock_get.call_count == 2
+
+    @patch("terraform_ingest.importers.requests.Session.get")
+    def test_listing_revalidated_with_etag(self, mock_get, mock_github_response):
+        """Test that an unchanged listing page is served from the cache on 304."""
+        body = json.dumps(mock_github_response).encode()
+        fresh = requests.Response()
+        fresh.status_code = 200
+        fresh.headers.update({"ETag": '"abc"', "Link": ""})
+        fresh._content = body
+        mock_get.return_value = fresh
+
+        with GitHubImporter(org="test-org") as importer:
+            first = importer.fetch_repositories()
+        assert mock_get.call_args.kwargs["headers"] is None
+
+        not_modified = requests.Response()
+        not_modified.status_code = 304
+        mock_get.return_value = not_modified
+
+        with GitHubImporter(org="test-org") as importer:
+            second = importer.fetch_repositories()
+
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+        assert [repo.url for repo in second] == [repo.url for repo in first]
+
+    def test_unreadable_cache_is_a_miss(self, tmp_path):
+        """Test that SQLite errors are treated as cache misses."""
+        path = tmp_path / "not-a-dir"
+        path.write_text("")
+        cache = ImporterCache(path / TERRAFORM_CACHE_FILE)
+
+        cache.set_terraform_check("github", "test-org/vpc", "t", True)
+        assert cache.get_terraform_check("github", "test-org/vpc", "t") is None
+        cache.close()
+
 
 class TestMergeRepositories:
     """Tests for merge_repositories function."""
@@ -392,6 +938,21 @@ class TestMergeRepositories:
         assert len(result) == 1
         assert result[0].name == "repo1"
 
+    def test_merge_repositories_duplicate_new(self):
+        """Test that a repository listed twice in the new batch is added once."""
+        existing = [
+            RepositoryConfig(url="https://github.com/org/repo1.git", name="repo1"),
+        ]
+        new = [
+            RepositoryConfig(url="https://github.com/org/repo2.git", name="repo2"),
+            RepositoryConfig(url="https://github.com/org/repo2.git", name="repo2"),
+            RepositoryConfig(url="https://github.com/org/repo1.git", name="repo1"),
+        ]
+
+        result = merge_repositories(existing, new, replace=False)
+
+        assert [repo.name for repo in result] == ["repo1", "repo2"]
+
 
 class TestUpdateConfigFile:
     """Tests for update_config_file function."""
@@ -454,6 +1015,37 @@ class TestUpdateConfigFile:
         assert config["output_dir"] == "./custom-output"
         assert config["clone_dir"] == "./custom-repos"
 
+    def test_update_config_file_failed_write_keeps_original(self, tmp_path):
+        """Test that a failed write leaves the original file untouched."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("repositories: []\n")
+
+        new_repos = [
+            RepositoryConfig(url="https://github.com/org/repo1.git", name="repo1")
+        ]
+        with patch("terraform_ingest.importers.yaml.dump", side_effect=OSError):
+            with pytest.raises(OSError):
+                update_config_file(config_path, new_repos, replace=False)
+
+        assert config_path.read_text() == "repositories: []\n"
+        assert list(tmp_path.iterdir()) == [config_path]
+
+    def test_update_config_file_keeps_existing_entries(self, tmp_path):
+        """Test that existing entries are written back as loaded."""
+        config_path = tmp_path / "config.yaml"
+        existing = {"url": "https://github.com/org/repo1.git", "name": "repo1"}
+        config_path.write_text(yaml.safe_dump({"repositories": [existing]}))
+
+        new_repos = [
+            RepositoryConfig(url="https://github.com/org/repo1.git", name="repo1"),
+            RepositoryConfig(url="https://github.com/org/repo2.git", name="repo2"),
+        ]
+        update_config_file(config_path, new_repos, replace=False)
+
+        repositories = yaml.safe_load(config_path.read_text())["repositories"]
+        assert repositories[0] == existing
+        assert repositories[1] == new_repos[1].model_dump()
+
     def test_update_config_file_existing_replace(self, tmp_path):
         """Test updating an existing config file with replace."""
         config_path = tmp_path / "config.yaml"
@@ -490,3 +1082,50 @@ class TestUpdateConfigFile:
         # Should have only the new repo
         assert len(config["repositories"]) == 1
         assert config["repositories"][0]["name"] == "repo2"
+
+    def test_update_config_file_deferred_flush(self, tmp_path):
+        """Test deferred updates are batched and written on flush."""
+        config_path = tmp_path / "config.yaml"
+        pending = PendingConfigUpdates()
+
+        update_config_file(
+            config_path,
+            [RepositoryConfig(url="https://github.com/org/repo1.git", name="repo1")],
+            pending=pending,
+        )
+        update_config_file(
+            config_path,
+            [RepositoryConfig(url="https://gitlab.com/org/repo2.git", name="repo2")],
+            pending=pending,
+        )
+        assert not config_path.exists()
+
+        pending.flush()
+
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f)
+
+        names = [repo["name"] for repo in config["repositories"]]
+        assert names == ["repo1", "repo2"]
+
+    def test_pending_config_updates_flush_on_exit(self, tmp_path):
+        """Test that pending updates are written when the block exits."""
+        config_path = tmp_path / "config.yaml"
+
+        with PendingConfigUpdates() as pending:
+            update_config_file(
+                config_path,
+                [RepositoryConfig(url="https://github.com/org/repo1.git")],
+                pending=pending,
+            )
+            update_config_file(
+                config_path,
+                [RepositoryConfig(url="https://github.com/org/repo2.git")],
+                pending=pending,
+            )
+            assert not config_path.exists()
+
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f)
+
+        assert len(config["repositories"]) == 2
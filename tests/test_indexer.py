@@ -1,12 +1,19 @@
 """Tests for module indexer functionality."""
 
+import hashlib
 import json
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from terraform_ingest.indexer import ModuleIndexer
+from terraform_ingest.indexer import (
+    ModuleIndexer,
+    _write_file_atomic,
+    module_document_id,
+)
+from terraform_ingest.json_utils import loads as load_json
 from terraform_ingest.models import (
     TerraformModuleSummary,
     TerraformProvider,
@@ -118,6 +125,17 @@ class TestModuleIndexer:
 
         assert id1 == id2
 
+    def test_add_module_with_shared_timestamp(
+        self, temp_output_dir, sample_module_summary, nested_module_summary
+    ):
+        """Test that a batch of modules can share one index timestamp."""
+        indexer = ModuleIndexer(temp_output_dir)
+        indexed_at = "2025-10-28T12:00:00+00:00"
+        for summary in (sample_module_summary, nested_module_summary):
+            indexer.add_module(summary, indexed_at=indexed_at)
+
+        assert {m["last_indexed"] for m in indexer.list_all()} == {indexed_at}
+
     def test_get_module(self, temp_output_dir, sample_module_summary):
         """Test retrieving a module from the index."""
         indexer = ModuleIndexer(temp_output_dir)
@@ -189,6 +207,57 @@ class TestModuleIndexer:
         results = indexer.search_by_repository("terraform-aws-vpc")
         assert len(results) == 1
 
+    def test_search_by_repository_substrings(
+        self, temp_output_dir, sample_module_summary, nested_module_summary
+    ):
+        """Test repository searches for short, partial and unknown text."""
+        indexer = ModuleIndexer(temp_output_dir)
+        vpc_id = indexer.add_module(sample_module_summary)
+        sg_id = indexer.add_module(nested_module_summary)
+
+        def ids(text):
+            return [m["id"] for m in indexer.search_by_repository(text)]
+
+        assert ids("AWS-Modules/terraform-aws") == [vpc_id, sg_id]
+        assert ids("security") == [sg_id]
+        assert ids("pc") == [vpc_id]
+        assert ids("") == [vpc_id, sg_id]
+        assert ids("aws-vpcx") == []
+        assert ids("gitlab") == []
+
+        indexer.remove_module(vpc_id)
+        assert ids("vpc") == []
+        assert "vpc" not in indexer._repository_trigrams
+
+        indexer.save()
+        assert ModuleIndexer(temp_output_dir).search_by_repository("group")
+
+    def test_searches_follow_updates_and_removals(
+        self, temp_output_dir, sample_module_summary, nested_module_summary
+    ):
+        """Test that search results track re-added and removed modules."""
+        indexer = ModuleIndexer(temp_output_dir)
+        vpc_id = indexer.add_module(sample_module_summary)
+        sg_id = indexer.add_module(nested_module_summary)
+
+        sample_module_summary.providers = [TerraformProvider(name="google")]
+        indexer.add_module(sample_module_summary)
+        assert [m["id"] for m in indexer.search_by_provider("aws")] == [sg_id]
+        assert [m["id"] for m in indexer.search_by_provider("goo")] == [vpc_id]
+        assert [m["id"] for m in indexer.search_by_provider("")] == [vpc_id, sg_id]
+        assert indexer.search_by_tag("aws")[0]["id"] == sg_id
+
+        indexer.remove_module(sg_id)
+        assert indexer.search_by_provider("aws") == []
+        assert indexer.search_by_tag("sg") == []
+        assert indexer.search_by_repository("terraform-aws") == [
+            indexer.get_module(vpc_id)
+        ]
+
+        indexer.save()
+        reloaded = ModuleIndexer(temp_output_dir)
+        assert reloaded.search_by_provider("google") == [indexer.get_module(vpc_id)]
+
     def test_list_all(
         self, temp_output_dir, sample_module_summary, nested_module_summary
     ):
@@ -213,6 +282,26 @@ class TestModuleIndexer:
         assert stats["unique_providers"] == 1
         assert "aws" in stats["providers"]
 
+    def test_get_stats_cached_until_changed(
+        self, temp_output_dir, sample_module_summary, nested_module_summary
+    ):
+        """Test that statistics are reused until modules change."""
+        indexer = ModuleIndexer(temp_output_dir)
+        doc_id = indexer.add_module(sample_module_summary)
+
+        stats = indexer.get_stats()
+        stats["providers"].append("google")
+        with patch.object(indexer, "_modules", wraps=indexer.modules) as modules:
+            assert indexer.get_stats()["providers"] == ["aws"]
+            modules.values.assert_not_called()
+
+        indexer.add_module(nested_module_summary)
+        assert indexer.get_stats()["total_modules"] == 2
+        indexer.remove_module(doc_id)
+        assert indexer.get_stats()["total_modules"] == 1
+        indexer.clear()
+        assert indexer.get_stats()["total_modules"] == 0
+
     def test_save_and_load_index(self, temp_output_dir, sample_module_summary):
         """Test saving and loading the index."""
         # Add and save
@@ -226,6 +315,133 @@ class TestModuleIndexer:
         module = indexer2.get_module(doc_id)
         assert module["repository"] == sample_module_summary.repository
 
+    def test_save_skips_unchanged_index(self, temp_output_dir, sample_module_summary):
+        """Test that saving an unmodified index does not rewrite the file."""
+        indexer1 = ModuleIndexer(temp_output_dir)
+        doc_id = indexer1.add_module(sample_module_summary)
+        indexer1.save()
+
+        indexer2 = ModuleIndexer(temp_output_dir)
+        with patch("terraform_ingest.indexer._write_file_atomic") as write:
+            indexer1.save()
+            indexer2.save()
+            indexer2.get_module(doc_id)
+            indexer2.save()
+        write.assert_not_called()
+
+        indexer2.remove_module(doc_id)
+        indexer2.save()
+        assert ModuleIndexer(temp_output_dir).modules == {}
+
+    def test_failed_save_keeps_previous_index(
+        self, temp_output_dir, sample_module_summary, nested_module_summary
+    ):
+        """Test that an interrupted save leaves the previous index intact."""
+        indexer = ModuleIndexer(temp_output_dir)
+        indexer.add_module(sample_module_summary)
+        indexer.save()
+        saved = indexer.index_path.read_bytes()
+
+        indexer.add_module(nested_module_summary)
+        with patch("terraform_ingest.indexer.os.replace", side_effect=OSError):
+            with pytest.raises(OSError):
+                indexer.save()
+
+        assert indexer.index_path.read_bytes() == saved
+        assert sorted(p.name for p in Path(temp_output_dir).iterdir()) == [
+            indexer.index_path.name,
+            indexer.checksum_path.name,
+        ]
+
+    @pytest.mark.parametrize("completed_writes", [0, 1, 2])
+    @pytest.mark.parametrize("legacy", [False, True])
+    def test_interrupted_save_keeps_a_valid_index(
+        self,
+        temp_output_dir,
+        sample_module_summary,
+        nested_module_summary,
+        completed_writes,
+        legacy,
+    ):
+        """Test that the index still loads after a save stops between writes."""
+        indexer = ModuleIndexer(temp_output_dir)
+        indexer.add_module(sample_module_summary)
+        indexer.save()
+        if legacy:
+            indexer.checksum_path.unlink()
+
+        writes = []
+
+        def write_then_stop(path, payload):
+            if len(writes) == completed_writes:
+                raise KeyboardInterrupt
+            writes.append(path)
+            _write_file_atomic(path, payload)
+
+        indexer.add_module(nested_module_summary)
+        with patch(
+            "terraform_ingest.indexer._write_file_atomic", side_effect=write_then_stop
+        ):
+            with pytest.raises(KeyboardInterrupt):
+                indexer.save()
+
+        reloaded = ModuleIndexer(temp_output_dir)
+        index_replaced = indexer.index_path in writes
+        assert len(reloaded.modules) == (2 if index_replaced else 1)
+        assert not list(Path(temp_output_dir).glob("module_index.json.corrupt-*"))
+
+    def test_corrupt_index_is_backed_up(self, temp_output_dir, sample_module_summary):
+        """Test that an index failing its checksum is kept aside, not dropped."""
+        indexer1 = ModuleIndexer(temp_output_dir)
+        indexer1.add_module(sample_module_summary)
+        indexer1.save()
+        damaged = indexer1.index_path.read_bytes().replace(b"aws", b"gcp")
+        indexer1.index_path.write_bytes(damaged)
+
+        indexer2 = ModuleIndexer(temp_output_dir)
+
+        assert indexer2.modules == {}
+        assert not indexer2.index_path.exists()
+        backups = list(Path(temp_output_dir).glob("module_index.json.corrupt-*"))
+        assert len(backups) == 1
+        assert backups[0].read_bytes() == damaged
+
+        indexer2.add_module(sample_module_summary)
+        indexer2.save()
+        assert len(ModuleIndexer(temp_output_dir).modules) == 1
+
+    def test_invalid_index_json_is_backed_up(self, temp_output_dir):
+        """Test that an unparseable index is kept aside, not dropped."""
+        index_path = Path(temp_output_dir) / ModuleIndexer.DEFAULT_INDEX_FILENAME
+        index_path.write_text('{"modules": {')
+
+        indexer = ModuleIndexer(temp_output_dir)
+
+        assert indexer.modules == {}
+        backups = list(Path(temp_output_dir).glob("module_index.json.corrupt-*"))
+        assert [p.read_text() for p in backups] == ['{"modules": {']
+
+    def test_load_index_with_joined_providers(self, temp_output_dir):
+        """Test that comma-joined providers from older indexes become lists."""
+        entry = {
+            "id": "abc",
+            "repository": "https://github.com/org/terraform-multi",
+            "ref": "main",
+            "path": ".",
+            "summary_file": "output/terraform-multi_main.json",
+            "provider": "aws",
+            "providers": "aws,google",
+            "tags": ["aws", "google"],
+            "last_indexed": "2025-10-28T12:00:00+00:00",
+        }
+        index_path = Path(temp_output_dir) / ModuleIndexer.DEFAULT_INDEX_FILENAME
+        index_path.write_text(json.dumps({"modules": {"abc": entry}}))
+
+        indexer = ModuleIndexer(temp_output_dir)
+
+        assert indexer.get_module("abc")["providers"] == ["aws", "google"]
+        assert indexer.search_by_provider("google") == [indexer.get_module("abc")]
+
     def test_get_module_summary_path(self, temp_output_dir, sample_module_summary):
         """Test getting the path to a module's summary file."""
         indexer = ModuleIndexer(temp_output_dir)
@@ -244,6 +460,35 @@ class TestModuleIndexer:
         indexer.clear()
         assert len(indexer.modules) == 0
 
+    def test_index_loaded_on_first_access(self, temp_output_dir, sample_module_summary):
+        """Test that the index file is only read when the modules are used."""
+        indexer1 = ModuleIndexer(temp_output_dir)
+        doc_id = indexer1.add_module(sample_module_summary)
+        indexer1.save()
+
+        with patch("terraform_ingest.indexer.load_json", wraps=load_json) as loads:
+            indexer2 = ModuleIndexer(temp_output_dir)
+            assert loads.call_count == 0
+            assert indexer2.search_by_tag("aws") == [indexer2.get_module(doc_id)]
+            assert indexer2.search_by_provider("aws")
+            assert loads.call_count == 1
+
+            ModuleIndexer(temp_output_dir, lazy=False)
+            assert loads.call_count == 2
+
+    def test_clear_does_not_load_index(self, temp_output_dir, sample_module_summary):
+        """Test that clearing an unloaded index skips reading the file."""
+        indexer1 = ModuleIndexer(temp_output_dir)
+        indexer1.add_module(sample_module_summary)
+        indexer1.save()
+
+        indexer2 = ModuleIndexer(temp_output_dir)
+        with patch("terraform_ingest.indexer.load_json") as loads:
+            indexer2.clear()
+            assert indexer2.modules == {}
+            assert indexer2.search_by_tag("aws") == []
+        loads.assert_not_called()
+
     def test_rebuild_from_files(self, temp_output_dir, sample_module_summary):
         """Test rebuilding index from JSON files."""
         # Create a JSON file manually
@@ -259,6 +504,61 @@ class TestModuleIndexer:
         assert count == 1
         assert len(indexer.modules) == 1
 
+    def test_rebuild_from_files_memory_mapped(
+        self, temp_output_dir, sample_module_summary, monkeypatch
+    ):
+        """Test rebuilding from memory-mapped files, skipping empty ones."""
+        monkeypatch.setattr("terraform_ingest.indexer.MMAP_MIN_SIZE", 1)
+        output_dir = Path(temp_output_dir)
+        (output_dir / "terraform-aws-vpc_v5.0.0.json").write_text(
+            sample_module_summary.model_dump_json()
+        )
+        (output_dir / "empty.json").write_bytes(b"")
+
+        indexer = ModuleIndexer(temp_output_dir)
+
+        assert indexer.rebuild_from_files() == 1
+        assert indexer.list_all()[0]["repository"] == sample_module_summary.repository
+
+    def test_rebuild_from_files_in_process_pool(
+        self, temp_output_dir, sample_module_summary, nested_module_summary, monkeypatch
+    ):
+        """Test that a parallel rebuild indexes the same modules."""
+        monkeypatch.setattr("terraform_ingest.indexer.PARALLEL_REBUILD_MIN_FILES", 1)
+        output_dir = Path(temp_output_dir)
+        for summary in (sample_module_summary, nested_module_summary):
+            (output_dir / summary.summary_filename).write_text(
+                summary.model_dump_json()
+            )
+        (output_dir / "notes.json").write_text("{}")
+
+        indexer = ModuleIndexer(temp_output_dir)
+
+        assert indexer.rebuild_from_files() == 2
+        assert {m["path"] for m in indexer.list_all()} == {".", "modules/sg"}
+
+    def test_rebuild_from_files_matches_add_module(
+        self, temp_output_dir, sample_module_summary
+    ):
+        """Test that rebuilt entries match entries added from full summaries."""
+        output_dir = Path(temp_output_dir)
+        (output_dir / "terraform-aws-vpc_v5.0.0.json").write_text(
+            sample_module_summary.model_dump_json()
+        )
+        (output_dir / "other.json").write_text('["not", "a", "summary"]')
+
+        indexer = ModuleIndexer(temp_output_dir)
+        assert indexer.rebuild_from_files() == 1
+        rebuilt = indexer.list_all()[0]
+
+        indexer.clear()
+        indexer.add_module(sample_module_summary)
+        expected = indexer.list_all()[0]
+
+        rebuilt.pop("last_indexed")
+        expected.pop("last_indexed")
+        assert rebuilt == expected
+
     def test_generate_document_id_format(self, sample_module_summary):
         """Test document ID generation format."""
         indexer = ModuleIndexer("./output")
@@ -268,6 +568,18 @@ class TestModuleIndexer:
         assert len(doc_id) == 64
         assert all(c in "0123456789abcdef" for c in doc_id)
 
+    def test_document_id_stable_and_shared(self, sample_module_summary):
+        """Test IDs are stable and match the vector database IDs."""
+        from terraform_ingest.embeddings import VectorDBManager
+        from terraform_ingest.models import EmbeddingConfig
+
+        s = sample_module_summary
+        expected = hashlib.sha256(f"{s.repository}:{s.ref}:{s.path}".encode())
+        manager = VectorDBManager(EmbeddingConfig(enabled=False))
+
+        assert module_document_id(s.repository, s.ref, s.path) == (expected.hexdigest())
+        assert manager._generate_document_id(s) == expected.hexdigest()
+
     def test_get_summary_filename_root_path(self, sample_module_summary):
         """Test filename generation for root module."""
         indexer = ModuleIndexer("./output")
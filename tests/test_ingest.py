@@ -0,0 +1,157 @@
+"""Tests for the ingestion pipeline."""
+
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from terraform_ingest.ingest import TerraformIngest, embedding_hash_salt
+from terraform_ingest.models import (
+    EmbeddingConfig,
+    IngestConfig,
+    RepositoryConfig,
+    TerraformModuleSummary,
+    TerraformProvider,
+)
+
+
+@pytest.fixture
+def ingester(tmp_path):
+    """Create an ingester writing to a temporary output directory."""
+    config = IngestConfig(
+        repositories=[RepositoryConfig(url="https://github.com/org/terraform-mod")],
+        output_dir=str(tmp_path / "output"),
+        clone_dir=str(tmp_path / "repos"),
+    )
+    return TerraformIngest(config)
+
+
+@pytest.fixture
+def summaries():
+    """Create summaries for several modules of one repository."""
+    return [
+        TerraformModuleSummary(
+            repository="https://github.com/org/terraform-mod",
+            ref="main",
+            path=path,
+            providers=[TerraformProvider(name="aws")],
+        )
+        for path in (".", "modules/a", "modules/b")
+    ]
+
+
+class TestIngest:
+    """Tests for saving and indexing summaries."""
+
+    def test_ingest_saves_and_indexes_summaries(self, ingester, summaries):
+        """Test that every summary is written to disk and indexed."""
+        with patch.object(
+            ingester.repo_manager, "process_repository", return_value=summaries
+        ):
+            result = ingester.ingest()
+
+        assert result == summaries
+        names = sorted(p.name for p in ingester.output_dir.glob("terraform-mod_*"))
+        assert names == [
+            "terraform-mod_main.json",
+            "terraform-mod_main_modules_a.json",
+            "terraform-mod_main_modules_b.json",
+        ]
+        saved = (ingester.output_dir / names[1]).read_text()
+        assert "\n" not in saved
+        assert TerraformModuleSummary.model_validate_json(saved) == summaries[1]
+        assert len(ingester.indexer.modules) == 3
+        assert (ingester.output_dir / "module_index.json").exists()
+
+    def test_ingest_skips_unchanged_summaries(self, ingester, summaries):
+        """Test that unchanged modules are neither rewritten nor re-embedded."""
+        ingester.vector_db = Mock()
+        ingester.vector_db.upsert_modules.return_value = []
+        ingester.vector_db.existing_ids.side_effect = set
+        with patch.object(
+            ingester.repo_manager, "process_repository", return_value=summaries
+        ):
+            ingester.ingest()
+            first_upsert = ingester.vector_db.upsert_modules.call_args.args[0]
+
+            summaries[1].description = "Changed"
+            with patch.object(Path, "write_bytes", autospec=True) as write_bytes:
+                ingester.ingest()
+
+        assert first_upsert == summaries
+        ingester.vector_db.upsert_modules.assert_called_with([summaries[1]])
+        assert [call.args[0].name for call in write_bytes.call_args_list] == [
+            "terraform-mod_main_modules_a.json"
+        ]
+
+    def test_unchanged_summaries_missing_from_vector_db_are_upserted(
+        self, ingester, summaries
+    ):
+        """Test that a recreated collection gets unchanged modules again."""
+        ingester.vector_db = Mock()
+        ingester.vector_db.upsert_modules.return_value = []
+        ingester.vector_db.existing_ids.side_effect = set
+        with patch.object(
+            ingester.repo_manager, "process_repository", return_value=summaries
+        ):
+            ingester.ingest()
+
+            # The collection was deleted; only the first module is back
+            first_id = ingester.indexer._generate_document_id(summaries[0])
+            ingester.vector_db.existing_ids.side_effect = lambda ids: {first_id}
+            with patch.object(Path, "write_bytes", autospec=True) as write_bytes:
+                ingester.ingest()
+
+        write_bytes.assert_not_called()
+        ingester.vector_db.upsert_modules.assert_called_with(summaries[1:])
+        for summary in summaries:
+            entry = ingester.indexer.get_module(
+                ingester.indexer._generate_document_id(summary)
+            )
+            assert entry["content_hash"] is not None
+
+    def test_failed_upsert_is_retried(self, ingester, summaries):
+        """Test that modules whose upsert failed are upserted again."""
+        ingester.vector_db = Mock()
+        ingester.vector_db.upsert_modules.side_effect = [RuntimeError, ["id"]]
+        with patch.object(
+            ingester.repo_manager, "process_repository", return_value=summaries
+        ):
+            ingester.ingest()
+            ingester.ingest()
+
+        assert ingester.vector_db.upsert_modules.call_count == 2
+        assert ingester.vector_db.upsert_modules.call_args.args[0] == summaries
+
+    def test_get_all_summaries_json(self, ingester, summaries):
+        """Test that all summaries are returned as one JSON array."""
+        with patch.object(
+            ingester.repo_manager, "process_repository", return_value=summaries
+        ):
+            result = json.loads(ingester.get_all_summaries_json())
+
+        assert [
+            TerraformModuleSummary.model_validate(item) for item in result
+        ] == summaries
+
+
+def test_embedding_hash_salt_ignores_unrelated_settings():
+    """Test that only settings affecting vectors change the hash salt."""
+    config = EmbeddingConfig(enabled=True, strategy="openai", openai_api_key="a")
+    salt = embedding_hash_salt(config)
+
+    for update in (
+        {"openai_api_key": "b"},
+        {"query_cache_size": 0},
+        {"max_concurrent_batches": 10},
+        {"chromadb_path": "./other"},
+    ):
+        assert embedding_hash_salt(config.model_copy(update=update)) == salt
+    for update in (
+        {"openai_model": "text-embedding-3-large"},
+        {"strategy": "sentence-transformers"},
+        {"include_readme": False},
+    ):
+        assert embedding_hash_salt(config.model_copy(update=update)) != salt
+    assert b'"a"' not in salt
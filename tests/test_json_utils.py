@@ -0,0 +1,63 @@
+"""Tests for JSON serialization helpers."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from terraform_ingest import json_utils
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (if installed) and the stdlib fallback."""
+    if request.param == "orjson":
+        if json_utils.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(json_utils, "orjson", None)
+    return request.param
+
+
+def test_dumps_pretty(backend):
+    """Test indented output round-trips and is indented."""
+    data = {"name": "vpc", "tags": ["aws", "network"], "count": 2}
+    output = json_utils.dumps(data)
+    assert json.loads(output) == data
+    assert '\n  "name": "vpc"' in output
+
+
+def test_dumps_compact(backend):
+    """Test compact output has no extra whitespace."""
+    output = json_utils.dumps({"a": [1, 2]}, pretty=False)
+    assert output == '{"a":[1,2]}'
+
+
+def test_dumps_non_serializable_values(backend):
+    """Test values json cannot encode natively fall back to str()."""
+    output = json_utils.dumps({"path": Path("/tmp/x"), "ts": datetime(2024, 1, 1)})
+    assert json.loads(output)["path"] == "/tmp/x"
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_dumps_non_string_keys(backend, pretty):
+    """Test non-string keys are converted as the json module does."""
+    output = json_utils.dumps({1: "a", None: "b", 2.5: "c"}, pretty=pretty)
+    assert json.loads(output) == {"1": "a", "null": "b", "2.5": "c"}
+
+
+def test_loads_bytes_and_str(backend):
+    """Test documents decode from both bytes and str."""
+    assert json_utils.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+    assert json_utils.loads('{"a": "\\u00e9"}') == {"a": "é"}
+
+
+def test_loads_memoryview(backend):
+    """Test documents decode from a memoryview."""
+    assert json_utils.loads(memoryview(b'{"a": [1, 2]}')) == {"a": [1, 2]}
+
+
+def test_loads_invalid(backend):
+    """Test invalid documents raise json.JSONDecodeError."""
+    with pytest.raises(json.JSONDecodeError):
+        json_utils.loads(b"{not json")
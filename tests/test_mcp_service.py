@@ -1401,3 +1401,22 @@ def test_custom_prompts_in_mcp_context(sample_output_dir):
     # Verify the prompt function uses the custom override
     result = _terraform_best_practices_impl()
     assert result == "Custom org practices"
+
+
+def test_run_ingestion_clears_server_search_cache():
+    """Test that auto-ingestion invalidates the server's cached searches."""
+    from unittest.mock import Mock, patch
+
+    from terraform_ingest.mcp_service import MCPContext, _run_ingestion
+
+    server_ingester = Mock()
+    previous = MCPContext._instance
+    MCPContext.set(server_ingester, None, True)
+    try:
+        with patch("terraform_ingest.mcp_service.TerraformIngest") as ingest_cls:
+            ingest_cls.from_yaml.return_value.ingest.return_value = []
+            _run_ingestion("config.yaml")
+    finally:
+        MCPContext._instance = previous
+
+    server_ingester.vector_db.clear_query_cache.assert_called_once()
@@ -10,6 +10,7 @@ from terraform_ingest.models import (
     RepositoryConfig,
     IngestConfig,
     EmbeddingConfig,
+    module_summary_filename,
 )
 
 
@@ -97,6 +98,31 @@ def test_terraform_module_summary():
     assert summary_with_resources.resources[0].type == "aws_vpc"
 
 
+def test_module_summary_filename():
+    """Test summary filenames for root and nested module paths."""
+    root = TerraformModuleSummary(
+        repository="https://github.com/user/terraform-module.git", ref="feature/x"
+    )
+    nested = TerraformModuleSummary(
+        repository="https://github.com/user/terraform-module/",
+        ref="v1.0.0",
+        path="modules/nat",
+    )
+    assert root.summary_filename == "terraform-module_feature_x.json"
+    assert nested.summary_filename == "terraform-module_v1.0.0_modules_nat.json"
+    assert "summary_filename" not in nested.model_dump()
+
+    hits = module_summary_filename.cache_info().hits
+    assert nested.summary_filename == "terraform-module_v1.0.0_modules_nat.json"
+    assert module_summary_filename.cache_info().hits == hits + 1
+
+    # Derived from the current fields, so copies and edits are never stale
+    copy = nested.model_copy(update={"path": "modules/igw"})
+    assert copy.summary_filename == "terraform-module_v1.0.0_modules_igw.json"
+    nested.ref = "v2.0.0"
+    assert nested.summary_filename == "terraform-module_v2.0.0_modules_nat.json"
+
+
 def test_repository_config():
     """Test RepositoryConfig model."""
     config = RepositoryConfig(
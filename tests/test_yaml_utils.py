@@ -0,0 +1,68 @@
+"""Tests for YAML helpers."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from terraform_ingest.yaml_utils import write_yaml_file
+
+
+def test_write_yaml_file(tmp_path):
+    """Test that the document is written in insertion order."""
+    path = tmp_path / "config.yaml"
+
+    write_yaml_file(path, {"repositories": [{"url": "x"}], "output_dir": "./out"})
+
+    assert path.read_text() == "repositories:\n- url: x\noutput_dir: ./out\n"
+
+
+def test_write_yaml_file_keeps_permissions(tmp_path):
+    """Test that replacing a file keeps its permissions."""
+    path = tmp_path / "config.yaml"
+    path.write_text("old: true\n")
+    os.chmod(path, 0o600)
+
+    write_yaml_file(path, {"new": True})
+
+    assert yaml.safe_load(path.read_text()) == {"new": True}
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+def test_write_yaml_file_new_file_uses_umask(tmp_path):
+    """Test that a new file gets the umask default rather than 0600."""
+    path = tmp_path / "config.yaml"
+    old_umask = os.umask(0o022)
+    try:
+        write_yaml_file(path, {"new": True})
+    finally:
+        os.umask(old_umask)
+
+    assert path.stat().st_mode & 0o777 == 0o644
+
+
+def test_write_yaml_file_keeps_symlink(tmp_path):
+    """Test that writing through a symlink updates its target."""
+    target = tmp_path / "real.yaml"
+    target.write_text("old: true\n")
+    link = tmp_path / "config.yaml"
+    link.symlink_to(target)
+
+    write_yaml_file(link, {"new": True})
+
+    assert link.is_symlink()
+    assert yaml.safe_load(target.read_text()) == {"new": True}
+
+
+def test_write_yaml_file_failure_keeps_original(tmp_path):
+    """Test that a failed write leaves the original file and no temp file."""
+    path = tmp_path / "config.yaml"
+    path.write_text("old: true\n")
+
+    with patch("terraform_ingest.yaml_utils.os.replace", side_effect=OSError):
+        with pytest.raises(OSError):
+            write_yaml_file(path, {"new": True})
+
+    assert path.read_text() == "old: true\n"
+    assert list(tmp_path.iterdir()) == [path]